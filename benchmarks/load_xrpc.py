@@ -0,0 +1,62 @@
+"""
+Load test of the scraping stack against a local FakeXrpcServer: many
+concurrent follower crawls through one BskyApiClient, with server latency,
+rate limiting and injected errors, reporting request throughput.
+
+Example usage:
+python benchmarks/load_xrpc.py --actors 200 --workers 32 --latency 0.02
+python benchmarks/load_xrpc.py --rate-limit 3000 --rate-limit-window 60 --error-rate 0.01
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from atproto.exceptions import AtProtocolError
+from bskydata.api.client import BskyApiClient
+from bskydata.api.rate_limit import RateLimiter
+from bskydata.scrapers.followers import FollowersScraper
+from bskydata.testing.xrpc import FakeXrpcServer
+
+
+def main(args):
+    server = FakeXrpcServer(latency=args.latency, jitter=args.jitter, pages=args.pages,
+                            rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+                            error_rate=args.error_rate)
+    with server:
+        client = BskyApiClient("load.test", "password", base_url=server.url,
+                               rate_limiter=RateLimiter(rate=args.client_rate, capacity=args.workers,
+                                                        max_rate=args.client_rate))
+        scraper = FollowersScraper(client)
+        failed = 0
+
+        def crawl(i: int) -> int:
+            return len(scraper.fetch(f"actor{i}.test", limit=args.pages * 100)["followers"])
+
+        start = time.perf_counter()
+        records = 0
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for future in [executor.submit(crawl, i) for i in range(args.actors)]:
+                try:
+                    records += future.result()
+                except AtProtocolError:
+                    failed += 1
+        elapsed = time.perf_counter() - start
+        stats = server.stats()
+    requests = sum(stats["requests"].values())
+    print(f"{args.actors:,} crawls ({failed:,} failed), {records:,} records in {elapsed:.2f} s")
+    print(f"{requests:,} requests: {requests / elapsed * 60:,.0f} req/min, {records / elapsed:,.0f} records/s")
+    print(f"Responses by status: {stats['statuses']}")
+    print(f"Client rate limiter: {client.rate_limiter.rate:.1f} req/s, throttled {client.rate_limiter.throttled} times")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test scrapers against a local fake XRPC server.")
+    parser.add_argument("--actors", type=int, default=200, help="Number of follower crawls.")
+    parser.add_argument("--pages", type=int, default=5, help="Pages of 100 followers per actor.")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent crawls.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency per request, in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random extra latency, in seconds.")
+    parser.add_argument("--rate-limit", type=int, help="Server requests allowed per window.")
+    parser.add_argument("--rate-limit-window", type=float, default=300.0, help="Server rate limit window, in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failed with a 5xx.")
+    parser.add_argument("--client-rate", type=float, default=1000.0, help="Client requests per second.")
+    main(parser.parse_args())
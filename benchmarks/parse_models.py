@@ -0,0 +1,48 @@
+"""
+CPU cost of parsing scraped records: model_dump() + dict parsing versus
+projecting fields straight from the atproto models.
+
+Example usage:
+python benchmarks/parse_models.py --records 100000
+"""
+import argparse
+import time
+from bskydata.parsers import BasicFollowersParser, BasicSearchTermsParser
+from bskydata.testing.replay import synthetic_posts, synthetic_profiles
+
+
+def _measure(label: str, func, records: int) -> float:
+    start = time.process_time()
+    func()
+    elapsed = time.process_time() - start
+    print(f"{label:<45} {elapsed:8.3f} s CPU  {records / elapsed:12,.0f} records/s")
+    return elapsed
+
+
+def main(records: int):
+    print(f"Building {records:,} synthetic records per type...")
+    cases = [
+        ("followers", BasicFollowersParser(), "actor", synthetic_profiles(records)),
+        ("posts", BasicSearchTermsParser(), "search_term", synthetic_posts(records)),
+    ]
+    for items_key, parser, key_name, items in cases:
+        print(f"\n{items_key}")
+        dumped = _measure(
+            "model_dump() + parse",
+            lambda: parser.parse({key_name: "x", items_key: [item.model_dump() for item in items]}),
+            records
+        )
+        projected = _measure(
+            "parse from models",
+            lambda: parser.parse({key_name: "x", items_key: items}),
+            records
+        )
+        print(f"CPU saved per 100k records: {(dumped - projected) * 100_000 / records:.3f} s "
+              f"({dumped / projected:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parsing from atproto models.")
+    parser.add_argument("--records", type=int, default=100_000, help="Number of records per type.")
+    args = parser.parse_args()
+    main(args.records)
@@ -0,0 +1,352 @@
+"""
+Offline throughput benchmark of the scrape -> parse -> write pipeline.
+
+Scrapers run against ReplayBskyClient, which serves synthetic records (or
+records recorded with `--followers-file` / `--posts-file`) without network
+access. Every stage reports records/sec (best of `--repeat` runs), peak
+Python memory (tracemalloc, in a separate run) and bytes written.
+
+Stages:
+  scrape/<items>                  FollowersScraper, FollowsScraper, SearchTermScraper, ProfilesScraper
+  parse/<Parser>[/models]         Basic*Parser on dictionaries, and on atproto models
+  write/<Writer>[/<mode>]         every writer, on parsed follower pages
+
+Cloud writers encode and stream as usual, but their uploads go to a
+byte-counting sink, so they measure encoding cost rather than the network.
+MongoDB and Neo4j only run when a server is given. Writers whose optional
+dependencies are missing are reported as skipped.
+
+Results are written as JSON. Compare a run against a saved baseline, e.g.
+the results of the previous commit, to gate performance changes; the
+comparison fails (exit status 1) when a stage loses more than `--tolerance`
+of its throughput or gains more than that in peak memory. Throughput is
+only comparable between runs on the same, otherwise idle machine.
+
+Example usage:
+python benchmarks/suite.py --records 50000 --output bench.json
+python benchmarks/suite.py --records 50000 --compare bench.json --stages scrape parse
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as t
+from unittest import mock
+from bskydata.parsers import BasicFollowersParser, BasicFollowsParser, BasicProfilesParser, BasicSearchTermsParser
+from bskydata.scrapers import FollowersScraper, FollowsScraper, ProfilesScraper, SearchTermScraper
+from bskydata.storage import writers
+from bskydata.storage.dedup import DedupIndex
+from bskydata.storage.records import explode_records
+from bskydata.testing.replay import ReplayBskyClient, load_records, synthetic_posts, synthetic_profiles
+
+# Lower is better for these metrics; throughput is compared the other way round.
+_HIGHER_IS_WORSE = ("peak_memory_bytes",)
+
+# SDK client factories replaced while constructing a cloud writer offline.
+_CLOUD_CLIENTS = {
+    "S3": "boto3.client",
+    "GCP": "google.cloud.storage.Client.from_service_account_json",
+    "Azure": "azure.storage.blob.BlobServiceClient.from_connection_string",
+}
+_CLOUD_ARGUMENTS = {
+    "S3": ("key", "secret", "bucket"),
+    "GCP": ("credentials.json", "bucket"),
+    "Azure": ("UseDevelopmentStorage=true", "container"),
+}
+
+_NEO4J_FOLLOWERS_QUERY = """
+UNWIND $records AS record
+MERGE (actor:Author {did: record.context.actor})
+MERGE (follower:Author {did: record.did})
+MERGE (follower)-[:FOLLOWS]->(actor)
+"""
+
+
+class Skipped(Exception):
+    """Raised by a stage that cannot run in this environment."""
+    pass
+
+
+def _git_commit() -> t.Union[str, None]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(run: t.Callable[[], t.Tuple[int, t.Union[int, None]]], repeat: int) -> dict:
+    """Time `run` (returning records and bytes written), then measure its peak memory separately."""
+    # Inputs shared between stages are prepared outside the measurements.
+    getattr(run, "setup", lambda: None)()
+    best, records, written = None, 0, None
+    for _ in range(repeat):
+        # Like timeit, keep collections of the inputs held by other stages out of the timings.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            records, written = run()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "records": records,
+        "seconds": round(best, 6),
+        "records_per_sec": round(records / best, 1) if best else None,
+        "peak_memory_bytes": peak,
+        "bytes_written": written,
+    }
+
+
+class Suite:
+    def __init__(self, records: int, workdir: str, followers: list = None, posts: list = None,
+                 mongodb_uri: str = None, neo4j: t.Tuple[str, str, str] = None):
+        self.records = records
+        self.workdir = workdir
+        self.mongodb_uri = mongodb_uri
+        self.neo4j = neo4j
+        followers = followers or synthetic_profiles(records)
+        self.client = ReplayBskyClient(
+            followers=followers,
+            follows=followers,
+            posts=posts or synthetic_posts(records),
+            profiles=synthetic_profiles(min(records, 1000), detailed=True),
+        )
+        self.actors = [f"user{i}.bsky.social" for i in range(records)]
+        self._pages = {}
+
+    def _scraped_pages(self, scraper_type: type, key: str, models: bool = False) -> list:
+        cache_key = (scraper_type, models)
+        if cache_key not in self._pages:
+            scraper = scraper_type(self.client)
+            self._pages[cache_key] = list(scraper.iter_pages(key, limit=self.records, models=models))
+        return self._pages[cache_key]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+    def stages(self) -> t.Dict[str, t.Callable[[], t.Tuple[int, t.Union[int, None]]]]:
+        stages = {}
+        for items_key, scraper_type, key in (("followers", FollowersScraper, "actor.bsky.social"),
+                                             ("follows", FollowsScraper, "actor.bsky.social"),
+                                             ("posts", SearchTermScraper, "python")):
+            stages[f"scrape/{items_key}"] = self._scrape(scraper_type, key)
+        stages["scrape/profiles"] = lambda: (len(ProfilesScraper(self.client).fetch(self.actors)["profiles"]), None)
+
+        for parser, scraper_type, key in ((BasicFollowersParser(), FollowersScraper, "actor.bsky.social"),
+                                          (BasicFollowsParser(), FollowsScraper, "actor.bsky.social"),
+                                          (BasicSearchTermsParser(), SearchTermScraper, "python")):
+            name = f"parse/{type(parser).__name__}"
+            stages[name] = self._parse(parser, scraper_type, key, models=False)
+            stages[f"{name}/models"] = self._parse(parser, scraper_type, key, models=True)
+        stages["parse/BasicProfilesParser"] = self._parse_profiles()
+
+        stages["write/LocalJsonFileWriter"] = self._write_local(lambda: writers.LocalJsonFileWriter(), "out.json")
+        stages["write/LocalJsonFileWriter/ndjson"] = self._write_local(
+            lambda: writers.LocalJsonFileWriter(ndjson=True), "out.ndjson")
+        stages["write/LocalParquetFileWriter"] = self._write_local(
+            lambda: writers.LocalParquetFileWriter(), "out.parquet")
+        stages["write/DeduplicatingWriter/ndjson"] = self._write_local(
+            lambda: writers.DeduplicatingWriter(writers.LocalJsonFileWriter(ndjson=True),
+                                                DedupIndex(self._path(f"dedup-{time.monotonic_ns()}.sqlite"))),
+            "dedup.ndjson")
+        for provider in _CLOUD_CLIENTS:
+            for encoding in ("Json", "Parquet"):
+                stages[f"write/{provider}{encoding}DataWriter"] = self._write_cloud(provider, encoding)
+        stages["write/MongoDBDataWriter/records"] = self._write_mongodb
+        stages["write/Neo4jDataWriter"] = self._write_neo4j
+        return stages
+
+    def _scrape(self, scraper_type: type, key: str):
+        def run():
+            scraper = scraper_type(self.client)
+            return sum(len(page[scraper.items_key]) for page in scraper.iter_pages(key, limit=self.records)), None
+        return run
+
+    def _parse(self, parser, scraper_type: type, key: str, models: bool):
+        def run():
+            if models and not parser.accepts_models:
+                raise Skipped(f"{type(parser).__name__} does not parse models")
+            pages = self._scraped_pages(scraper_type, key, models=models)
+            return sum(len(parser.parse(page)[scraper_type.items_key]) for page in pages), None
+        run.setup = lambda: self._scraped_pages(scraper_type, key, models=models)
+        return run
+
+    def _parse_profiles(self):
+        def setup():
+            if "profiles" not in self._pages:
+                self._pages["profiles"] = ProfilesScraper(self.client).fetch(self.actors)
+
+        def run():
+            setup()
+            return len(BasicProfilesParser().parse(self._pages["profiles"])["profiles"]), None
+        run.setup = setup
+        return run
+
+    def _parsed_followers(self) -> list:
+        if "parsed" not in self._pages:
+            parser = BasicFollowersParser()
+            self._pages["parsed"] = [parser.parse(page)
+                                     for page in self._scraped_pages(FollowersScraper, "actor.bsky.social")]
+        return self._pages["parsed"]
+
+    @staticmethod
+    def _writer(name: str):
+        try:
+            return getattr(writers, name)
+        except ImportError as e:
+            raise Skipped(str(e))
+
+    def _write_local(self, make_writer: t.Callable[[], t.Any], file_name: str):
+        def run():
+            try:
+                writer = make_writer()
+            except ImportError as e:
+                raise Skipped(str(e))
+            pages = self._parsed_followers()
+            path = self._path(file_name)
+            writer.write_pages(iter(pages), destination=path, items_key="followers")
+            return sum(len(page["followers"]) for page in pages), os.path.getsize(path)
+        run.setup = self._parsed_followers
+        return run
+
+    def _write_cloud(self, provider: str, encoding: str):
+        def run():
+            writer_type = self._writer(f"{provider}{encoding}DataWriter")
+            with mock.patch(_CLOUD_CLIENTS[provider]):
+                writer = writer_type(*_CLOUD_ARGUMENTS[provider])
+            written = {"bytes": 0}
+
+            def upload_stream(chunks, destination, **kwargs):
+                for chunk in chunks:
+                    written["bytes"] += len(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+            writer.upload_stream = upload_stream
+            pages = self._parsed_followers()
+            writer.write_pages(iter(pages), destination="benchmark", items_key="followers")
+            return sum(len(page["followers"]) for page in pages), written["bytes"]
+        run.setup = self._parsed_followers
+        return run
+
+    def _write_mongodb(self):
+        if not self.mongodb_uri:
+            raise Skipped("no --mongodb-uri given")
+        writer = self._writer("MongoDBDataWriter")(self.mongodb_uri, "bskydata_benchmark", "followers",
+                                                   mode="records")
+        try:
+            writer.client["bskydata_benchmark"].drop_collection("followers")
+            pages = self._parsed_followers()
+            writer.write_pages(iter(pages), items_key="followers")
+            return sum(len(page["followers"]) for page in pages), None
+        finally:
+            writer.client.close()
+
+    def _write_neo4j(self):
+        if not self.neo4j:
+            raise Skipped("no --neo4j-uri given")
+        writer = self._writer("Neo4jDataWriter")(*self.neo4j)
+        try:
+            records = [record for page in self._parsed_followers() for record in explode_records(page, "followers")]
+            writer.write_records(records, _NEO4J_FOLLOWERS_QUERY, parameter="records")
+            return len(records), None
+        finally:
+            writer.disconnect()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the change of every stage against a baseline; return whether any regressed."""
+    regressed = False
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} (tolerance {tolerance:.0%}):")
+    for name, stage in results["stages"].items():
+        before = baseline["stages"].get(name)
+        if not before or "error" in stage or "error" in before or "skipped" in stage or "skipped" in before:
+            continue
+        changes = []
+        for metric in ("records_per_sec", "peak_memory_bytes"):
+            if not before.get(metric) or stage.get(metric) is None:
+                continue
+            change = stage[metric] / before[metric] - 1
+            worse = change > tolerance if metric in _HIGHER_IS_WORSE else change < -tolerance
+            regressed = regressed or worse
+            changes.append(f"{metric} {change:+.1%}{' REGRESSION' if worse else ''}")
+        print(f"  {name:<42} {', '.join(changes)}")
+    return regressed
+
+
+def main(args) -> int:
+    followers = load_records(args.followers_file, "followers") if args.followers_file else None
+    posts = load_records(args.posts_file, "posts") if args.posts_file else None
+    neo4j = (args.neo4j_uri, args.neo4j_user, args.neo4j_password) if args.neo4j_uri else None
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "records": args.records,
+            "repeat": args.repeat,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        },
+        "stages": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        suite = Suite(args.records, workdir, followers=followers, posts=posts,
+                      mongodb_uri=args.mongodb_uri, neo4j=neo4j)
+        print(f"{'stage':<42} {'records/s':>12} {'peak MiB':>9} {'written MiB':>12}")
+        for name, run in suite.stages().items():
+            if args.stages and not any(name.startswith(prefix) for prefix in args.stages):
+                continue
+            try:
+                stage = _measure(run, args.repeat)
+            except Skipped as e:
+                stage = {"skipped": str(e)}
+                print(f"{name:<42} skipped: {e}")
+            except Exception as e:
+                stage = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{name:<42} error: {stage['error']}")
+            else:
+                written = f"{stage['bytes_written'] / 2 ** 20:12.2f}" if stage["bytes_written"] is not None else f"{'-':>12}"
+                print(f"{name:<42} {stage['records_per_sec']:12,.0f} {stage['peak_memory_bytes'] / 2 ** 20:9.1f} {written}")
+            results["stages"][name] = stage
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("records") != args.records:
+            print(f"Warning: the baseline was run with {baseline['meta'].get('records')} records.")
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 1 if any("error" in stage for stage in results["stages"].values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scrapers, parsers and writers offline.")
+    parser.add_argument("--records", type=int, default=20_000, help="Records per stage.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage; the fastest counts.")
+    parser.add_argument("--stages", nargs="+", help="Only run stages starting with these prefixes (e.g. scrape parse).")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results JSON of an earlier run.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression.")
+    parser.add_argument("--followers-file", help="Recorded followers crawl to replay instead of synthetic profiles.")
+    parser.add_argument("--posts-file", help="Recorded search crawl to replay instead of synthetic posts.")
+    parser.add_argument("--mongodb-uri", help="MongoDB server for the MongoDB writer stage.")
+    parser.add_argument("--neo4j-uri", help="Neo4j server for the Neo4j writer stage.")
+    parser.add_argument("--neo4j-user", default="neo4j", help="Neo4j username.")
+    parser.add_argument("--neo4j-password", default="", help="Neo4j password.")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,11 @@
+from bskydata.analytics.metrics import (
+    adjacency_matrix,
+    degree_centrality,
+    label_propagation,
+    metrics_pages,
+    mutual_follows,
+    mutuals_pages,
+    pagerank,
+    write_metrics,
+    write_mutuals,
+)
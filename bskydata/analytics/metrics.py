@@ -0,0 +1,229 @@
+import time
+import typing as t
+from bskydata.graph.adjacency import AdjacencyIndex
+from bskydata.storage.writers.base import DataWriter
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy and scipy are optional dependencies
+    np = None
+    sparse = None
+
+
+def _require_scipy():
+    if sparse is None:
+        raise ImportError("bskydata.analytics requires numpy and scipy: pip install bskydata[analytics]")
+
+
+def adjacency_matrix(index: AdjacencyIndex, direction: str = "follows") -> "sparse.csr_matrix":
+    """
+    Sparse adjacency matrix of a follow graph, sharing the index's CSR arrays.
+
+    :param index: The follow graph.
+    :param direction: "follows" for A (A[i, j] = 1 when i follows j), "followers" for its transpose.
+    :return: An n x n CSR matrix of float32 ones.
+    """
+    _require_scipy()
+    indptr, indices = index.csr(direction)
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(index), len(index)))
+
+
+def degree_centrality(index: AdjacencyIndex) -> t.Dict[str, "np.ndarray"]:
+    """
+    In- and out-degree of every account, raw and normalised by n - 1.
+
+    :param index: The follow graph.
+    :return: {"in_degree", "out_degree", "in_degree_centrality", "out_degree_centrality"}
+             arrays indexed by account id.
+    """
+    _require_scipy()
+    in_degree, out_degree = index.degrees("followers"), index.degrees("follows")
+    scale = 1.0 / max(len(index) - 1, 1)
+    return {
+        "in_degree": in_degree,
+        "out_degree": out_degree,
+        "in_degree_centrality": in_degree * scale,
+        "out_degree_centrality": out_degree * scale,
+    }
+
+
+def pagerank(index: AdjacencyIndex, alpha: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> "np.ndarray":
+    """
+    PageRank of every account by power iteration over the sparse follow matrix.
+
+    Following an account passes rank to it. Accounts that follow nobody
+    spread their rank evenly over all accounts, as in NetworkX.
+
+    :param index: The follow graph.
+    :param alpha: Damping factor.
+    :param tol: Stop once the L1 change of the ranks is below n * tol.
+    :param max_iter: Maximum number of iterations.
+    :return: Ranks summing to 1, indexed by account id.
+    """
+    _require_scipy()
+    n = len(index)
+    if n == 0:
+        return np.zeros(0)
+    # The followers matrix is the transpose of the follows matrix, so rank flows along its rows.
+    incoming = adjacency_matrix(index, "followers")
+    out_degree = index.degrees("follows").astype(np.float64)
+    dangling = out_degree == 0
+    inverse_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = ranks
+        ranks = alpha * (incoming @ (previous * inverse_degree))
+        ranks += (alpha * previous[dangling].sum() + 1.0 - alpha) / n
+        if np.abs(ranks - previous).sum() < n * tol:
+            break
+    return ranks / ranks.sum()
+
+
+def mutual_follows(index: AdjacencyIndex) -> t.Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Pairs of accounts that follow each other.
+
+    :param index: The follow graph.
+    :return: (a, b) id arrays with a < b, one entry per mutual pair.
+    """
+    _require_scipy()
+    mutual = adjacency_matrix(index, "follows").multiply(adjacency_matrix(index, "followers"))
+    pairs = sparse.triu(mutual, k=1, format="coo")
+    return pairs.row, pairs.col
+
+
+def label_propagation(index: AdjacencyIndex, max_iter: int = 30, seed: int = 0) -> "np.ndarray":
+    """
+    Communities by label propagation over the undirected follow graph.
+
+    Every account starts in its own community and repeatedly adopts the most
+    common community among its neighbours and itself, ties broken at random.
+    A round counts the communities around every account at once, as the
+    sparse product of the adjacency matrix and a one-hot community matrix.
+    Half of the accounts, chosen at random, move per round, which keeps
+    labels from oscillating.
+
+    :param index: The follow graph.
+    :param max_iter: Maximum number of rounds.
+    :param seed: Seed of the random tie-breaking, for reproducible communities.
+    :return: Community numbers (0, 1, ...) indexed by account id.
+    """
+    _require_scipy()
+    n = len(index)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    undirected = adjacency_matrix(index, "follows") + adjacency_matrix(index, "followers")
+    undirected = (undirected + sparse.identity(n, dtype=np.float32, format="csr")).tocsr()
+    undirected.data[:] = 1.0
+    rng = np.random.default_rng(seed)
+    nodes = np.arange(n)
+    ones = np.ones(n, dtype=np.float32)
+    labels = nodes.copy()
+    for _ in range(max_iter):
+        counts = (undirected @ sparse.csr_matrix((ones, (nodes, labels)), shape=(n, n))).tocsr()
+        # Noise below 1 only decides between equally common labels. The self
+        # loop means every row has at least one entry.
+        scores = counts.data + 0.5 * rng.random(n)[counts.indices]
+        rows = np.repeat(nodes, np.diff(counts.indptr))
+        is_best = scores == np.maximum.reduceat(scores, counts.indptr[:-1])[rows]
+        best = np.empty(n, dtype=labels.dtype)
+        best[rows[is_best]] = counts.indices[is_best]
+        if np.array_equal(best, labels):
+            break
+        labels = np.where(rng.random(n) < 0.5, best, labels)
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def metrics_pages(index: AdjacencyIndex,
+                  ranks: "np.ndarray" = None,
+                  communities: "np.ndarray" = None,
+                  page_size: int = 100_000) -> t.Iterator[dict]:
+    """
+    Per-account metrics as pages of records under "metrics".
+
+    Every record holds the account's DID, degrees and degree centralities,
+    plus its PageRank and community when given.
+
+    :param index: The follow graph.
+    :param ranks: Optional result of `pagerank`.
+    :param communities: Optional result of `label_propagation`.
+    :param page_size: Number of records per page.
+    """
+    columns = degree_centrality(index)
+    if ranks is not None:
+        columns["pagerank"] = ranks
+    if communities is not None:
+        columns["community"] = communities
+    created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    for start in range(0, len(index), page_size):
+        stop = min(start + page_size, len(index))
+        values = {name: column[start:stop].tolist() for name, column in columns.items()}
+        yield {
+            "created_at": created_at,
+            "metrics": [
+                {"did": index.did(start + i), **{name: column[i] for name, column in values.items()}}
+                for i in range(stop - start)
+            ]
+        }
+
+
+def mutuals_pages(index: AdjacencyIndex, pairs: t.Tuple["np.ndarray", "np.ndarray"] = None,
+                  page_size: int = 100_000) -> t.Iterator[dict]:
+    """
+    Mutual follows as pages of {"did", "mutual_did"} records under "mutuals".
+
+    :param index: The follow graph.
+    :param pairs: Optional result of `mutual_follows`; computed when omitted.
+    :param page_size: Number of records per page.
+    """
+    a, b = pairs if pairs is not None else mutual_follows(index)
+    created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    for start in range(0, len(a), page_size):
+        yield {
+            "created_at": created_at,
+            "mutuals": [
+                {"did": index.did(i), "mutual_did": index.did(j)}
+                for i, j in zip(a[start:start + page_size].tolist(), b[start:start + page_size].tolist())
+            ]
+        }
+
+
+def write_metrics(index: AdjacencyIndex,
+                  writer: DataWriter,
+                  destination: str = None,
+                  pagerank_alpha: float = 0.85,
+                  communities: bool = True) -> dict:
+    """
+    Compute degree centrality, PageRank and (optionally) communities, and
+    stream them to a writer under "metrics".
+
+    :param index: The follow graph.
+    :param writer: Writer the metrics are written through.
+    :param destination: Destination passed to the writer.
+    :param pagerank_alpha: Damping factor of PageRank.
+    :param communities: Also detect communities by label propagation.
+    :return: {"accounts", "communities"} counts.
+    """
+    ranks = pagerank(index, alpha=pagerank_alpha)
+    labels = label_propagation(index) if communities else None
+    writer.write_pages(metrics_pages(index, ranks, labels), destination=destination, items_key="metrics")
+    return {
+        "accounts": len(index),
+        "communities": int(labels.max()) + 1 if labels is not None and len(labels) else 0,
+    }
+
+
+def write_mutuals(index: AdjacencyIndex, writer: DataWriter, destination: str = None) -> int:
+    """
+    Detect mutual follows and stream them to a writer under "mutuals".
+
+    :param index: The follow graph.
+    :param writer: Writer the pairs are written through.
+    :param destination: Destination passed to the writer.
+    :return: Number of mutual pairs.
+    """
+    pairs = mutual_follows(index)
+    writer.write_pages(mutuals_pages(index, pairs), destination=destination, items_key="mutuals")
+    return len(pairs[0])
@@ -1 +1,4 @@
-from bskydata.api.client import BskyApiClient
\ No newline at end of file
+from bskydata.api.client import BskyApiClient, AsyncBskyApiClient
+from bskydata.api.pool import BskyClientPool
+from bskydata.api.rate_limit import RateLimiter
+from bskydata.api.session import SessionCache
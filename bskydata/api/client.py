@@ -1,6 +1,9 @@
 import os
-from atproto import Client
+import time
+from atproto import Client, AsyncClient, Session, SessionEvent, get_jwt_payload
 from atproto.exceptions import AtProtocolError
+from bskydata.api.rate_limit import RateLimiter, RateLimitedRequest, AsyncRateLimitedRequest
+from bskydata.api.session import SessionCache
 
 
 def requires_authentication(func):
@@ -17,17 +20,42 @@ class AuthenticationError(Exception):
 
 
 class BskyApiClient:
-    def __init__(self, username: str = None, password: str = None):
-        self._client = Client()
+    def __init__(self,
+                 username: str = None,
+                 password: str = None,
+                 rate_limiter: RateLimiter = None,
+                 session_cache: SessionCache = None,
+                 base_url: str = None):
+        """
+        :param username: Bluesky handle or email.
+        :param password: Account or app password.
+        :param rate_limiter: Rate limiter shared by every call made through this client.
+        :param session_cache: Cache of session strings reused instead of logging in again.
+        :param base_url: Server to talk to instead of https://bsky.social, e.g. a self-hosted PDS
+                         or a local FakeXrpcServer.
+        """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.base_url = base_url
         self._authenticated = False
         self.did = None
+        self.session_cache = session_cache
+        self._session_account = None
+        self._client = self._new_client()
         if username and password:
             self.authenticate(username, password)
 
     def authenticate(self, username: str, password: str):
-        """Authenticate using provided credentials."""
+        """
+        Authenticate using provided credentials.
+
+        With a session cache, the session cached for `username` is reused and
+        refreshed if its access token is about to expire. A full login only
+        happens when there is no cached session or it can no longer be refreshed.
+        """
+        self._session_account = username
         try:
-            self._client.login(username, password)
+            if not self._resume_session(username):
+                self._client.login(username, password)
             self.did = self._client.me.did  # Access the 'did' attribute directly
             self._authenticated = True
         except AtProtocolError as e:
@@ -35,6 +63,32 @@ class BskyApiClient:
         except AttributeError:
             raise AuthenticationError("Failed to retrieve user DID after authentication.")
 
+    def _new_client(self) -> Client:
+        client = Client(self.base_url, request=RateLimitedRequest(self.rate_limiter))
+        if self.session_cache is not None:
+            client.on_session_change(self._on_session_change)
+        return client
+
+    def _resume_session(self, username: str) -> bool:
+        """Log in with the cached session of `username`, refreshing it if needed."""
+        session_string = self.session_cache.load(username) if self.session_cache is not None else None
+        if not session_string:
+            return False
+        try:
+            if _refresh_token_expired(session_string):
+                raise AuthenticationError("Cached session can no longer be refreshed.")
+            self._client.login(session_string=session_string)
+        except (AtProtocolError, AuthenticationError, ValueError):
+            self.session_cache.clear(username)
+            # Start over so the password login does not try to refresh the stale session.
+            self._client = self._new_client()
+            return False
+        return True
+
+    def _on_session_change(self, event: SessionEvent, session):
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH) and self._session_account:
+            self.session_cache.save(self._session_account, session.export())
+
     def ensure_authenticated(self):
         """Ensure the client is authenticated before making API calls."""
         if not self._authenticated:
@@ -45,3 +99,82 @@ class BskyApiClient:
         """Provide access to the underlying AtprotoClient."""
         self.ensure_authenticated()
         return self._client
+
+
+class AsyncBskyApiClient:
+    """
+    Asyncio counterpart of BskyApiClient built on atproto's AsyncClient.
+    Authentication is a coroutine, so it is not performed in __init__:
+
+        client = AsyncBskyApiClient()
+        await client.authenticate(username, password)
+    """
+    def __init__(self, rate_limiter: RateLimiter = None, session_cache: SessionCache = None, base_url: str = None):
+        """
+        :param rate_limiter: Rate limiter shared by every call made through this client.
+        :param session_cache: Cache of session strings reused instead of logging in again.
+        :param base_url: Server to talk to instead of https://bsky.social.
+        """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.base_url = base_url
+        self._authenticated = False
+        self.did = None
+        self.session_cache = session_cache
+        self._session_account = None
+        self._client = self._new_client()
+
+    async def authenticate(self, username: str, password: str):
+        """Authenticate using provided credentials, reusing a cached session like BskyApiClient."""
+        self._session_account = username
+        try:
+            if not await self._resume_session(username):
+                await self._client.login(username, password)
+            self.did = self._client.me.did
+            self._authenticated = True
+        except AtProtocolError as e:
+            raise AuthenticationError("Authentication failed") from e
+        except AttributeError:
+            raise AuthenticationError("Failed to retrieve user DID after authentication.")
+
+    def _new_client(self) -> AsyncClient:
+        client = AsyncClient(self.base_url, request=AsyncRateLimitedRequest(self.rate_limiter))
+        if self.session_cache is not None:
+            client.on_session_change(self._on_session_change)
+        return client
+
+    async def _resume_session(self, username: str) -> bool:
+        """Log in with the cached session of `username`, refreshing it if needed."""
+        session_string = self.session_cache.load(username) if self.session_cache is not None else None
+        if not session_string:
+            return False
+        try:
+            if _refresh_token_expired(session_string):
+                raise AuthenticationError("Cached session can no longer be refreshed.")
+            await self._client.login(session_string=session_string)
+        except (AtProtocolError, AuthenticationError, ValueError):
+            self.session_cache.clear(username)
+            # Start over so the password login does not try to refresh the stale session.
+            self._client = self._new_client()
+            return False
+        return True
+
+    async def _on_session_change(self, event: SessionEvent, session):
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH) and self._session_account:
+            self.session_cache.save(self._session_account, session.export())
+
+    def ensure_authenticated(self):
+        """Ensure the client is authenticated before making API calls."""
+        if not self._authenticated:
+            raise AuthenticationError("You must authenticate before making API calls.")
+
+    @property
+    def client(self):
+        """Provide access to the underlying atproto AsyncClient."""
+        self.ensure_authenticated()
+        return self._client
+
+
+def _refresh_token_expired(session_string: str) -> bool:
+    """Whether the refresh token of a cached session string has expired."""
+    payload = get_jwt_payload(Session.decode(session_string).refresh_jwt)
+    return bool(payload.exp) and payload.exp <= time.time()
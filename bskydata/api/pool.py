@@ -0,0 +1,157 @@
+import itertools
+import threading
+import typing as t
+from atproto.exceptions import AtProtocolError
+from bskydata.api.client import AuthenticationError, BskyApiClient, AsyncBskyApiClient
+from bskydata.api.session import SessionCache
+
+
+class BskyClientPool:
+    """
+    Several authenticated accounts used as one client.
+
+    Every account keeps its own session and RateLimiter, so a pool of N
+    accounts has N times the rate budget of a single BskyApiClient. Each access
+    to `client` picks an account, either in turn ("round_robin") or the one
+    whose rate limiter would let a request through soonest ("least_loaded").
+    The pool has the same `client` / `ensure_authenticated` interface as
+    BskyApiClient, so it can be passed to any scraper:
+
+        pool = BskyClientPool.from_credentials([(username1, password1), (username2, password2)])
+        FollowersScraper(pool).fetch("bsky.app")
+
+    A pool of AsyncBskyApiClient instances works the same way with the async
+    scrapers. Accounts that fail `check_health` (or `check_health_async`) are
+    left out until a later check passes.
+    """
+    strategies = ("round_robin", "least_loaded")
+
+    def __init__(self,
+                 clients: t.Iterable[t.Union[BskyApiClient, AsyncBskyApiClient]],
+                 strategy: str = "round_robin"):
+        """
+        :param clients: Authenticated clients, one per account.
+        :param strategy: "round_robin" or "least_loaded".
+        """
+        self.clients = list(clients)
+        if not self.clients:
+            raise ValueError("BskyClientPool needs at least one client.")
+        if strategy not in self.strategies:
+            raise ValueError(f"strategy must be one of {self.strategies}.")
+        self.strategy = strategy
+        self._healthy = [True] * len(self.clients)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_credentials(cls,
+                         credentials: t.Iterable[t.Tuple[str, str]],
+                         strategy: str = "round_robin",
+                         session_cache: SessionCache = None,
+                         base_url: str = None) -> "BskyClientPool":
+        """
+        Log in to every account and pool the sessions.
+
+        :param credentials: (username, password) pairs.
+        :param strategy: "round_robin" or "least_loaded".
+        :param session_cache: Cache of session strings reused instead of logging in again.
+        :param base_url: Server every client talks to instead of https://bsky.social.
+        :return: The pool.
+        """
+        return cls(
+            [
+                BskyApiClient(username=username, password=password, session_cache=session_cache, base_url=base_url)
+                for username, password in credentials
+            ],
+            strategy=strategy
+        )
+
+    def _available(self) -> t.List[t.Union[BskyApiClient, AsyncBskyApiClient]]:
+        available = []
+        for member, healthy in zip(self.clients, self._healthy):
+            if not healthy:
+                continue
+            try:
+                member.ensure_authenticated()
+            except AuthenticationError:
+                continue
+            available.append(member)
+        return available
+
+    def select(self) -> t.Union[BskyApiClient, AsyncBskyApiClient]:
+        """
+        Pick the account the next request should go through.
+
+        :return: One of the pooled clients.
+        """
+        with self._lock:
+            available = self._available()
+            if not available:
+                raise AuthenticationError("No healthy authenticated client left in the pool.")
+            if self.strategy == "least_loaded":
+                return min(available, key=lambda member: (member.rate_limiter.delay(), member.rate_limiter.requests))
+            return available[next(self._turn) % len(available)]
+
+    def ensure_authenticated(self):
+        """Ensure at least one healthy, authenticated account is available."""
+        with self._lock:
+            if not self._available():
+                raise AuthenticationError("No healthy authenticated client left in the pool.")
+
+    @property
+    def client(self):
+        """The underlying atproto client of the account picked for the next request."""
+        return self.select().client
+
+    @property
+    def rate_limiter(self):
+        """The rate limiter of the account picked for the next request."""
+        return self.select().rate_limiter
+
+    def check_health(self) -> t.List[bool]:
+        """
+        Check every session with a getSession call and update which accounts are used.
+
+        :return: Health of each client, in pool order.
+        """
+        for i, member in enumerate(self.clients):
+            try:
+                member.client.com.atproto.server.get_session()
+                self._healthy[i] = True
+            except (AtProtocolError, AuthenticationError):
+                self._healthy[i] = False
+        return list(self._healthy)
+
+    async def check_health_async(self) -> t.List[bool]:
+        """
+        Asyncio counterpart of `check_health` for pools of AsyncBskyApiClient.
+
+        :return: Health of each client, in pool order.
+        """
+        for i, member in enumerate(self.clients):
+            try:
+                await member.client.com.atproto.server.get_session()
+                self._healthy[i] = True
+            except (AtProtocolError, AuthenticationError):
+                self._healthy[i] = False
+        return list(self._healthy)
+
+    def stats(self) -> t.List[dict]:
+        """
+        Per-account rate accounting.
+
+        :return: One dictionary per client with its DID, health, request and
+                 429 counts, and the rate limit state last reported by the server.
+        """
+        return [
+            {
+                "did": member.did,
+                "healthy": healthy,
+                "requests": member.rate_limiter.requests,
+                "throttled": member.rate_limiter.throttled,
+                "rate": member.rate_limiter.rate,
+                "limit": member.rate_limiter.limit,
+                "remaining": member.rate_limiter.remaining,
+            }
+            for member, healthy in zip(self.clients, self._healthy)
+        ]
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+from atproto_client.exceptions import RequestException
+from atproto_client.request import Request, AsyncRequest
+
+
+class RateLimiter:
+    """
+    Token bucket shared by everything that talks to the API through one account.
+
+    The bucket starts at `rate` requests per second and re-tunes itself from the
+    `ratelimit-*` headers the server sends back: the refill rate follows the
+    remaining quota spread over the time left in the window. A 429 response
+    blocks all callers until `Retry-After` (or the window reset) has passed and
+    halves the rate. Safe to share between threads and coroutines.
+    """
+    def __init__(self,
+                 rate: float = 10.0,
+                 capacity: int = 10,
+                 min_rate: float = 0.1,
+                 max_rate: float = 100.0):
+        """
+        :param rate: Initial number of requests per second.
+        :param capacity: Maximum burst size.
+        :param min_rate: Lower bound the rate can adapt down to.
+        :param max_rate: Upper bound the rate can adapt up to.
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1.")
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.limit = None
+        self.remaining = None
+        # Per-session accounting, e.g. for picking the least loaded account of a pool.
+        self.requests = 0
+        self.throttled = 0
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            self.requests += 1
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def delay(self) -> float:
+        """Seconds a request reserved now would have to wait, without reserving it."""
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            wait = max(0.0, self._blocked_until - now)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / self.rate)
+            return wait
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Suspend the calling coroutine until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _set_rate(self, rate: float):
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def update(self, headers: t.Dict[str, t.Any], status_code: int = 200):
+        """
+        Adapt the bucket to a server response.
+
+        :param headers: Response headers (lower-cased keys, as returned by atproto).
+        :param status_code: HTTP status of the response.
+        """
+        limit = _to_float(headers.get("ratelimit-limit"))
+        remaining = _to_float(headers.get("ratelimit-remaining"))
+        reset = _to_float(headers.get("ratelimit-reset"))
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = int(remaining)
+            window = max(reset - time.time(), 1.0) if reset is not None else None
+
+            if status_code == 429:
+                self.throttled += 1
+                retry_after = _parse_retry_after(headers.get("retry-after"))
+                if retry_after is None:
+                    retry_after = window if window is not None else 1.0 / self.rate
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                self._tokens = min(self._tokens, 0.0)
+                self._set_rate(self.rate / 2)
+            elif remaining is not None and window is not None:
+                if remaining <= 0:
+                    self._blocked_until = max(self._blocked_until, now + window)
+                    self._tokens = min(self._tokens, 0.0)
+                else:
+                    self._set_rate(remaining / window)
+
+
+class RateLimitedRequest(Request):
+    """atproto request layer that routes every call through a RateLimiter."""
+    def __init__(self, rate_limiter: RateLimiter = None, max_retries: int = 3):
+        super().__init__()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+
+    def clone(self):
+        cloned_request = type(self)(self.rate_limiter, self.max_retries)
+        cloned_request.set_additional_headers(self.get_headers())
+        return cloned_request
+
+    def _send_request(self, method: str, url: str, **kwargs: t.Any):
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = super()._send_request(method, url, **kwargs)
+            except RequestException as e:
+                if not _is_rate_limited(e):
+                    raise
+                self.rate_limiter.update(e.response.headers, status_code=429)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            self.rate_limiter.update(response.headers, status_code=response.status_code)
+            return response
+
+
+class AsyncRateLimitedRequest(AsyncRequest):
+    """Asyncio counterpart of RateLimitedRequest."""
+    def __init__(self, rate_limiter: RateLimiter = None, max_retries: int = 3):
+        super().__init__()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+
+    def clone(self):
+        cloned_request = type(self)(self.rate_limiter, self.max_retries)
+        cloned_request.set_additional_headers(self.get_headers())
+        return cloned_request
+
+    async def _send_request(self, method: str, url: str, **kwargs: t.Any):
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            try:
+                response = await super()._send_request(method, url, **kwargs)
+            except RequestException as e:
+                if not _is_rate_limited(e):
+                    raise
+                self.rate_limiter.update(e.response.headers, status_code=429)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            self.rate_limiter.update(response.headers, status_code=response.status_code)
+            return response
+
+
+def _is_rate_limited(error: RequestException) -> bool:
+    return error.response is not None and error.response.status_code == 429
+
+
+def _to_float(value: t.Any) -> t.Union[float, None]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(value: t.Any) -> t.Union[float, None]:
+    """`Retry-After` is either a number of seconds or an HTTP date."""
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    if not value:
+        return None
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
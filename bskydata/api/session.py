@@ -0,0 +1,68 @@
+import hashlib
+import os
+import re
+import typing as t
+from pathlib import Path
+
+
+DEFAULT_SESSION_DIRECTORY = os.path.join(os.path.expanduser("~"), ".bskydata", "sessions")
+
+
+class SessionCache:
+    """
+    On-disk cache of atproto session strings, one file per account.
+
+    A cached session lets a client skip `createSession` (which is slow and
+    strictly rate limited) on start-up. Session strings hold the account's
+    access and refresh tokens, so the files are only readable by their owner
+    and are written atomically.
+    """
+    def __init__(self, directory: str = DEFAULT_SESSION_DIRECTORY):
+        """
+        :param directory: Directory holding the session files (created if missing).
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def _path(self, account: str) -> Path:
+        # Handles and emails are case-insensitive; the hash keeps names unique.
+        account = account.strip().lower()
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", account)[:100]
+        digest = hashlib.sha1(account.encode("utf-8")).hexdigest()[:10]
+        return self.directory / f"{safe_name}-{digest}.session"
+
+    def load(self, account: str) -> t.Union[str, None]:
+        """
+        Load the session string cached for `account`.
+
+        :param account: The handle or email the account logs in with.
+        :return: The session string, or None if there is none.
+        """
+        path = self._path(account)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8").strip() or None
+
+    def save(self, account: str, session_string: str):
+        """
+        Atomically replace the session string cached for `account`.
+
+        :param account: The handle or email the account logs in with.
+        :param session_string: Session string exported by the atproto client.
+        """
+        path = self._path(account)
+        temp_path = path.with_suffix(".session.tmp")
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(session_string)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def clear(self, account: str):
+        """
+        Remove the session cached for `account`, if any.
+
+        :param account: The handle or email the account logs in with.
+        """
+        self._path(account).unlink(missing_ok=True)
@@ -1,17 +1,33 @@
+import logging
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bskydata.storage.writers.database.neo4j import Neo4jDataWriter
 from bskydata.api import BskyApiClient
 from bskydata.scrapers import FollowsScraper, SearchTermScraper, ProfilesScraper
-from bskydata.storage.writers import LocalJsonFileWriter
 from bskydata.parsers import BasicFollowsParser, BasicSearchTermsParser, BasicProfilesParser
 
 
+logger = logging.getLogger(__name__)
+
+
 class BuildNetworkSearchAndFollowsNeo4j:
+    # Uniqueness constraints backing every MERGE key used by the builder.
+    unique_keys = [("Author", "did"), ("Post", "uri"), ("Tag", "name")]
+
     def __init__(self,
                  bsky_username:str,
                  bsky_password:str,
                  neo4j_uri:str,
                  neo4j_username:str,
-                 neo4j_password:str):
+                 neo4j_password:str,
+                 follows_limit: int = 2000,
+                 max_workers: int = 4,
+                 batch_size: int = 5000):
+        """
+        :param follows_limit: Approximate maximum number of follows crawled per author.
+        :param max_workers: Number of authors whose follows are crawled concurrently.
+        :param batch_size: Number of records sent to Neo4j per write transaction.
+        """
         self.client = BskyApiClient(
             username=bsky_username,
             password=bsky_password
@@ -22,104 +38,128 @@ class BuildNetworkSearchAndFollowsNeo4j:
             username=neo4j_username,
             password=neo4j_password
         )
-    
+        self.writer.ensure_schema(self.unique_keys)
+        self.follows_limit = follows_limit
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
     def _scrape_profiles(self, actors: list):
-        scraper = ProfilesScraper(self.client)
-        profiles = scraper.fetch(actors, destination="profiles.json")
+        scraper = ProfilesScraper(self.client, parser=BasicProfilesParser())
+        profiles = scraper.fetch(actors)
         return profiles
-    
+
     def _scrape_follows(self, actor:str, limit: int = 2000):
         if not actor.startswith("did:"):
             profiles = self._scrape_profiles([actor])
             actor = profiles['profiles'][0]['did']
 
-        json_writer = LocalJsonFileWriter()
-        basic_parser = BasicFollowsParser()
-        scraper = FollowsScraper(self.client, 
-                                writer=json_writer, 
-                                parser=basic_parser)
-
-        follows = scraper.fetch(actor, 
-                                destination=f"follows.json",
-                                limit=limit)
-        
+        scraper = FollowsScraper(self.client, parser=BasicFollowsParser())
+        follows = scraper.fetch(actor, limit=limit)
         return follows
-    
+
+    def _scrape_follow_edges(self, actor_profile: dict, limit: int = 2000) -> t.List[dict]:
+        """Crawl the follows of one hydrated author as flat FOLLOWS edges."""
+        follows = self._scrape_follows(actor_profile['did'], limit=limit)
+        return [
+            {
+                "actor_did": actor_profile['did'],
+                "actor_display_name": actor_profile.get('display_name') or "",
+                "actor_handle": actor_profile.get('handle') or "",
+                **follow
+            }
+            for follow in follows['follows']
+        ]
+
     def _scrape_search_posts(self, search_term:str, limit:int = 2000):
-        json_writer = LocalJsonFileWriter()
         parser = BasicSearchTermsParser()
-        scraper = SearchTermScraper(self.client, 
-                                    writer=json_writer, 
-                                    parser=parser)
-        
+        scraper = SearchTermScraper(self.client, parser=parser)
+
         posts = scraper.fetch(
-            search_term, 
-            destination=f"posts.json",
+            search_term,
             limit=limit
-            )        
+            )
         return posts
 
-    def _insert_follows(self, data):
+    def _iter_follow_edges(self, actor_profiles: t.List[dict]) -> t.Iterator[dict]:
+        """
+        Crawl the follows of many authors concurrently, yielding edges as crawls finish.
+
+        An author whose crawl fails is logged and skipped. When the consumer
+        stops early (e.g. a failed Neo4j write), crawls not started yet are
+        cancelled.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(self._scrape_follow_edges, profile, self.follows_limit): profile['did']
+                for profile in actor_profiles
+            }
+            for n, future in enumerate(as_completed(futures), start=1):
+                try:
+                    edges = future.result()
+                except Exception:
+                    logger.exception("Crawling the follows of %s failed; skipping it.", futures[future])
+                    continue
+                print(f"Store follows for the following profiles: {futures[future]}. {n}/{len(futures)}")
+                yield from edges
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _insert_follows(self, edges: t.Iterable[dict]):
         query = """
-        MERGE (actor:Author {did: $actor_did})
-        ON CREATE SET actor.display_name = $actor_display_name, 
-                      actor.handle = $actor_handle
+        UNWIND $edges AS edge
+        MERGE (actor:Author {did: edge.actor_did})
+        ON CREATE SET actor.display_name = edge.actor_display_name,
+                      actor.handle = edge.actor_handle
 
-        WITH actor
-        UNWIND $follows AS follow
-        MERGE (followed:Author {did: follow.did})
-        ON CREATE SET followed.display_name = follow.display_name, 
-                      followed.handle = follow.handle
+        MERGE (followed:Author {did: edge.did})
+        ON CREATE SET followed.display_name = edge.display_name,
+                      followed.handle = edge.handle
 
         MERGE (actor)-[r:FOLLOWS]->(followed)
-        ON CREATE SET r.created_at = follow.created_at
+        ON CREATE SET r.created_at = edge.created_at
         """
-        self.writer.session.run(query, 
-                    actor_did=data["actor"],
-                    actor_display_name=data.get("actor_display_name", ""),
-                    actor_handle=data.get("actor_handle", ""),
-                    follows=data["follows"])
+        self.writer.write_records(edges, query, parameter="edges", batch_size=self.batch_size)
 
     def _insert_posts_bulk(self, posts):
         query = """
         UNWIND $posts AS post_data
-        
+
         // Merge Author
-        MERGE (author:Author {did: post_data.did})
+        MERGE (author:Author {did: post_data.author_did})
         ON CREATE SET author.display_name = post_data.author_display_name,
                     author.handle = post_data.author_handle
 
         // Merge Post
-        MERGE (post:Post {created_at: post_data.post_created_at})
-        ON CREATE SET post.text = post_data.post_text
+        MERGE (post:Post {uri: post_data.post_uri})
+        ON CREATE SET post.cid = post_data.post_cid,
+                    post.text = post_data.post_text,
+                    post.created_at = post_data.post_created_at
 
         // Create Relationship between Author and Post
         MERGE (author)-[:CREATED]->(post)
 
         // Merge Tags and Relationships (convert tag names to lowercase)
-        FOREACH (tag_name IN post_data.tags | 
+        FOREACH (tag_name IN post_data.tags |
             MERGE (tag:Tag {name: toLower(tag_name)})
             MERGE (post)-[:HAS_TAG]->(tag)
         )
         """
-        self.writer.session.run(query, posts=posts)
+        self.writer.write_records(posts, query, parameter="posts", batch_size=self.batch_size)
 
 
     def run(self, search_term: str):
+        """
+        Build the follows network of every author posting about `search_term`.
+
+        Authors are hydrated with batched profile requests, their follows are
+        crawled concurrently and the resulting edges are streamed to Neo4j in
+        transactional batches of `batch_size` while the crawl is still running.
+        """
         search_data = self._scrape_search_posts(search_term)
-        unique_actors = list(set([p['author_did'] for p in search_data["posts"]]))
-        n = 0
-        for actor in unique_actors:
-            n += 1
-            print(f"Store follows for the following profiles: {actor}. {n}/{len(unique_actors)}")
-            actor_profile = self._scrape_profiles([actor])['profiles'][0]
-            follows = self._scrape_follows(actor)
-            follows_actor = {
-                "actor": actor,
-                "actor_display_name": actor_profile['display_name'],
-                "actor_handle": actor_profile['handle'],
-                "follows": follows['follows']
-            }
-            self._insert_follows(follows)
+        unique_actors = list(dict.fromkeys(p['author_did'] for p in search_data["posts"]))
+        actor_profiles = self._scrape_profiles(unique_actors)['profiles']
+
+        self._insert_follows(self._iter_follow_edges(actor_profiles))
         self.writer.disconnect()
         print("Data stored successfully.")
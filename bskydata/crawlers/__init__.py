@@ -0,0 +1,2 @@
+from bskydata.crawlers.frontier import Frontier
+from bskydata.crawlers.graph import GraphCrawler
@@ -0,0 +1,206 @@
+import sqlite3
+import threading
+import typing as t
+from pathlib import Path
+
+
+QUEUED, IN_PROGRESS, DONE, FAILED = 0, 1, 2, 3
+
+
+class Frontier:
+    """
+    On-disk crawl frontier and visited set for graph crawls.
+
+    Every account ever discovered is a row of a SQLite table, so membership
+    checks and the queue of accounts still to crawl stay on disk however
+    large the graph grows. Accounts are handed out breadth-first ("bfs":
+    shallowest first, then in discovery order). They can also be handed out
+    by priority ("priority": most often discovered first, i.e. the accounts
+    most connected to what has been crawled so far).
+
+    Accounts that were handed out but not completed when a crawl stopped are
+    queued again when the frontier is reopened, and `retry` queues an account
+    again after a failed attempt. Safe to share between threads.
+    """
+    strategies = ("bfs", "priority")
+
+    def __init__(self, path: str = ".bskydata_frontier.sqlite", strategy: str = "bfs"):
+        """
+        :param path: SQLite database file (created if missing).
+        :param strategy: "bfs" or "priority".
+        """
+        if strategy not in self.strategies:
+            raise ValueError(f"strategy must be one of {self.strategies}.")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                seq INTEGER PRIMARY KEY,
+                did TEXT NOT NULL UNIQUE,
+                depth INTEGER NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 1,
+                state INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS nodes_bfs ON nodes (state, depth, seq);
+            CREATE INDEX IF NOT EXISTS nodes_priority ON nodes (state, hits DESC, seq);
+        """)
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(nodes)")]
+        if "attempts" not in columns:
+            # Frontiers written by earlier versions did not count failed attempts.
+            self._connection.execute("ALTER TABLE nodes ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._connection.execute("UPDATE nodes SET state = ? WHERE state = ?", (QUEUED, IN_PROGRESS))
+        self._connection.commit()
+
+    def add(self, dids: t.Iterable[str], depth: int) -> int:
+        """
+        Discover accounts at `depth`; accounts seen before only count another hit.
+
+        :param dids: DIDs of the discovered accounts.
+        :param depth: Number of hops from the seeds.
+        :return: Number of accounts that were not known before.
+        """
+        dids = list(dict.fromkeys(dids))
+        if not dids:
+            return 0
+        with self._lock:
+            known = 0
+            for i in range(0, len(dids), 500):
+                chunk = dids[i:i + 500]
+                known += self._connection.execute(
+                    f"SELECT COUNT(*) FROM nodes WHERE did IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchone()[0]
+            # A queued account rediscovered closer to the seeds moves up to that depth.
+            self._connection.executemany(
+                """
+                INSERT INTO nodes (did, depth) VALUES (?, ?)
+                ON CONFLICT (did) DO UPDATE SET
+                    hits = hits + 1,
+                    depth = CASE WHEN state = 0 THEN MIN(depth, excluded.depth) ELSE depth END
+                """,
+                [(did, depth) for did in dids]
+            )
+            self._connection.commit()
+        return len(dids) - known
+
+    @staticmethod
+    def _cap(max_per_depth: t.Union[int, t.Dict[int, int], None], depth: int) -> t.Union[int, None]:
+        if isinstance(max_per_depth, dict):
+            return max_per_depth.get(depth)
+        return max_per_depth
+
+    def claim(self,
+              limit: int = 1,
+              max_depth: int = None,
+              max_per_depth: t.Union[int, t.Dict[int, int]] = None,
+              max_nodes: int = None) -> t.List[t.Tuple[str, int]]:
+        """
+        Hand out queued accounts to crawl, marking them in progress.
+
+        :param limit: Maximum number of accounts to hand out.
+        :param max_depth: Only hand out accounts shallower than this.
+        :param max_per_depth: Cap on accounts crawled per depth (one cap for
+                              every depth, or a {depth: cap} dictionary).
+        :param max_nodes: Cap on accounts crawled in total.
+        :return: (did, depth) pairs.
+        """
+        with self._lock:
+            crawled = dict(self._connection.execute(
+                "SELECT depth, COUNT(*) FROM nodes WHERE state != ? GROUP BY depth", (QUEUED,)
+            ).fetchall())
+            if max_nodes is not None:
+                limit = min(limit, max_nodes - sum(crawled.values()))
+            if limit <= 0:
+                return []
+            conditions, parameters = ["state = ?"], [QUEUED]
+            if max_depth is not None:
+                conditions.append("depth < ?")
+                parameters.append(max_depth)
+            full = [
+                depth for depth, count in crawled.items()
+                if self._cap(max_per_depth, depth) is not None and count >= self._cap(max_per_depth, depth)
+            ]
+            if full:
+                conditions.append(f"depth NOT IN ({','.join('?' * len(full))})")
+                parameters.extend(full)
+            order = "depth, seq" if self.strategy == "bfs" else "hits DESC, seq"
+            claimed = []
+            rows = self._connection.execute(
+                f"SELECT did, depth FROM nodes WHERE {' AND '.join(conditions)} ORDER BY {order}", parameters
+            )
+            for did, depth in rows:
+                if len(claimed) >= limit:
+                    break
+                cap = self._cap(max_per_depth, depth)
+                if cap is not None and crawled.get(depth, 0) >= cap:
+                    continue
+                crawled[depth] = crawled.get(depth, 0) + 1
+                claimed.append((did, depth))
+            rows.close()
+            self._connection.executemany(
+                "UPDATE nodes SET state = ? WHERE did = ?", [(IN_PROGRESS, did) for did, _ in claimed]
+            )
+            self._connection.commit()
+        return claimed
+
+    def _set_state(self, did: str, state: int):
+        with self._lock:
+            self._connection.execute("UPDATE nodes SET state = ? WHERE did = ?", (state, did))
+            self._connection.commit()
+
+    def complete(self, did: str):
+        """Mark a claimed account as crawled."""
+        self._set_state(did, DONE)
+
+    def fail(self, did: str):
+        """Mark a claimed account as failed; it is not handed out again."""
+        self._set_state(did, FAILED)
+
+    def retry(self, did: str, max_attempts: int = 3) -> bool:
+        """
+        Count a failed attempt at a claimed account and queue it again,
+        unless it has now failed `max_attempts` times.
+
+        :param did: DID of the claimed account.
+        :param max_attempts: Number of failed attempts after which the account is marked failed.
+        :return: Whether the account was queued again.
+        """
+        with self._lock:
+            attempts = self._connection.execute("SELECT attempts FROM nodes WHERE did = ?", (did,)).fetchone()[0] + 1
+            requeue = attempts < max_attempts
+            self._connection.execute(
+                "UPDATE nodes SET state = ?, attempts = ? WHERE did = ?", (QUEUED if requeue else FAILED, attempts, did)
+            )
+            self._connection.commit()
+        return requeue
+
+    def __contains__(self, did: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM nodes WHERE did = ?", (did,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        :return: Number of accounts queued, in progress, crawled and failed.
+        """
+        with self._lock:
+            counts = dict(self._connection.execute("SELECT state, COUNT(*) FROM nodes GROUP BY state").fetchall())
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "in_progress": counts.get(IN_PROGRESS, 0),
+            "crawled": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
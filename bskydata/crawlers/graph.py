@@ -0,0 +1,183 @@
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from bskydata.api.client import BskyApiClient
+from bskydata.crawlers.frontier import Frontier
+from bskydata.parsers.base import DataParser
+from bskydata.scrapers import FollowersScraper, FollowsScraper, ProfilesScraper
+from bskydata.storage.records import record_field
+from bskydata.storage.writers.base import DataWriter
+
+
+class GraphCrawler:
+    """
+    Multi-hop crawl of the follow graph around a set of seed accounts.
+
+    Starting from the seeds (depth 0), the follows (or followers) of every
+    account are crawled. The accounts found are queued one hop deeper,
+    until `max_depth` hops from the seeds. Every account is crawled at most
+    once, even across runs. The queue and the set of accounts seen live in
+    an on-disk Frontier, so memory stays bounded however large the graph
+    grows. A crawl that stopped continues where it left off when it is run
+    again on the same frontier.
+
+    `max_workers` accounts are crawled concurrently through the client's
+    shared rate limiter (or a BskyClientPool). Each account's pages are
+    parsed and handed to the writer with one `write_pages` call per account,
+    in the same shape as FollowsScraper / FollowersScraper pages, so every
+    edge keeps its own account. Either give a destination template with a
+    file per account (e.g. "follows_{}.json") or a writer that appends
+    (e.g. an NDJSON LocalJsonFileWriter with append=True). An account whose
+    crawl fails is queued again, up to `max_attempts` times.
+    """
+    directions = {"follows": FollowsScraper, "followers": FollowersScraper}
+
+    def __init__(self,
+                 bsky_client: BskyApiClient,
+                 frontier: Frontier,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 direction: str = "follows",
+                 max_depth: int = 2,
+                 max_nodes: int = None,
+                 max_per_depth: t.Union[int, t.Dict[int, int]] = None,
+                 max_edges_per_node: int = 1000,
+                 max_workers: int = 4,
+                 max_attempts: int = 3):
+        """
+        :param bsky_client: Instance of BskyApiClient or BskyClientPool.
+        :param frontier: Frontier holding the queue and the accounts seen.
+        :param writer: Writer instance for outputting the edges.
+        :param parser: Parser instance applied before writing
+                       (BasicFollowsParser or BasicFollowersParser).
+        :param direction: "follows" to crawl outgoing edges, "followers" for incoming ones.
+        :param max_depth: Number of hops from the seeds. Accounts at this depth
+                          are recorded as edge ends but not crawled themselves.
+        :param max_nodes: Cap on accounts crawled in total, across runs.
+        :param max_per_depth: Cap on accounts crawled per depth (one cap for
+                              every depth, or a {depth: cap} dictionary).
+        :param max_edges_per_node: Approximate maximum number of edges fetched per account.
+        :param max_workers: Number of accounts crawled concurrently.
+        :param max_attempts: Number of failed crawls after which an account is given up on.
+        """
+        if direction not in self.directions:
+            raise ValueError(f"direction must be one of {tuple(self.directions)}.")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.bsky_client = bsky_client
+        self.frontier = frontier
+        self.writer = writer
+        self.parser = parser
+        self.direction = direction
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_per_depth = max_per_depth
+        self.max_edges_per_node = max_edges_per_node
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.scraper = self.directions[direction](bsky_client)
+
+    def _resolve(self, actors: t.Iterable[str]) -> t.List[str]:
+        """Turn handles into DIDs; the frontier only knows accounts by DID."""
+        actors = list(actors)
+        handles = [actor for actor in actors if not actor.startswith("did:")]
+        if not handles:
+            return actors
+        profiles = ProfilesScraper(self.bsky_client).fetch(handles)["profiles"]
+        # Handles are case-insensitive and come back normalised to lower case.
+        dids = {profile["handle"].lower(): profile["did"] for profile in profiles}
+        # Handles that no longer resolve are dropped.
+        return [actor if actor.startswith("did:") else dids[actor.lower()]
+                for actor in actors if actor.startswith("did:") or actor.lower() in dids]
+
+    def add_seeds(self, actors: t.Iterable[str]) -> int:
+        """
+        Queue seed accounts at depth 0.
+
+        :param actors: Handles or DIDs of the seeds.
+        :return: Number of seeds that were not known to the frontier before.
+        """
+        return self.frontier.add(self._resolve(actors), depth=0)
+
+    def _crawl_node(self, did: str) -> t.Tuple[t.List[dict], t.List[str]]:
+        """Crawl one account; return its (parsed) pages and the accounts it links to."""
+        models = self.parser is not None and self.parser.accepts_models
+        pages, neighbours = [], []
+        for page in self.scraper.iter_pages(did, limit=self.max_edges_per_node, models=models):
+            neighbours.extend(record_field(item, "did") for item in page[self.direction])
+            pages.append(self.parser.parse(page) if self.parser else page)
+        return pages, neighbours
+
+    def _iter_nodes(self, stats: dict) -> t.Iterator[t.Tuple[str, t.List[dict]]]:
+        """
+        Crawl the queued accounts, yielding (did, pages) as each account finishes.
+
+        The account is marked as crawled, and the accounts it links to are
+        queued, once the caller asks for the next account.
+        """
+        for key in ("nodes", "edges", "failed", "retried"):
+            stats.setdefault(key, 0)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # Keep a few accounts queued per worker so no worker waits for the writer.
+                claimed = self.frontier.claim(
+                    limit=2 * self.max_workers - len(in_flight),
+                    max_depth=self.max_depth,
+                    max_per_depth=self.max_per_depth,
+                    max_nodes=self.max_nodes
+                )
+                for did, depth in claimed:
+                    in_flight[executor.submit(self._crawl_node, did)] = (did, depth)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    did, depth = in_flight.pop(future)
+                    try:
+                        pages, neighbours = future.result()
+                    except Exception:
+                        # Transient failures (a 5xx, a 429 after retries) get another attempt.
+                        if self.frontier.retry(did, self.max_attempts):
+                            stats["retried"] += 1
+                        else:
+                            stats["failed"] += 1
+                        continue
+                    stats["edges"] += sum(len(page.get(self.direction) or []) for page in pages)
+                    yield did, pages
+                    self.frontier.add((n for n in neighbours if n), depth=depth + 1)
+                    self.frontier.complete(did)
+                    stats["nodes"] += 1
+
+    def iter_pages(self, stats: dict = None) -> t.Iterator[dict]:
+        """
+        Crawl the queued accounts, yielding each account's pages as it finishes.
+
+        An account is marked as crawled, and the accounts it links to are
+        queued, once the caller asks for the next page after its last one.
+
+        :param stats: Optional dictionary updated with "nodes", "edges", "failed" and "retried" counts.
+        """
+        for _, pages in self._iter_nodes(stats if stats is not None else {}):
+            yield from pages
+
+    def run(self, seeds: t.Iterable[str] = (), destination: str = None) -> dict:
+        """
+        Queue the seeds, then crawl until the frontier is exhausted or a cap is reached.
+
+        An account counts as crawled once the writer has returned from its
+        `write_pages` call, so a failed write leaves it to the next run.
+
+        :param seeds: Handles or DIDs to start from (may be empty when continuing a crawl).
+        :param destination: Destination passed to the writer, or a template
+                            formatted with each account's DID (e.g. "follows_{}.json").
+        :return: {"nodes", "edges", "failed", "retried"} counts of this run and the frontier's stats.
+        """
+        self.add_seeds(seeds)
+        stats = {}
+        for did, pages in self._iter_nodes(stats):
+            if self.writer:
+                node_destination = destination.format(did) if destination and "{}" in destination else destination
+                self.writer.write_pages(pages, destination=node_destination, items_key=self.direction)
+        return {**stats, "frontier": self.frontier.stats()}
@@ -0,0 +1 @@
+from bskydata.graph.adjacency import AdjacencyIndex, iter_edges
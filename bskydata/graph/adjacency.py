@@ -0,0 +1,270 @@
+import itertools
+import typing as t
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from bskydata.storage.records import find_items_key, record_field
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+
+DIRECTIONS = ("follows", "followers")
+_FILES = ("dids", "follows_indptr", "follows_indices", "followers_indptr", "followers_indices")
+
+
+def iter_edges(pages: t.Iterable[dict], items_key: str = None) -> t.Iterator[t.Tuple[str, str]]:
+    """
+    Extract (follower, followed) DID pairs from follows or followers crawls.
+
+    Besides pages, the exploded records of NDJSON output (with the crawled
+    actor under "context") are accepted when `items_key` is given.
+
+    :param pages: Crawl pages or results of FollowsScraper / FollowersScraper,
+                  raw or parsed, e.g. GraphCrawler pages, or exploded records.
+    :param items_key: "follows" or "followers"; detected per page when omitted.
+    :return: Iterator of (follower, followed) pairs.
+    """
+    for page in pages:
+        if items_key and isinstance(page.get("context"), dict):
+            key, actor, items = items_key, page["context"].get("actor"), [page]
+        else:
+            key = items_key or find_items_key(page)
+            actor, items = page.get("actor"), page.get(key) or []
+        if key not in DIRECTIONS or not actor:
+            continue
+        for item in items:
+            did = record_field(item, "did")
+            if did:
+                yield (did, actor) if key == "followers" else (actor, did)
+
+
+def _csr(edge_keys: "np.ndarray", size: int) -> t.Tuple["np.ndarray", "np.ndarray"]:
+    """Compressed sparse rows of edges encoded as `row * size + column`, with each row's columns sorted."""
+    rows, columns = np.divmod(np.sort(edge_keys), size)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, columns.astype(np.int32 if size < 2 ** 31 else np.int64)
+
+
+class AdjacencyIndex:
+    """
+    Read-only, in-process index of a follow graph in compressed sparse row form.
+
+    Accounts are numbered by the sorted order of their DIDs, which are kept in
+    a fixed-width byte array, so a DID is turned into an id by binary search.
+    Both directions are kept as CSR arrays: the follows of account `i` are
+    `follows_indices[follows_indptr[i]:follows_indptr[i + 1]]`, sorted by id,
+    and likewise for its followers. Neighbour, degree and intersection queries
+    are therefore array slices and sorted-array intersections.
+
+    `save` writes the arrays as .npy files into a directory. `load`
+    memory-maps them by default, so an index larger than memory can be
+    queried, and several processes share the same pages.
+    """
+    def __init__(self,
+                 dids: "np.ndarray",
+                 follows_indptr: "np.ndarray",
+                 follows_indices: "np.ndarray",
+                 followers_indptr: "np.ndarray",
+                 followers_indices: "np.ndarray"):
+        """
+        Use `from_edges`, `from_pages` or `load` rather than calling this directly.
+
+        :param dids: Sorted byte-string array of DIDs; position is the account id.
+        :param follows_indptr: Row offsets of the follows CSR arrays.
+        :param follows_indices: Ids of the followed accounts, row by row.
+        :param followers_indptr: Row offsets of the followers CSR arrays.
+        :param followers_indices: Ids of the following accounts, row by row.
+        """
+        if np is None:
+            raise ImportError("AdjacencyIndex requires numpy: pip install bskydata[graph]")
+        self.dids = dids
+        self._indptr = {"follows": follows_indptr, "followers": followers_indptr}
+        self._indices = {"follows": follows_indices, "followers": followers_indices}
+
+    @classmethod
+    def from_edges(cls, edges: t.Iterable[t.Tuple[str, str]]) -> "AdjacencyIndex":
+        """
+        Build an index from (follower, followed) DID pairs; duplicate edges count once.
+
+        :param edges: Iterable of (follower, followed) pairs.
+        :return: The index.
+        """
+        if np is None:
+            raise ImportError("AdjacencyIndex requires numpy: pip install bskydata[graph]")
+        ids, sources, targets = defaultdict(itertools.count().__next__), array("q"), array("q")
+        for follower, followed in edges:
+            sources.append(ids[follower])
+            targets.append(ids[followed])
+        size = max(len(ids), 1)
+        dids = np.array([did.encode("ascii") for did in ids], dtype=bytes)
+        del ids
+        # Renumber the accounts by sorted DID so lookups can binary search.
+        order = np.argsort(dids, kind="stable")
+        rank = np.empty(len(dids), dtype=np.int64)
+        rank[order] = np.arange(len(dids), dtype=np.int64)
+        sources = rank[np.frombuffer(sources, dtype=np.int64)]
+        targets = rank[np.frombuffer(targets, dtype=np.int64)]
+        edge_keys = np.sort(sources * size + targets)
+        if len(edge_keys):
+            edge_keys = edge_keys[np.concatenate(([True], edge_keys[1:] != edge_keys[:-1]))]
+        sources, targets = np.divmod(edge_keys, size)
+        return cls(dids[order], *_csr(edge_keys, len(dids)), *_csr(targets * size + sources, len(dids)))
+
+    @classmethod
+    def from_pages(cls, pages: t.Iterable[dict], items_key: str = None) -> "AdjacencyIndex":
+        """
+        Build an index from follows or followers crawls (see `iter_edges`).
+
+        :param pages: Crawl pages or results, raw or parsed.
+        :param items_key: "follows" or "followers"; detected per page when omitted.
+        :return: The index.
+        """
+        return cls.from_edges(iter_edges(pages, items_key=items_key))
+
+    def save(self, directory: str):
+        """
+        Write the index as .npy files into a directory (created if missing).
+
+        :param directory: Directory to write to.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = dict(zip(_FILES, (self.dids, self._indptr["follows"], self._indices["follows"],
+                                   self._indptr["followers"], self._indices["followers"])))
+        for name, values in arrays.items():
+            np.save(directory / f"{name}.npy", values)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "AdjacencyIndex":
+        """
+        Open an index written by `save`.
+
+        :param directory: Directory the index was saved to.
+        :param mmap: Memory-map the arrays instead of reading them into memory.
+        :return: The index.
+        """
+        if np is None:
+            raise ImportError("AdjacencyIndex requires numpy: pip install bskydata[graph]")
+        directory = Path(directory)
+        return cls(*(np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None) for name in _FILES))
+
+    def __len__(self) -> int:
+        return len(self.dids)
+
+    def __contains__(self, did: str) -> bool:
+        return self._find(did) is not None
+
+    @property
+    def num_edges(self) -> int:
+        """Number of distinct follow edges."""
+        return len(self._indices["follows"])
+
+    def _find(self, did: str) -> t.Union[int, None]:
+        key = did.encode("ascii")
+        position = int(np.searchsorted(self.dids, key))
+        if position < len(self.dids) and self.dids[position] == key:
+            return position
+        return None
+
+    def id(self, did: str) -> int:
+        """
+        :param did: DID of an account in the index.
+        :return: The account's integer id.
+        """
+        position = self._find(did)
+        if position is None:
+            raise KeyError(did)
+        return position
+
+    def did(self, node_id: int) -> str:
+        """
+        :param node_id: Integer id of an account.
+        :return: The account's DID.
+        """
+        return self.dids[node_id].decode("ascii")
+
+    @staticmethod
+    def _check_direction(direction: str):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}.")
+
+    def csr(self, direction: str = "follows") -> t.Tuple["np.ndarray", "np.ndarray"]:
+        """
+        :param direction: "follows" for the adjacency matrix, "followers" for its transpose.
+        :return: The (indptr, indices) CSR arrays of that direction.
+        """
+        self._check_direction(direction)
+        return self._indptr[direction], self._indices[direction]
+
+    def neighbor_ids(self, node_id: int, direction: str = "follows") -> "np.ndarray":
+        """
+        :param node_id: Integer id of an account.
+        :param direction: "follows" for accounts it follows, "followers" for accounts following it.
+        :return: Sorted ids of the neighbours (a read-only view into the index).
+        """
+        self._check_direction(direction)
+        indptr = self._indptr[direction]
+        return self._indices[direction][indptr[node_id]:indptr[node_id + 1]]
+
+    def neighbors(self, did: str, direction: str = "follows") -> t.List[str]:
+        """
+        :param did: DID of an account in the index.
+        :param direction: "follows" or "followers".
+        :return: DIDs of the neighbours.
+        """
+        return [self.did(i) for i in self.neighbor_ids(self.id(did), direction)]
+
+    def degree(self, did: str, direction: str = "follows") -> int:
+        """
+        :param did: DID of an account in the index.
+        :param direction: "follows" for out-degree, "followers" for in-degree.
+        :return: Number of neighbours in that direction.
+        """
+        self._check_direction(direction)
+        indptr, node_id = self._indptr[direction], self.id(did)
+        return int(indptr[node_id + 1] - indptr[node_id])
+
+    def degrees(self, direction: str = "follows") -> "np.ndarray":
+        """
+        :param direction: "follows" for out-degrees, "followers" for in-degrees.
+        :return: Degree of every account, indexed by id.
+        """
+        self._check_direction(direction)
+        return np.diff(self._indptr[direction])
+
+    def has_edge(self, follower: str, followed: str) -> bool:
+        """
+        :return: Whether `follower` follows `followed`.
+        """
+        if follower not in self or followed not in self:
+            return False
+        row, target = self.neighbor_ids(self.id(follower)), self.id(followed)
+        position = int(np.searchsorted(row, target))
+        return position < len(row) and row[position] == target
+
+    def intersection(self, a: str, b: str, direction: str = "follows") -> t.List[str]:
+        """
+        Neighbours two accounts have in common, e.g. accounts both follow.
+
+        :param a: DID of the first account.
+        :param b: DID of the second account.
+        :param direction: "follows" or "followers".
+        :return: DIDs of the common neighbours.
+        """
+        common = np.intersect1d(self.neighbor_ids(self.id(a), direction),
+                                self.neighbor_ids(self.id(b), direction), assume_unique=True)
+        return [self.did(i) for i in common]
+
+    def mutuals(self, did: str) -> t.List[str]:
+        """
+        :param did: DID of an account in the index.
+        :return: DIDs of the accounts that follow it and that it follows back.
+        """
+        node_id = self.id(did)
+        common = np.intersect1d(self.neighbor_ids(node_id, "follows"),
+                                self.neighbor_ids(node_id, "followers"), assume_unique=True)
+        return [self.did(i) for i in common]
@@ -1,2 +1,25 @@
-from bskydata.parsers.profiles.basic import BasicFollowersParser, BasicFollowsParser, BasicProfilesParser
-from bskydata.parsers.search_terms.basic import BasicSearchTermsParser
+from bskydata.registry import Registry, PARSERS_GROUP
+
+# Parsers are imported on first access (PEP 562). Third-party parsers
+# registered under the "bskydata.parsers" entry point group can be imported
+# from here as well.
+registry = Registry(PARSERS_GROUP, {
+    "BasicFollowersParser": ("bskydata.parsers.profiles.basic:BasicFollowersParser", None),
+    "BasicFollowsParser": ("bskydata.parsers.profiles.basic:BasicFollowsParser", None),
+    "BasicProfilesParser": ("bskydata.parsers.profiles.basic:BasicProfilesParser", None),
+    "BasicSearchTermsParser": ("bskydata.parsers.search_terms.basic:BasicSearchTermsParser", None),
+})
+
+__all__ = list(registry.builtins)
+
+
+def __getattr__(name: str):
+    if name.startswith("__") or name not in registry:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = registry.get(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(registry.names()))
@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Type
 
 
 class DataParser(ABC):
     """
     Abstract base class for all parsers.
     Defines the interface for parsing data dictionaries.
+
+    Parsers that set `accepts_models` also accept the records of `data` as
+    atproto response models instead of dictionaries. Scrapers then hand them
+    the models directly and skip the costly `model_dump()` of every record.
+
+    Parsers created with `compact=True` emit their records as the slotted
+    dataclasses of `bskydata.parsers.records` instead of dictionaries, which
+    keeps large crawls much smaller in memory. The writers accept both.
     """
+    accepts_models: bool = False
+
+    def __init__(self, compact: bool = False):
+        """
+        Args:
+            compact (bool): Emit compact record objects instead of dictionaries.
+        """
+        self.compact = compact
 
     @abstractmethod
     def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -21,3 +37,17 @@ class DataParser(ABC):
         """
         pass
 
+    def _as_records(self, records: List[Dict[str, Any]], record_type: Type) -> List[Any]:
+        """
+        Convert parsed record dictionaries to `record_type` in compact mode.
+
+        Args:
+            records (List[Dict[str, Any]]): Parsed record dictionaries.
+            record_type (Type): Compact record class to build.
+
+        Returns:
+            List[Any]: The records, compact if the parser is.
+        """
+        if not self.compact:
+            return records
+        return [record_type(**record) for record in records]
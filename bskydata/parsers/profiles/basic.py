@@ -1,8 +1,23 @@
 from typing import Dict, Any, List
 from bskydata.parsers.base import DataParser
+from bskydata.parsers.records import ActorRecord, ProfileRecord
+
+
+def _project_profile_view(profile: Any) -> Dict[str, Any]:
+    """Read the basic fields straight from a ProfileView model."""
+    return {
+        "did": profile.did,
+        "display_name": profile.display_name,
+        "handle": profile.handle,
+        "description": profile.description,
+        "avatar_url": profile.avatar,
+        "created_at": profile.created_at,
+    }
 
 
 class BasicFollowersParser(DataParser):
+    accepts_models = True
+
     def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
         actor = data.get("actor", "")
         created_at = data.get("created_at", "")
@@ -15,12 +30,14 @@ class BasicFollowersParser(DataParser):
                 "avatar_url": follower.get("avatar"),
                 "created_at": follower.get("created_at"),
             }
+            if isinstance(follower, dict) else _project_profile_view(follower)
             for follower in data.get("followers", [])
         ]
         return {
             "actor": actor,
+            "actor_did": data.get("actor_did"),
             "created_at": created_at,
-            "followers": followers
+            "followers": self._as_records(followers, ActorRecord)
         }
 
 
@@ -29,6 +46,7 @@ class BasicFollowsParser(DataParser):
     Concrete parser class for 'follows' data.
     Parses a dictionary containing follows data into a structured format.
     """
+    accepts_models = True
 
     def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,8 +64,9 @@ class BasicFollowsParser(DataParser):
         
         return {
             "actor": actor,
+            "actor_did": data.get("actor_did"),
             "follows_created_at": created_at,
-            "follows": follows
+            "follows": self._as_records(follows, ActorRecord)
         }
 
     def _extract_follows(self, follows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -69,6 +88,7 @@ class BasicFollowsParser(DataParser):
                 "avatar_url": follow.get("avatar", ""),
                 "created_at": follow.get("created_at", "")
             }
+            if isinstance(follow, dict) else _project_profile_view(follow)
             for follow in follows
         ]
 
@@ -78,6 +98,7 @@ class BasicProfilesParser(DataParser):
     Concrete parser class for 'profiles' data.
     Parses a dictionary containing profile data into a structured format.
     """
+    accepts_models = True
 
     def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -96,7 +117,7 @@ class BasicProfilesParser(DataParser):
         return {
             "actors": actors,
             "profiles_created_at": profiles_created_at,
-            "profiles": profiles
+            "profiles": self._as_records(profiles, ProfileRecord)
         }
 
     def _extract_profiles(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -122,7 +143,34 @@ class BasicProfilesParser(DataParser):
                 "banner_url": profile.get("banner", ""),
                 "created_at": profile.get("created_at", ""),
                 "labels": profile.get("labels", []),
-                "pinned_post_uri": profile.get("pinned_post", {}).get("uri", "")
+                "pinned_post_uri": (profile.get("pinned_post") or {}).get("uri", "")
             }
+            if isinstance(profile, dict) else self._project_profile(profile)
             for profile in profiles
         ]
+
+    @staticmethod
+    def _project_profile(profile: Any) -> Dict[str, Any]:
+        """
+        Read the profile fields straight from a ProfileViewDetailed model.
+
+        Args:
+            profile (Any): The atproto profile model.
+
+        Returns:
+            Dict[str, Any]: Structured profile details.
+        """
+        return {
+            "did": profile.did,
+            "display_name": profile.display_name,
+            "handle": profile.handle,
+            "followers_count": profile.followers_count,
+            "follows_count": profile.follows_count,
+            "posts_count": profile.posts_count,
+            "description": profile.description,
+            "avatar_url": profile.avatar,
+            "banner_url": profile.banner,
+            "created_at": profile.created_at,
+            "labels": [label.model_dump() for label in profile.labels] if profile.labels is not None else None,
+            "pinned_post_uri": profile.pinned_post.uri if profile.pinned_post else ""
+        }
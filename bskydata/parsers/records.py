@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# Compact record types emitted by the basic parsers when created with
+# compact=True. Slotted dataclasses store their fields without a per-record
+# dictionary, which adds up over crawls of millions of followers or posts.
+# Writers convert them back to dictionaries with
+# `bskydata.storage.records.as_dict`.
+
+
+@dataclass(slots=True)
+class ActorRecord:
+    """A follower or followed account, as produced by the followers / follows parsers."""
+    did: Optional[str] = None
+    display_name: Optional[str] = None
+    handle: Optional[str] = None
+    description: Optional[str] = None
+    avatar_url: Optional[str] = None
+    created_at: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ProfileRecord:
+    """A hydrated profile, as produced by the profiles parser."""
+    did: Optional[str] = None
+    display_name: Optional[str] = None
+    handle: Optional[str] = None
+    followers_count: Optional[int] = None
+    follows_count: Optional[int] = None
+    posts_count: Optional[int] = None
+    description: Optional[str] = None
+    avatar_url: Optional[str] = None
+    banner_url: Optional[str] = None
+    created_at: Optional[str] = None
+    labels: Optional[List[Dict[str, Any]]] = None
+    pinned_post_uri: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PostRecord:
+    """A post, as produced by the search terms parser."""
+    post_uri: Optional[str] = None
+    post_cid: Optional[str] = None
+    author_display_name: Optional[str] = None
+    author_did: Optional[str] = None
+    author_handle: Optional[str] = None
+    post_text: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    post_created_at: Optional[str] = None
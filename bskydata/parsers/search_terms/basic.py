@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from bskydata.parsers.base import DataParser
+from bskydata.parsers.records import PostRecord
 
 
 class BasicSearchTermsParser(DataParser):
@@ -7,6 +8,7 @@ class BasicSearchTermsParser(DataParser):
     Concrete parser class for 'search terms' data.
     Parses a dictionary containing search term data into a structured format.
     """
+    accepts_models = True
 
     def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -25,7 +27,7 @@ class BasicSearchTermsParser(DataParser):
         return {
             "search_term": search_term,
             "created_at": created_at,
-            "posts": posts
+            "posts": self._as_records(posts, PostRecord)
         }
 
     def _extract_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -40,6 +42,8 @@ class BasicSearchTermsParser(DataParser):
         """
         return [
             {
+                "post_uri": post.get("uri", ""),
+                "post_cid": post.get("cid", ""),
                 "author_display_name": post.get("author", {}).get("display_name", ""),
                 "author_did": post.get("author", {}).get("did", ""),
                 "author_handle": post.get("author", {}).get("handle", ""),
@@ -47,9 +51,53 @@ class BasicSearchTermsParser(DataParser):
                 "tags": self._extract_tags(post.get("record", {}).get("facets", [])),
                 "post_created_at": post.get("record", {}).get("created_at", "")
             }
+            if isinstance(post, dict) else self._project_post(post)
             for post in posts
         ]
 
+    def _project_post(self, post: Any) -> Dict[str, Any]:
+        """
+        Read the post fields straight from a PostView model.
+
+        Args:
+            post (Any): The atproto post model.
+
+        Returns:
+            Dict[str, Any]: Structured post details.
+        """
+        author = post.author
+        record = post.record
+        return {
+            "post_uri": post.uri,
+            "post_cid": post.cid,
+            "author_display_name": author.display_name,
+            "author_did": author.did,
+            "author_handle": author.handle,
+            "post_text": getattr(record, "text", ""),
+            "tags": self._extract_model_tags(getattr(record, "facets", None)),
+            "post_created_at": getattr(record, "created_at", "")
+        }
+
+    @staticmethod
+    def _extract_model_tags(facets: Any) -> List[str]:
+        """
+        Extract tags from facet models, mirroring `_extract_tags`.
+
+        Args:
+            facets (Any): List of facet models, or None.
+
+        Returns:
+            List[str]: List of extracted tags.
+        """
+        tags = []
+        for facet in facets or []:
+            features = getattr(facet, "features", None)
+            if features:
+                tag = getattr(features[0], "tag", None)
+                if tag is not None:
+                    tags.append(tag)
+        return tags
+
     def _extract_tags(self, facets: List[Dict[str, Any]]) -> List[str]:
         """
         Extract tags from post facets.
@@ -0,0 +1,87 @@
+import importlib
+import typing as t
+
+
+WRITERS_GROUP = "bskydata.writers"
+PARSERS_GROUP = "bskydata.parsers"
+
+
+class Registry:
+    """
+    Name -> class registry whose entries are only imported on first access.
+
+    Built-in entries are "module:attribute" paths together with the package
+    extra that installs their dependencies, so importing a package exposing a
+    registry never imports boto3, pymongo and the like. Third-party packages
+    add entries through the entry point `group`, e.g. in their pyproject.toml:
+
+        [project.entry-points."bskydata.writers"]
+        DeltaLakeDataWriter = "bskydata_delta.writer:DeltaLakeDataWriter"
+    """
+    def __init__(self, group: str, builtins: t.Dict[str, t.Tuple[str, t.Union[str, None]]]):
+        """
+        :param group: Entry point group third-party entries are discovered in.
+        :param builtins: Name -> ("module:attribute", extra or None) of the built-in entries.
+        """
+        self.group = group
+        self.builtins = dict(builtins)
+        self._paths = dict(builtins)
+        self._loaded = {}
+        self._entry_points = None
+
+    def _discovered(self) -> dict:
+        # Scanning the installed distributions is slow-ish, so it is done
+        # once and only when a name is not a built-in entry.
+        if self._entry_points is None:
+            from importlib.metadata import entry_points
+
+            self._entry_points = {entry_point.name: entry_point for entry_point in entry_points(group=self.group)}
+        return self._entry_points
+
+    def register(self, name: str, target: t.Union[str, type]):
+        """
+        Add or replace an entry.
+
+        :param name: Name the entry is looked up by.
+        :param target: The class itself, or its "module:attribute" path to import lazily.
+        """
+        self._loaded.pop(name, None)
+        if isinstance(target, str):
+            self._paths[name] = (target, None)
+        else:
+            self._loaded[name] = target
+
+    def names(self) -> t.List[str]:
+        """
+        :return: Names of all built-in, registered and discovered entries.
+        """
+        return sorted(set(self._paths) | set(self._loaded) | set(self._discovered()))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaded or name in self._paths or name in self._discovered()
+
+    def get(self, name: str) -> t.Any:
+        """
+        Import (once) and return the entry registered under `name`.
+
+        :param name: Entry name, e.g. "S3JsonDataWriter".
+        :return: The registered class.
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+        if name in self._paths:
+            path, extra = self._paths[name]
+            module_name, _, attribute = path.partition(":")
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError as e:
+                if extra is None or (e.name or "").startswith("bskydata"):
+                    raise
+                raise ImportError(f"{name} requires optional dependencies: pip install bskydata[{extra}]") from e
+            value = getattr(module, attribute)
+        elif name in self._discovered():
+            value = self._discovered()[name].load()
+        else:
+            raise KeyError(f"Nothing registered under '{name}' in {self.group}.")
+        self._loaded[name] = value
+        return value
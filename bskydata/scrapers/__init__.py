@@ -1,4 +1,5 @@
-from bskydata.scrapers.followers import FollowersScraper
-from bskydata.scrapers.follows import FollowsScraper
+from bskydata.scrapers.followers import FollowersScraper, AsyncFollowersScraper
+from bskydata.scrapers.follows import FollowsScraper, AsyncFollowsScraper
 from bskydata.scrapers.profiles import ProfilesScraper
-from bskydata.scrapers.search_terms import SearchTermScraper
+from bskydata.scrapers.search_terms import SearchTermScraper, AsyncSearchTermScraper
+from bskydata.scrapers.jetstream import JetstreamScraper
@@ -0,0 +1,444 @@
+import asyncio
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from bskydata.api.client import BskyApiClient, AsyncBskyApiClient
+from bskydata.storage.dedup import DedupIndex, record_key
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+from bskydata.parsers.base import DataParser
+
+
+class _CursorScraperBase(ABC):
+    """
+    Configuration and checkpoint bookkeeping shared by the sync and async
+    paginated scrapers.
+
+    When a `state_store` is given, the cursor of a crawl is saved after every
+    page has been consumed, so a crawl started with `resume=True` continues
+    from the last completed page instead of the beginning. The checkpoint is
+    removed once the crawl is finished: by `fetch` and `stream` after the
+    writer has returned, so a failed write can still be resumed. Subclasses
+    can end a chain early by setting "caught_up" in the crawl state while
+    building a page.
+
+    With a `dedup_index`, posts and follow edges stored by earlier crawls are
+    dropped from every page. `iter_pages` adds a page's records to the index
+    once the page has been consumed. `fetch` and `stream` add them only after
+    the writer has returned, so a failed write never marks records as stored.
+    """
+    key_name: str = None
+    items_key: str = None
+    page_size: int = 100
+
+    def __init__(self,
+                 bsky_client: t.Any,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 dedup_index: DedupIndex = None):
+        """
+        :param bsky_client: Instance of BskyApiClient (AsyncBskyApiClient for async scrapers),
+                            or a BskyClientPool of them.
+        :param writer: Writer instance for outputting fetched data.
+        :param parser: Parser instance applied before writing.
+        :param state_store: Optional store used to checkpoint crawls.
+        :param dedup_index: Optional index of records seen by earlier crawls, which are skipped.
+        """
+        self.bsky_client = bsky_client
+        self.writer = writer
+        self.parser = parser
+        self.state_store = state_store
+        self.dedup_index = dedup_index
+
+    def _should_stop(self, cursor: t.Union[str, None], fetched: int, limit: int) -> bool:
+        """Decide whether the cursor chain is finished after a page."""
+        return not cursor or fetched > limit
+
+    def _checkpoint_name(self, key: str) -> str:
+        return f"{self.items_key}-{key}"
+
+    def _start_checkpoint(self, key: str, resume: bool) -> dict:
+        """Return the crawl state to start from, clearing stale state on a fresh start."""
+        state = None
+        if self.state_store is not None:
+            if resume:
+                state = self.state_store.load(self._checkpoint_name(key))
+            else:
+                self.state_store.clear(self._checkpoint_name(key))
+        return state or {
+            "cursor": None,
+            "fetched": 0,
+            "pages": 0,
+            "records": 0,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        }
+
+    def _advance_checkpoint(self, key: str, state: dict, cursor: t.Union[str, None], records: int, done: bool):
+        """Record that a page was consumed; a finished chain is kept until `_finish_crawl`."""
+        state.update(cursor=cursor, pages=state["pages"] + 1, records=state["records"] + records, done=done)
+        if self.state_store is not None:
+            self.state_store.save(self._checkpoint_name(key), state)
+
+    def _resumed_records(self, key: str, resume: bool) -> t.List[dict]:
+        """Records of a checkpointed `fetch` that were already crawled."""
+        if self.state_store is None or not resume:
+            return []
+        name = self._checkpoint_name(key)
+        state = self.state_store.load(name)
+        # Records appended after the last saved state belong to a page that
+        # is fetched again; drop them so they are not appended twice.
+        self.state_store.truncate_records(name, state["records"] if state else 0)
+        return list(self.state_store.iter_records(name))
+
+    def _parses_models(self) -> bool:
+        """Whether pages can be handed to the parser as atproto models."""
+        return self.parser is not None and self.parser.accepts_models
+
+    def _build_page(self, key: str, state: dict, response: t.Any, models: bool = False) -> dict:
+        items = getattr(response, self.items_key)
+        page = {
+            self.key_name: key,
+            "created_at": state["created_at"],
+            self.items_key: list(items) if models else [item.model_dump() for item in items]
+        }
+        # getFollowers / getFollows return the crawled account as `subject`. Keep
+        # its DID, since the crawl may have been started from a handle.
+        subject = getattr(response, "subject", None)
+        if subject is not None:
+            state["actor_did"] = page["actor_did"] = subject.did
+        return page
+
+    def _dedup_page(self, page: dict, pending: set) -> dict:
+        """Drop records seen before or already taken by this crawl; their keys are added to `pending`."""
+        if self.dedup_index is not None:
+            page = self.dedup_index.filter_page(page, self.items_key, pending)
+        return page
+
+    def _pending_keys(self, key: str, state: dict, items: t.List[t.Any]) -> set:
+        """Dedup keys of records taken by an earlier run of this crawl (e.g. resumed records)."""
+        if self.dedup_index is None:
+            return set()
+        envelope = {self.key_name: key, "actor_did": state.get("actor_did")}
+        return {record_key(item, self.items_key, envelope) for item in items} - {None}
+
+    def _mark_stored(self, pending: set):
+        """Add the keys of records the writer has stored to the dedup index."""
+        if self.dedup_index is not None and pending:
+            self.dedup_index.add(pending)
+
+    def _finish_crawl(self, key: str, state: dict):
+        """Wrap up a finished crawl once its records are stored: drop its checkpoint."""
+        if self.state_store is not None:
+            self.state_store.clear(self._checkpoint_name(key))
+
+    def _checkpoint_records(self, key: str, items: t.List[t.Any]):
+        """Keep the records of a checkpointed `fetch` next to its checkpoint."""
+        if self.state_store is not None:
+            self.state_store.append_records(
+                self._checkpoint_name(key),
+                [item if isinstance(item, dict) else item.model_dump() for item in items]
+            )
+
+    def _build_result(self, key: str, state: dict, items: t.List[dict]) -> dict:
+        result = {
+            self.key_name: key,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+            self.items_key: items
+        }
+        if "actor_did" in state:
+            result["actor_did"] = state["actor_did"]
+        return result
+
+
+class PaginatedScraper(_CursorScraperBase):
+    """
+    Base class for scrapers that follow an API cursor chain.
+
+    Subclasses define which key the crawl is for (an actor, a search term),
+    which field of the response holds the items and how to request a page.
+    `iter_pages` and `iter_records` expose the crawl one page at a time so
+    that `stream` can hand pages to the parser and writer as they arrive;
+    `fetch` collects the whole crawl into a single result.
+    """
+    def __init__(self,
+                 bsky_client: BskyApiClient,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 dedup_index: DedupIndex = None):
+        super().__init__(bsky_client, writer=writer, parser=parser, state_store=state_store,
+                         dedup_index=dedup_index)
+
+    @abstractmethod
+    def _fetch_page(self, key: str, cursor: t.Union[str, None] = None):
+        """
+        Request a single page for the given key.
+
+        :param key: Actor or search term the crawl is for.
+        :param cursor: Cursor returned by the previous page, if any.
+        :return: The atproto response model for the page.
+        """
+        pass
+
+    def iter_pages(self, key: str, limit: int = 1000, resume: bool = False,
+                   models: bool = False) -> t.Iterator[dict]:
+        """
+        Lazily follow the cursor chain, yielding one raw page at a time.
+
+        Each page has the same shape as the `fetch` result, holding only
+        that page's items, so it can be handed to a parser directly. With a
+        state store, the checkpoint advances once the caller asks for the
+        next page.
+
+        :param key: Actor or search term to crawl.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        :param models: Yield the atproto record models instead of dictionaries.
+        """
+        yield from self._iter_pages(key, limit, self._start_checkpoint(key, resume), models)
+
+    def _iter_pages(self, key: str, limit: int, state: dict, models: bool,
+                    pending: set = None) -> t.Iterator[dict]:
+        """
+        `iter_pages` from the crawl state returned by `_start_checkpoint`.
+
+        With `pending`, the dedup keys of the crawl are left in it and the
+        finished crawl is not wrapped up: the caller adds the keys and calls
+        `_finish_crawl` once the records are stored.
+        """
+        deferred = pending is not None
+        pending = pending if deferred else set()
+        cursor = state["cursor"]
+        if state.get("done") or (state["pages"] and not cursor):
+            return
+        while True:
+            fetched = state["fetched"] = state["fetched"] + self.page_size
+            response = self._fetch_page(key, cursor)
+            cursor = response.cursor
+            page = self._dedup_page(self._build_page(key, state, response, models=models), pending)
+            yield page
+            if not deferred:
+                self._mark_stored(pending)
+                pending.clear()
+            done = state.get("caught_up", False) or self._should_stop(cursor, fetched, limit)
+            self._advance_checkpoint(key, state, cursor, len(page[self.items_key]), done)
+            if done:
+                if not deferred:
+                    self._finish_crawl(key, state)
+                break
+
+    def iter_records(self, key: str, limit: int = 1000, resume: bool = False) -> t.Iterator[dict]:
+        """
+        Lazily follow the cursor chain, yielding one raw item at a time.
+
+        :param key: Actor or search term to crawl.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        """
+        for page in self.iter_pages(key, limit=limit, resume=resume):
+            yield from page[self.items_key]
+
+    def fetch(self, key: str, destination: str = None, limit: int = 1000, resume: bool = False) -> dict:
+        """
+        Follow the cursor chain for one key, then parse and write the result.
+
+        With a state store, the pages crawled so far are kept next to the
+        checkpoint so that `resume=True` can rebuild them after a failure.
+
+        :param key: Actor or search term to crawl.
+        :param destination: Destination passed to the writer.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        :return: The (parsed) crawl result.
+        """
+        all_items = self._resumed_records(key, resume)
+        state = self._start_checkpoint(key, resume)
+        pending = self._pending_keys(key, state, all_items)
+        for page in self._iter_pages(key, limit, state, self._parses_models(), pending):
+            all_items.extend(page[self.items_key])
+            self._checkpoint_records(key, page[self.items_key])
+        result = self._build_result(key, state, all_items)
+        if self.parser:
+            result = self.parser.parse(result)
+        if self.writer:
+            self.writer.write(result, destination=destination)
+        self._mark_stored(pending)
+        self._finish_crawl(key, state)
+        return result
+
+    def stream(self, key: str, destination: str = None, limit: int = 1000, resume: bool = False) -> int:
+        """
+        Parse and write the crawl page by page without keeping it in memory.
+
+        A page counts as done once the writer has taken it, so resuming only
+        makes sense with a writer that appends (e.g. an NDJSON
+        LocalJsonFileWriter with append=True).
+
+        :param key: Actor or search term to crawl.
+        :param destination: Destination passed to the writer.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        :return: Number of records streamed.
+        """
+        counter = {"records": 0}
+        pending = set()
+        state = self._start_checkpoint(key, resume)
+
+        def _pages():
+            for page in self._iter_pages(key, limit, state, self._parses_models(), pending):
+                counter["records"] += len(page[self.items_key])
+                yield self.parser.parse(page) if self.parser else page
+
+        if self.writer:
+            self.writer.write_pages(_pages(), destination=destination, items_key=self.items_key)
+        else:
+            for _ in _pages():
+                pass
+        self._mark_stored(pending)
+        self._finish_crawl(key, state)
+        return counter["records"]
+
+
+class AsyncPaginatedScraper(_CursorScraperBase):
+    """
+    Base class for asyncio scrapers that follow an API cursor chain.
+
+    Subclasses define which key the crawl is for (an actor, a search term),
+    which field of the response holds the items and how to request a page.
+    Pages of a single chain are fetched sequentially, while `fetch_many`
+    runs many chains at once under a concurrency cap.
+    """
+    def __init__(self,
+                 bsky_client: AsyncBskyApiClient,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 dedup_index: DedupIndex = None):
+        super().__init__(bsky_client, writer=writer, parser=parser, state_store=state_store,
+                         dedup_index=dedup_index)
+
+    @abstractmethod
+    async def _fetch_page(self, key: str, cursor: t.Union[str, None] = None):
+        """
+        Request a single page for the given key.
+
+        :param key: Actor or search term the crawl is for.
+        :param cursor: Cursor returned by the previous page, if any.
+        :return: The atproto response model for the page.
+        """
+        pass
+
+    async def iter_pages(self, key: str, limit: int = 1000, resume: bool = False,
+                         models: bool = False) -> t.AsyncIterator[dict]:
+        """
+        Lazily follow the cursor chain, yielding one raw page at a time.
+
+        :param key: Actor or search term to crawl.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        :param models: Yield the atproto record models instead of dictionaries.
+        """
+        async for page in self._iter_pages(key, limit, self._start_checkpoint(key, resume), models):
+            yield page
+
+    async def _iter_pages(self, key: str, limit: int, state: dict, models: bool,
+                          pending: set = None) -> t.AsyncIterator[dict]:
+        """
+        `iter_pages` from the crawl state returned by `_start_checkpoint`.
+
+        With `pending`, the dedup keys of the crawl are left in it and the
+        finished crawl is not wrapped up: the caller adds the keys and calls
+        `_finish_crawl` once the records are stored.
+        """
+        deferred = pending is not None
+        pending = pending if deferred else set()
+        cursor = state["cursor"]
+        if state.get("done") or (state["pages"] and not cursor):
+            return
+        while True:
+            fetched = state["fetched"] = state["fetched"] + self.page_size
+            response = await self._fetch_page(key, cursor)
+            cursor = response.cursor
+            page = self._dedup_page(self._build_page(key, state, response, models=models), pending)
+            yield page
+            if not deferred:
+                self._mark_stored(pending)
+                pending.clear()
+            done = state.get("caught_up", False) or self._should_stop(cursor, fetched, limit)
+            self._advance_checkpoint(key, state, cursor, len(page[self.items_key]), done)
+            if done:
+                if not deferred:
+                    self._finish_crawl(key, state)
+                break
+
+    async def iter_records(self, key: str, limit: int = 1000, resume: bool = False) -> t.AsyncIterator[dict]:
+        """
+        Lazily follow the cursor chain, yielding one raw item at a time.
+
+        :param key: Actor or search term to crawl.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        """
+        async for page in self.iter_pages(key, limit=limit, resume=resume):
+            for item in page[self.items_key]:
+                yield item
+
+    async def fetch(self, key: str, destination: str = None, limit: int = 1000, resume: bool = False) -> dict:
+        """
+        Follow the cursor chain for one key, then parse and write the result.
+
+        :param key: Actor or search term to crawl.
+        :param destination: Destination passed to the writer.
+        :param limit: Approximate maximum number of items to fetch.
+        :param resume: Continue from the last checkpoint of this crawl, if any.
+        :return: The (parsed) crawl result.
+        """
+        all_items = self._resumed_records(key, resume)
+        state = self._start_checkpoint(key, resume)
+        pending = self._pending_keys(key, state, all_items)
+        async for page in self._iter_pages(key, limit, state, self._parses_models(), pending):
+            all_items.extend(page[self.items_key])
+            self._checkpoint_records(key, page[self.items_key])
+        result = self._build_result(key, state, all_items)
+        if self.parser:
+            result = self.parser.parse(result)
+        if self.writer:
+            # Writers are synchronous; keep them off the event loop.
+            await asyncio.to_thread(self.writer.write, result, destination=destination)
+        self._mark_stored(pending)
+        self._finish_crawl(key, state)
+        return result
+
+    async def fetch_many(self,
+                         keys: t.Iterable[str],
+                         destination: str = None,
+                         limit: int = 1000,
+                         concurrency: int = 10,
+                         return_exceptions: bool = False,
+                         resume: bool = False) -> t.List[dict]:
+        """
+        Crawl many keys concurrently.
+
+        :param keys: Actors or search terms to crawl.
+        :param destination: Destination template formatted with each key
+                            (e.g. "followers_{}.json").
+        :param limit: Approximate maximum number of items to fetch per key.
+        :param concurrency: Maximum number of cursor chains in flight.
+        :param return_exceptions: Return failures in place of results instead of raising.
+        :param resume: Continue each crawl from its last checkpoint, if any.
+        :return: One result per key, in the order of `keys`.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded_fetch(key: str) -> dict:
+            async with semaphore:
+                key_destination = destination.format(key) if destination else None
+                return await self.fetch(key, destination=key_destination, limit=limit, resume=resume)
+
+        return await asyncio.gather(
+            *(_bounded_fetch(key) for key in keys),
+            return_exceptions=return_exceptions
+        )
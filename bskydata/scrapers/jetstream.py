@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import json
+import time
+import typing as t
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+import websockets
+from atproto import models
+from bskydata.parsers.base import DataParser
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+
+
+DEFAULT_JETSTREAM_URL = "wss://jetstream2.us-east.bsky.network/subscribe"
+POST_COLLECTION = "app.bsky.feed.post"
+
+# Jetstream accepts at most this many DIDs in wantedDids; larger sets are only filtered locally.
+_MAX_WANTED_DIDS = 10_000
+_END = object()
+
+
+def _timestamp(time_us: int) -> str:
+    moment = datetime.fromtimestamp(time_us / 1_000_000, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class JetstreamScraper:
+    """
+    Real-time ingestion of new records through Jetstream, the JSON firehose.
+
+    Commit events are filtered by collection, operation, DID and keyword, and
+    handed on in pages of up to `batch_size` events. A page is also handed on
+    when `flush_interval` seconds pass without it filling up. Pages have the
+    same shape as the paginated scrapers' pages. With the default collection,
+    post creations become post views shaped like `search_posts` results
+    under "posts", so BasicSearchTermsParser and the writers handle them like
+    searched posts. Other collections are handed on as raw events under
+    "events".
+
+    Frames are read into a bounded queue. When the parser or writer falls
+    behind, the queue fills up and reading from the socket pauses, so memory
+    stays bounded. With a state store, the `time_us` cursor of the last event
+    handed on is saved once its page has been consumed. A restarted stream
+    continues from there, and dropped connections are re-established from the
+    last event received. Both rewind by `rewind` seconds, as Jetstream
+    recommends, so some events may be delivered twice. A DedupIndex writer
+    takes care of those.
+    """
+    def __init__(self,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 url: str = DEFAULT_JETSTREAM_URL,
+                 collections: t.Iterable[str] = (POST_COLLECTION,),
+                 dids: t.Iterable[str] = None,
+                 keywords: t.Iterable[str] = None,
+                 operations: t.Iterable[str] = ("create",),
+                 batch_size: int = 100,
+                 flush_interval: float = 5.0,
+                 queue_size: int = 10_000,
+                 reconnect: bool = True,
+                 rewind: float = 5.0,
+                 name: str = "jetstream"):
+        """
+        :param writer: Writer instance for outputting the pages.
+        :param parser: Parser instance applied before writing.
+        :param state_store: Optional store used to persist the stream cursor.
+        :param url: Jetstream subscribe endpoint.
+        :param collections: Collections to subscribe to (empty for all).
+        :param dids: Only keep events of these repositories.
+        :param keywords: Only keep records whose text contains one of these (case-insensitive).
+        :param operations: Commit operations to keep ("create", "update", "delete").
+        :param batch_size: Maximum number of events per page.
+        :param flush_interval: Seconds after which a partial page is handed on.
+        :param queue_size: Maximum number of events buffered between the socket and the writer.
+        :param reconnect: Reconnect when the connection drops instead of ending the stream. Without
+                          it, a dropped connection ends the stream like a closed one, while a failure
+                          to connect is raised from `iter_pages` once the pending events are handed on.
+        :param rewind: Seconds the cursor is moved back by when reconnecting or resuming.
+        :param name: Name the cursor is saved under in the state store.
+        """
+        self.writer = writer
+        self.parser = parser
+        self.state_store = state_store
+        self.url = url
+        self.collections = list(collections or [])
+        self.dids = set(dids) if dids else None
+        self.keywords = [keyword.lower() for keyword in keywords] if keywords else None
+        self.operations = set(operations)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.reconnect = reconnect
+        self.rewind = rewind
+        self.name = name
+        self.items_key = "posts" if self.collections == [POST_COLLECTION] else "events"
+        self._received_cursor = None
+
+    def _checkpoint_name(self) -> str:
+        return f"{self.name}-cursor"
+
+    def _subscribe_url(self, cursor: t.Union[int, None]) -> str:
+        params = [("wantedCollections", collection) for collection in self.collections]
+        if self.dids and len(self.dids) <= _MAX_WANTED_DIDS:
+            params += [("wantedDids", did) for did in sorted(self.dids)]
+        if cursor:
+            params.append(("cursor", max(int(cursor - self.rewind * 1_000_000), 0)))
+        return f"{self.url}?{urlencode(params)}" if params else self.url
+
+    def _matches(self, event: dict) -> bool:
+        commit = event.get("commit")
+        if event.get("kind") != "commit" or not commit:
+            return False
+        if commit.get("operation") not in self.operations:
+            return False
+        if self.collections and commit.get("collection") not in self.collections:
+            return False
+        if self.dids is not None and event.get("did") not in self.dids:
+            return False
+        if self.keywords is not None:
+            text = ((commit.get("record") or {}).get("text") or "").lower()
+            if not any(keyword in text for keyword in self.keywords):
+                return False
+        return True
+
+    def _to_item(self, event: dict) -> dict:
+        if self.items_key != "posts":
+            return event
+        commit = event["commit"]
+        record = commit.get("record")
+        if record is not None:
+            record_model = models.get_or_create(record, strict=False)
+            record = record_model.model_dump() if hasattr(record_model, "model_dump") else record
+        return {
+            "uri": f"at://{event['did']}/{commit['collection']}/{commit['rkey']}",
+            "cid": commit.get("cid"),
+            "author": {"did": event["did"], "handle": None, "display_name": None},
+            "record": record or {},
+            "indexed_at": _timestamp(event["time_us"]),
+        }
+
+    async def _receive(self, queue: asyncio.Queue, cursor: t.Union[int, None]):
+        """Read frames into `queue` until the stream ends, reconnecting if configured."""
+        self._received_cursor = cursor
+        backoff = 1.0
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self._subscribe_url(self._received_cursor), max_size=None) as ws:
+                        backoff = 1.0
+                        async for frame in ws:
+                            event = json.loads(frame)
+                            self._received_cursor = event.get("time_us", self._received_cursor)
+                            if self._matches(event):
+                                # Blocks while the queue is full, which stops reading the socket.
+                                await queue.put(event)
+                except websockets.ConnectionClosed:
+                    if not self.reconnect:
+                        break
+                except OSError:
+                    if not self.reconnect:
+                        raise
+                else:
+                    if not self.reconnect:
+                        break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            await queue.put(_END)
+            raise
+        await queue.put(_END)
+
+    async def iter_pages(self, max_events: int = None, resume: bool = True) -> t.AsyncIterator[dict]:
+        """
+        Subscribe to Jetstream and yield matching events one page at a time.
+
+        :param max_events: Stop after this many matching events (None to run until cancelled).
+        :param resume: Continue from the saved cursor, if any.
+        """
+        state = None
+        if self.state_store is not None and resume:
+            state = self.state_store.load(self._checkpoint_name())
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        receiver = asyncio.create_task(self._receive(queue, (state or {}).get("cursor")))
+        loop = asyncio.get_running_loop()
+        count = 0
+        batch = []
+        deadline = None
+        try:
+            while max_events is None or count < max_events:
+                timeout = max(deadline - loop.time(), 0.0) if batch else None
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    event = None
+                if event is not None and event is not _END:
+                    if not batch:
+                        deadline = loop.time() + self.flush_interval
+                    batch.append(event)
+                    count += 1
+                full = len(batch) >= self.batch_size or count == max_events
+                if batch and (event is None or event is _END or full):
+                    yield {
+                        "stream": self.name,
+                        "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                        self.items_key: [self._to_item(queued) for queued in batch],
+                    }
+                    if self.state_store is not None:
+                        self.state_store.save(self._checkpoint_name(), {"cursor": batch[-1]["time_us"]})
+                    batch = []
+                if event is _END:
+                    break
+        finally:
+            receiver.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await receiver
+
+    async def run(self, destination: str = None, max_events: int = None, resume: bool = True) -> int:
+        """
+        Parse and write the stream.
+
+        The pages are handed to the writer as one stream through
+        `write_pages`, so file and cloud writers keep every batch instead of
+        overwriting one with the next. A page counts as done, and its cursor
+        is saved, once the writer asks for the next one.
+
+        :param destination: Destination passed to the writer.
+        :param max_events: Stop after this many matching events (None to run until cancelled).
+        :param resume: Continue from the saved cursor, if any.
+        :return: Number of events handed to the writer.
+        """
+        count = 0
+        pages = self.iter_pages(max_events=max_events, resume=resume)
+        if not self.writer:
+            async for page in pages:
+                count += len(page[self.items_key])
+            return count
+        loop = asyncio.get_running_loop()
+        pending = {}
+
+        def _pages():
+            nonlocal count
+            while True:
+                pending["next"] = asyncio.run_coroutine_threadsafe(pages.__anext__(), loop)
+                try:
+                    page = pending["next"].result()
+                except StopAsyncIteration:
+                    return
+                count += len(page[self.items_key])
+                yield self.parser.parse(page) if self.parser else page
+
+        try:
+            # Writers are synchronous; they pull pages from the event loop in a thread.
+            await asyncio.to_thread(self.writer.write_pages, _pages(), destination=destination,
+                                    items_key=self.items_key)
+        finally:
+            future = pending.get("next")
+            if future is not None and not future.done():
+                # Cancelled while the writer waits for a page: stop the stream under it.
+                future.cancel()
+            else:
+                await pages.aclose()
+        return count
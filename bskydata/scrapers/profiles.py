@@ -1,20 +1,59 @@
+import itertools
 import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from bskydata.api.client import BskyApiClient
 from bskydata.storage.writers.base import DataWriter
 from bskydata.parsers.base import DataParser
 
 
 class ProfilesScraper:
-    def __init__(self, 
-                 bsky_client: BskyApiClient, 
-                 writer: DataWriter = None, 
-                 parser: DataParser = None):
+    # app.bsky.actor.getProfiles accepts at most 25 actors per request.
+    batch_size = 25
+
+    def __init__(self,
+                 bsky_client: BskyApiClient,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 max_workers: int = 4):
+        """
+        :param bsky_client: Instance of BskyApiClient or BskyClientPool.
+        :param writer: Writer instance for outputting fetched profiles.
+        :param parser: Parser instance applied before writing.
+        :param max_workers: Number of batches requested concurrently. Requests
+                            still go through the client's shared rate limiter.
+        """
         self.bsky_client = bsky_client
         self.writer = writer
         self.parser = parser
-    
-    def fetch(self, actors: list, destination: str) -> dict:
-        profiles = self.bsky_client.client.get_profiles(actors).model_dump()
+        self.max_workers = max_workers
+
+    def _fetch_batch(self, actors: t.List[str]) -> t.List[dict]:
+        response = self.bsky_client.client.get_profiles(actors)
+        if self.parser is not None and self.parser.accepts_models:
+            return list(response.profiles)
+        return [profile.model_dump() for profile in response.profiles]
+
+    def fetch(self, actors: list, destination: str = None) -> dict:
+        """
+        Fetch profiles for any number of actors.
+
+        The actors are split into batches of `batch_size`, the batches are
+        requested concurrently and the profiles are merged back in batch order.
+
+        :param actors: Handles or DIDs to hydrate.
+        :param destination: Destination passed to the writer.
+        :return: The (parsed) profiles.
+        """
+        actors = list(actors)
+        batches = [actors[i:i + self.batch_size] for i in range(0, len(actors), self.batch_size)]
+        if len(batches) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                results = list(executor.map(self._fetch_batch, batches))
+        else:
+            results = [self._fetch_batch(batch) for batch in batches]
+
+        profiles = {"profiles": list(itertools.chain.from_iterable(results))}
         profiles['actors'] = actors
         profiles["created_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
         if self.parser:
@@ -1,54 +1,183 @@
-import time
 import typing as t
-from bskydata.api.client import BskyApiClient
-from bskydata.storage.writers.base import DataWriter
-from bskydata.parsers.base import DataParser
+from datetime import datetime, timezone
 from atproto import models
+from bskydata.api.client import BskyApiClient, AsyncBskyApiClient
+from bskydata.parsers.base import DataParser
+from bskydata.scrapers.base import PaginatedScraper, AsyncPaginatedScraper
+from bskydata.storage.dedup import DedupIndex
+from bskydata.storage.records import record_field
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+
+
+def _parse_time(value: t.Any) -> t.Union[datetime, None]:
+    """Parse an ISO 8601 timestamp ("Z" or offset suffix, any precision) as an aware UTC datetime."""
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def _format_time(moment: datetime) -> str:
+    return moment.isoformat(timespec="microseconds").replace("+00:00", "Z")
 
 
-class SearchTermScraper:
-    def __init__(self, bsky_client: BskyApiClient, writer: DataWriter = None, parser: DataParser = None):
+def _sort_at(post: t.Any) -> t.Union[datetime, None]:
+    """The time searchPosts orders and filters by: the earlier of the record's createdAt and indexedAt."""
+    indexed_at = _parse_time(record_field(post, "indexed_at"))
+    record = record_field(post, "record")
+    created_at = None
+    if record is not None:
+        created_at = _parse_time(record_field(record, "created_at") or record_field(record, "createdAt"))
+    if indexed_at is None or created_at is None:
+        return indexed_at or created_at
+    return min(indexed_at, created_at)
+
+
+class _IncrementalSearchMixin:
+    """
+    Incremental crawling shared by the sync and async search scrapers.
+
+    In incremental mode, each search term has a watermark in the state store:
+    the latest `sortAt` delivered so far and the URIs of the posts sorted at
+    that instant. `sortAt` is the earlier of a post's createdAt and indexedAt,
+    the time searchPosts orders by (`sort=latest`) and filters by (`since`).
+    A crawl asks for the newest posts since the watermark. It drops posts it
+    has already seen and ends as soon as a page reaches them. The watermark
+    is loaded once per crawl and moved only after the writer has stored the
+    crawl, so posts of a failed write are fetched again by the next run. Posts
+    older than the last one fetched are never picked up later, so if a busy
+    term hits `limit` before it reaches seen posts, those in between are
+    skipped.
+    """
+    incremental: bool = False
+
+    def _watermark_name(self, search_term: str) -> str:
+        return f"watermark-{self.items_key}-{search_term}"
+
+    def load_watermark(self, search_term: str) -> t.Union[dict, None]:
         """
-        :param bsky_client: Instance of BskyApiClient.
-        :param writer: Writer instance for outputting fetched posts.
+        Load the watermark of an incrementally crawled search term.
+
+        :param search_term: The search term.
+        :return: {"sort_at": ..., "uris": [...]}, or None before the first crawl.
         """
-        self.bsky_client = bsky_client
-        self.writer = writer
-        self.parser = parser
+        if self.state_store is None:
+            return None
+        watermark = self.state_store.load(self._watermark_name(search_term))
+        if watermark and "sort_at" not in watermark:
+            # Watermarks saved by earlier versions tracked indexed_at.
+            watermark = {"sort_at": watermark.get("indexed_at"), "uris": watermark.get("uris", [])}
+        return watermark
+
+    def _start_checkpoint(self, key: str, resume: bool) -> dict:
+        state = super()._start_checkpoint(key, resume)
+        if self.incremental:
+            self._watermarks[key] = self.load_watermark(key)
+        return state
 
-    def _fetch(self, search_term: str, cursor: t.Union[int, None] = None) -> models.AppBskyFeedSearchPosts.Response:
-        params = {"q": search_term, 'limit': 100}
+    def _search_params(self, search_term: str, cursor: t.Union[str, None]) -> dict:
+        params = {"q": search_term, 'limit': self.page_size}
         if cursor:
             params['cursor'] = cursor
-        return self.bsky_client.client.app.bsky.feed.search_posts(params=params)
-
-    def fetch(
-        self, 
-        search_term: str, 
-        destination: str,
-        limit: int = 1000, 
-    ) -> dict:
-        all_posts = []
-        cursor = None
-        while True:
-            response = self._fetch(search_term, cursor)
-            cursor = response.cursor
-            posts = response.model_dump()['posts']
-            all_posts.extend(posts)
-            if not cursor:
-                break
-            if int(cursor) > limit:
-                break
-            time.sleep(1)
-        all_posts_final = {
-            "search_term": search_term,
-            "created_at":  time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
-            "posts": all_posts
-        }
-        if self.parser:
-            all_posts_final = self.parser.parse(all_posts_final)
-        # Write the fetched posts using the writer
-        if self.writer:
-            self.writer.write(all_posts_final, destination=destination)
-
-        return all_posts_final
+        if self.incremental:
+            params['sort'] = "latest"
+            watermark = self._watermarks.get(search_term)
+            if watermark:
+                params['since'] = watermark["sort_at"]
+        return params
+
+    def _build_page(self, key: str, state: dict, response: t.Any, models: bool = False) -> dict:
+        page = super()._build_page(key, state, response, models=models)
+        if not self.incremental:
+            return page
+        seen = self._watermarks.get(key)
+        seen_at = _parse_time(seen["sort_at"]) if seen else None
+        newest = state.get("watermark") or (dict(seen, uris=list(seen["uris"])) if seen else None)
+        newest_at = _parse_time(newest["sort_at"]) if newest else None
+        fresh = []
+        for post in page[self.items_key]:
+            sort_at, uri = _sort_at(post), record_field(post, "uri")
+            if sort_at is None:
+                fresh.append(post)
+                continue
+            if seen_at and (sort_at < seen_at or (sort_at == seen_at and uri in seen["uris"])):
+                state["caught_up"] = True
+                continue
+            fresh.append(post)
+            if newest_at is None or sort_at > newest_at:
+                newest, newest_at = {"sort_at": _format_time(sort_at), "uris": [uri]}, sort_at
+            elif sort_at == newest_at and uri not in newest["uris"]:
+                newest["uris"].append(uri)
+        state["watermark"] = newest
+        page[self.items_key] = fresh
+        return page
+
+    def _finish_crawl(self, key: str, state: dict):
+        # Move the watermark before the checkpoint goes, so a crash in between only repeats posts.
+        if self.incremental and state.get("watermark"):
+            self.state_store.save(self._watermark_name(key), state["watermark"])
+        super()._finish_crawl(key, state)
+
+
+class SearchTermScraper(_IncrementalSearchMixin, PaginatedScraper):
+    key_name = "search_term"
+    items_key = "posts"
+
+    def __init__(self,
+                 bsky_client: BskyApiClient,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 dedup_index: DedupIndex = None,
+                 incremental: bool = False):
+        """
+        :param bsky_client: Instance of BskyApiClient or BskyClientPool.
+        :param writer: Writer instance for outputting fetched data.
+        :param parser: Parser instance applied before writing.
+        :param state_store: Store for checkpoints and, in incremental mode, watermarks.
+        :param dedup_index: Optional index of posts seen by earlier crawls, which are skipped.
+        :param incremental: Only fetch posts newer than those seen by earlier crawls.
+        """
+        if incremental and state_store is None:
+            raise ValueError("Incremental search scraping needs a state_store to keep watermarks in.")
+        super().__init__(bsky_client, writer=writer, parser=parser, state_store=state_store,
+                         dedup_index=dedup_index)
+        self.incremental = incremental
+        self._watermarks = {}
+
+    def _fetch_page(self, search_term: str, cursor: t.Union[str, None] = None) -> models.AppBskyFeedSearchPosts.Response:
+        return self.bsky_client.client.app.bsky.feed.search_posts(params=self._search_params(search_term, cursor))
+
+
+class AsyncSearchTermScraper(_IncrementalSearchMixin, AsyncPaginatedScraper):
+    key_name = "search_term"
+    items_key = "posts"
+
+    def __init__(self,
+                 bsky_client: AsyncBskyApiClient,
+                 writer: DataWriter = None,
+                 parser: DataParser = None,
+                 state_store: LocalStateStore = None,
+                 dedup_index: DedupIndex = None,
+                 incremental: bool = False):
+        """
+        :param bsky_client: Instance of AsyncBskyApiClient or BskyClientPool.
+        :param writer: Writer instance for outputting fetched data.
+        :param parser: Parser instance applied before writing.
+        :param state_store: Store for checkpoints and, in incremental mode, watermarks.
+        :param dedup_index: Optional index of posts seen by earlier crawls, which are skipped.
+        :param incremental: Only fetch posts newer than those seen by earlier crawls.
+        """
+        if incremental and state_store is None:
+            raise ValueError("Incremental search scraping needs a state_store to keep watermarks in.")
+        super().__init__(bsky_client, writer=writer, parser=parser, state_store=state_store,
+                         dedup_index=dedup_index)
+        self.incremental = incremental
+        self._watermarks = {}
+
+    async def _fetch_page(self, search_term: str, cursor: t.Union[str, None] = None) -> models.AppBskyFeedSearchPosts.Response:
+        return await self.bsky_client.client.app.bsky.feed.search_posts(params=self._search_params(search_term, cursor))
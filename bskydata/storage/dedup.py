@@ -0,0 +1,181 @@
+import hashlib
+import itertools
+import sqlite3
+import threading
+import typing as t
+from pathlib import Path
+from bskydata.storage.records import record_field
+
+
+def record_key(item: t.Any, items_key: str, envelope: dict) -> t.Union[t.Tuple[str, str], None]:
+    """
+    Identify a scraped or parsed record across crawls.
+
+    Posts are identified by their URI. Followers and follows are both
+    identified as the (follower, followed) edge they describe, so the same
+    edge seen from either side counts once. Both ends are DIDs: the crawled
+    actor's is the page's "actor_did", or its "actor" when that is a DID.
+    Handles can move between accounts, so edges of a page without the
+    actor's DID are not deduplicated.
+
+    :param item: A record of a crawl page (dictionary, compact record or model).
+    :param items_key: Key of the page holding the records.
+    :param envelope: The page itself, holding the crawled actor.
+    :return: (kind, key), or None for records that are not deduplicated.
+    """
+    if items_key == "posts":
+        uri = record_field(item, "post_uri") or record_field(item, "uri")
+        return ("post", uri) if uri else None
+    if items_key in ("followers", "follows"):
+        actor, did = envelope.get("actor_did") or envelope.get("actor"), record_field(item, "did")
+        if not actor or not actor.startswith("did:") or not did:
+            return None
+        follower, followed = (did, actor) if items_key == "followers" else (actor, did)
+        return "edge", f"{follower} {followed}"
+    return None
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, value: str) -> t.Iterator[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class DedupIndex:
+    """
+    Persistent index of the posts and follow edges already stored.
+
+    Keys live in a SQLite database, so the index survives restarts and is
+    shared by every crawl pointed at the same file. With `bloom_bits`, an
+    in-memory Bloom filter sits in front of it. Records the filter has
+    never seen are known to be new without querying SQLite, which keeps
+    mostly-new crawls fast. The filter is rebuilt from the database when
+    the index is opened.
+
+    Safe to share between threads.
+    """
+    def __init__(self, path: str = ".bskydata_dedup.sqlite", bloom_bits: int = 0, bloom_hashes: int = 7):
+        """
+        :param path: SQLite database file (created if missing).
+        :param bloom_bits: Size of the Bloom filter in bits (0 disables it). About 10 bits
+                           per expected key keeps false positives near 1%.
+        :param bloom_hashes: Number of hash functions of the Bloom filter.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen (kind TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (kind, key)) "
+            "WITHOUT ROWID"
+        )
+        self._connection.commit()
+        self._bloom = None
+        if bloom_bits:
+            self._bloom = _BloomFilter(bloom_bits, bloom_hashes)
+            for kind, key in self._connection.execute("SELECT kind, key FROM seen"):
+                self._bloom.add(f"{kind}:{key}")
+
+    def __contains__(self, kind_key: t.Tuple[str, str]) -> bool:
+        kind, key = kind_key
+        return bool(self._known(kind, [key]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def _known(self, kind: str, keys: t.List[str]) -> t.Set[str]:
+        """The subset of `keys` already in the index."""
+        if self._bloom is not None:
+            keys = [key for key in keys if f"{kind}:{key}" in self._bloom]
+        known = set()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._connection.execute(
+                    f"SELECT key FROM seen WHERE kind = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [kind, *chunk]
+                )
+                known.update(key for key, in rows)
+        return known
+
+    def filter_new(self, kind: str, keys: t.Iterable[str]) -> t.List[str]:
+        """
+        Keep the keys that are not in the index yet, without adding them.
+
+        :param kind: Kind of key, e.g. "post" or "edge".
+        :param keys: Keys to check.
+        :return: The new keys, without duplicates, in their original order.
+        """
+        keys = list(dict.fromkeys(keys))
+        known = self._known(kind, keys)
+        return [key for key in keys if key not in known]
+
+    def add(self, keys: t.Iterable[t.Tuple[str, str]]):
+        """
+        Add (kind, key) pairs to the index.
+
+        :param keys: Pairs such as ("post", uri) or ("edge", "follower followed").
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            self._connection.executemany("INSERT OR IGNORE INTO seen (kind, key) VALUES (?, ?)", keys)
+            self._connection.commit()
+            if self._bloom is not None:
+                for kind, key in keys:
+                    self._bloom.add(f"{kind}:{key}")
+
+    def filter_page(self, page: dict, items_key: str, pending: t.Set[t.Tuple[str, str]]) -> dict:
+        """
+        Drop the records of a crawl page that were stored before.
+
+        Records are compared against the index and against `pending`, the keys
+        taken so far by the caller that are not in the index yet. The keys of
+        the records that are kept are added to `pending`; the caller adds them
+        to the index once the records are safely stored.
+
+        :param page: A crawl page or result (scraped or parsed).
+        :param items_key: Key of the page holding the records.
+        :param pending: Keys taken but not yet added to the index; updated in place.
+        :return: A copy of the page holding only new records.
+        """
+        items = page.get(items_key) or []
+        keys = [record_key(item, items_key, page) for item in items]
+        by_kind = {}
+        for key in keys:
+            if key is not None and key not in pending:
+                by_kind.setdefault(key[0], []).append(key[1])
+        new = set(itertools.chain.from_iterable(
+            ((kind, key) for key in self.filter_new(kind, kind_keys)) for kind, kind_keys in by_kind.items()
+        ))
+        kept = []
+        for item, key in zip(items, keys):
+            if key is None:
+                kept.append(item)
+            elif key in new and key not in pending:
+                pending.add(key)
+                kept.append(item)
+        return {**page, items_key: kept}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -1,5 +1,16 @@
+import itertools
 import json
 import typing as t
+import warnings
+from bskydata.storage.records import as_dict
+
+
+def _default(value: t.Any) -> t.Any:
+    """Encode compact parser records as JSON objects."""
+    record = as_dict(value)
+    if record is value:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return record
 
 
 class JsonFileHandler:
@@ -24,24 +35,143 @@ class JsonFileHandler:
                 f,
                 indent=self.indent,
                 sort_keys=self.sort_keys,
-                separators=(',', ': ')  # Add spaces after commas and colons
+                separators=(',', ': '),  # Add spaces after commas and colons
+                default=_default
             )
 
+    def iter_encode(self, data: t.Any) -> t.Iterator[str]:
+        """
+        Encode JSON data chunk by chunk, formatted like `write_to_file`.
+
+        :param data: The data to encode.
+        :return: Iterator of JSON text chunks.
+        """
+        encoder = json.JSONEncoder(indent=self.indent, sort_keys=self.sort_keys, separators=(',', ': '),
+                                   default=_default)
+        return encoder.iterencode(data)
+
+    def iter_encode_pages(self, pages: t.Iterable[dict], items_key: str) -> t.Iterator[str]:
+        """
+        Encode a paged crawl as one JSON document, chunk by chunk.
+
+        The fields of the first page form the envelope and the records of all
+        pages are concatenated under `items_key`. The output matches what
+        `write_to_file` produces for the merged crawl, but only one page is
+        held in memory at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param items_key: Key holding the list of records in each page.
+        :return: Iterator of JSON text chunks.
+        """
+        encoder = json.JSONEncoder(indent=self.indent, sort_keys=self.sort_keys, separators=(',', ': '),
+                                   default=_default)
+        if self.indent is None:
+            newline, step = "", ""
+        else:
+            newline = "\n"
+            step = self.indent if isinstance(self.indent, str) else " " * self.indent
+
+        def _encode(value: t.Any, depth: int) -> str:
+            return encoder.encode(value).replace("\n", "\n" + step * depth)
+
+        pages = iter(pages)
+        first_page = next(pages, None)
+        if first_page is None:
+            yield "{}"
+            return
+
+        keys = [key for key in first_page if key != items_key] + [items_key]
+        if self.sort_keys:
+            keys.sort()
+        split = keys.index(items_key)
+
+        yield "{"
+        for key in keys[:split]:
+            yield f"{newline}{step}{_encode(key, 1)}: {_encode(first_page[key], 1)},"
+        yield f"{newline}{step}{_encode(items_key, 1)}: ["
+        separator = ""
+        for page in itertools.chain([first_page], pages):
+            for item in page.get(items_key, []):
+                yield f"{separator}{newline}{step * 2}{_encode(item, 2)}"
+                separator = ","
+        yield f"{newline}{step}]" if separator else "]"
+        for key in keys[split + 1:]:
+            yield f",{newline}{step}{_encode(key, 1)}: {_encode(first_page[key], 1)}"
+        yield f"{newline}}}"
+
+    def write_pages_to_file(self, pages: t.Iterable[dict], file_path: str, items_key: str):
+        """
+        Write a paged crawl to a specified file as it arrives.
+
+        :param pages: Iterable of page dictionaries.
+        :param file_path: The file path to write to.
+        :param items_key: Key holding the list of records in each page.
+        """
+        with open(file_path, "w", encoding="utf-8") as f:
+            for chunk in self.iter_encode_pages(pages, items_key):
+                f.write(chunk)
+
+    def encode_line(self, record: t.Any) -> str:
+        """
+        Encode a single record as one compact line of JSON Lines.
+
+        :param record: The record to encode.
+        :return: The encoded record, terminated by a newline.
+        """
+        return json.dumps(record, sort_keys=self.sort_keys, separators=(',', ':'), ensure_ascii=False,
+                          default=_default) + "\n"
+
+    def write_lines_to_file(self,
+                            records: t.Iterable[t.Any],
+                            file_path: str,
+                            append: bool = False,
+                            flush_every: int = 100) -> int:
+        """
+        Write records to a file as newline-delimited JSON, one record per line.
+
+        :param records: Iterable of records to write.
+        :param file_path: The file path to write to.
+        :param append: Append to an existing file instead of overwriting it.
+        :param flush_every: Flush to disk after this many records (0 to flush only on close).
+        :return: Number of records written.
+        """
+        count = 0
+        with open(file_path, "a" if append else "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(self.encode_line(record))
+                count += 1
+                if flush_every and count % flush_every == 0:
+                    f.flush()
+        return count
+
+    @staticmethod
+    def iter_lines_from_file(file_path: str) -> t.Iterator[t.Any]:
+        """
+        Read a newline-delimited JSON file one record at a time.
+
+        :param file_path: The file path to read from.
+        :return: Iterator of decoded records.
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
     def write_to_temp_file(self, data: t.Any) -> str:
         """
         Write JSON data to a temporary file.
 
+        Deprecated: the cloud writers stream uploads and no longer need it.
+        The caller is responsible for removing the file.
+
         :param data: The data to write.
         :return: Path to the temporary file.
         """
+        warnings.warn("JsonFileHandler.write_to_temp_file is deprecated; write_to_file or iter_encode "
+                      "cover its uses.", DeprecationWarning, stacklevel=2)
         import tempfile
 
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", encoding="utf-8") as temp_file:
-            json.dump(
-                data,
-                temp_file,
-                indent=self.indent,
-                sort_keys=self.sort_keys,
-                separators=(',', ': ')  # Add spaces after commas and colons
-            )
-            return temp_file.name
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
+            file_path = temp_file.name
+        self.write_to_file(data, file_path)
+        return file_path
@@ -0,0 +1,207 @@
+import io
+import typing as t
+from bskydata.storage.records import explode_records, find_items_key, get_field
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is an optional dependency
+    pa = None
+    pq = None
+
+
+def _labels(value: t.Any) -> t.List[str]:
+    """Reduce atproto label objects to their values."""
+    return [label.get("val") if isinstance(label, dict) else str(label) for label in value or []]
+
+
+# Column definitions per items key: (column, type, source field paths, converter).
+# Source paths are tried in order, so both parsed and raw field names are covered.
+# Envelope fields such as the crawled actor are read from the record "context".
+_COLUMNS = {
+    "followers": [
+        ("actor", "string", ["context.actor"], None),
+        ("crawled_at", "string", ["context.created_at"], None),
+        ("did", "string", ["did"], None),
+        ("display_name", "string", ["display_name"], None),
+        ("handle", "string", ["handle"], None),
+        ("description", "string", ["description"], None),
+        ("avatar_url", "string", ["avatar_url", "avatar"], None),
+        ("created_at", "string", ["created_at"], None),
+    ],
+    "follows": [
+        ("actor", "string", ["context.actor"], None),
+        ("crawled_at", "string", ["context.follows_created_at", "context.created_at"], None),
+        ("did", "string", ["did"], None),
+        ("display_name", "string", ["display_name"], None),
+        ("handle", "string", ["handle"], None),
+        ("description", "string", ["description"], None),
+        ("avatar_url", "string", ["avatar_url", "avatar"], None),
+        ("created_at", "string", ["created_at"], None),
+    ],
+    "profiles": [
+        ("crawled_at", "string", ["context.profiles_created_at", "context.created_at"], None),
+        ("did", "string", ["did"], None),
+        ("display_name", "string", ["display_name"], None),
+        ("handle", "string", ["handle"], None),
+        ("followers_count", "int64", ["followers_count"], None),
+        ("follows_count", "int64", ["follows_count"], None),
+        ("posts_count", "int64", ["posts_count"], None),
+        ("description", "string", ["description"], None),
+        ("avatar_url", "string", ["avatar_url", "avatar"], None),
+        ("banner_url", "string", ["banner_url", "banner"], None),
+        ("created_at", "string", ["created_at"], None),
+        ("labels", "list<string>", ["labels"], _labels),
+        ("pinned_post_uri", "string", ["pinned_post_uri", "pinned_post.uri"], None),
+    ],
+    "posts": [
+        ("search_term", "string", ["context.search_term"], None),
+        ("crawled_at", "string", ["context.created_at"], None),
+        ("post_uri", "string", ["post_uri", "uri"], None),
+        ("post_cid", "string", ["post_cid", "cid"], None),
+        ("author_did", "string", ["author_did", "author.did"], None),
+        ("author_display_name", "string", ["author_display_name", "author.display_name"], None),
+        ("author_handle", "string", ["author_handle", "author.handle"], None),
+        ("post_text", "string", ["post_text", "record.text"], None),
+        ("tags", "list<string>", ["tags"], None),
+        ("post_created_at", "string", ["post_created_at", "record.created_at"], None),
+    ],
+    "metrics": [
+        ("computed_at", "string", ["context.created_at"], None),
+        ("did", "string", ["did"], None),
+        ("in_degree", "int64", ["in_degree"], None),
+        ("out_degree", "int64", ["out_degree"], None),
+        ("in_degree_centrality", "double", ["in_degree_centrality"], None),
+        ("out_degree_centrality", "double", ["out_degree_centrality"], None),
+        ("pagerank", "double", ["pagerank"], None),
+        ("community", "int64", ["community"], None),
+    ],
+    "mutuals": [
+        ("computed_at", "string", ["context.created_at"], None),
+        ("did", "string", ["did"], None),
+        ("mutual_did", "string", ["mutual_did"], None),
+    ],
+}
+
+
+def _arrow_type(name: str):
+    return {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "double": pa.float64(),
+        "list<string>": pa.list_(pa.string()),
+    }[name]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back as chunks."""
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> t.List[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+class ParquetFileHandler:
+    def __init__(self, compression: str = "zstd", row_group_size: int = 100_000):
+        """
+        :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none").
+        :param row_group_size: Number of rows buffered before a row group is written.
+        """
+        if pa is None:
+            raise ImportError("ParquetFileHandler requires pyarrow: pip install bskydata[parquet]")
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @staticmethod
+    def schema(items_key: str):
+        """
+        Explicit Arrow schema for the parsed records of `items_key`.
+
+        :param items_key: One of "followers", "follows", "profiles", "posts", "metrics", "mutuals".
+        :return: The pyarrow schema.
+        """
+        if items_key not in _COLUMNS:
+            raise ValueError(f"No Parquet schema for '{items_key}' records.")
+        return pa.schema([(column, _arrow_type(type_name)) for column, type_name, _, _ in _COLUMNS[items_key]])
+
+    @staticmethod
+    def _row(record: dict, columns: list) -> dict:
+        row = {}
+        for column, _, sources, converter in columns:
+            value = None
+            for source in sources:
+                value = get_field(record, source)
+                if value is not None:
+                    break
+            # Missing fields stay null, even when the column has a converter.
+            row[column] = converter(value) if converter and value is not None else value
+        return row
+
+    def _write_pages(self, pages: t.Iterable[t.Any], items_key: str, sink) -> t.Iterator[None]:
+        """Write pages to `sink`, yielding after every row group so callers can drain it."""
+        schema = self.schema(items_key)
+        columns = _COLUMNS[items_key]
+        rows = []
+        writer = pq.ParquetWriter(sink, schema, compression=self.compression)
+        try:
+            for page in pages:
+                for record in explode_records(page, items_key):
+                    rows.append(self._row(record, columns))
+                    if len(rows) >= self.row_group_size:
+                        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                        rows = []
+                        yield
+            if rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        finally:
+            writer.close()
+        yield
+
+    def write_pages_to_file(self, pages: t.Iterable[t.Any], file_path: str, items_key: str):
+        """
+        Write a paged crawl to a Parquet file, one row group at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param file_path: The file path to write to.
+        :param items_key: Key holding the list of records in each page.
+        """
+        for _ in self._write_pages(pages, items_key, file_path):
+            pass
+
+    def write_to_file(self, data: t.Any, file_path: str, items_key: str = None):
+        """
+        Write a crawl result to a Parquet file.
+
+        :param data: The (parsed) crawl result.
+        :param file_path: The file path to write to.
+        :param items_key: Key holding the list of records; detected when omitted.
+        """
+        self.write_pages_to_file([data], file_path, items_key or find_items_key(data))
+
+    def iter_encode_pages(self, pages: t.Iterable[t.Any], items_key: str) -> t.Iterator[bytes]:
+        """
+        Encode a paged crawl as Parquet, yielding bytes as row groups complete.
+
+        :param pages: Iterable of page dictionaries.
+        :param items_key: Key holding the list of records in each page.
+        :return: Iterator of bytes chunks making up the Parquet file.
+        """
+        sink = _ChunkSink()
+        for _ in self._write_pages(pages, items_key, sink):
+            yield from sink.drain()
@@ -0,0 +1,119 @@
+import dataclasses
+import typing as t
+
+
+# Keys under which scrapers and parsers place their lists of records.
+ITEMS_KEYS = ("followers", "follows", "posts", "profiles", "events", "metrics", "mutuals")
+
+
+def find_items_key(data: dict) -> t.Union[str, None]:
+    """
+    Find the key holding the list of records in a scraper or parser result.
+
+    :param data: A crawl result such as {"actor": ..., "followers": [...]}.
+    :return: The items key, or None if the dictionary has none.
+    """
+    for key in ITEMS_KEYS:
+        if isinstance(data.get(key), list):
+            return key
+    return None
+
+
+def record_field(record: t.Any, name: str) -> t.Any:
+    """
+    Read a field from a record dictionary, compact parser record or atproto model.
+
+    :param record: The record.
+    :param name: Field name.
+    :return: The field's value, or None if the record has no such field.
+    """
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def as_dict(record: t.Any) -> t.Any:
+    """
+    Convert a compact parser record (a slotted dataclass) to a dictionary.
+
+    :param record: A record emitted by a parser.
+    :return: The record's fields as a dictionary; anything that is not a
+             dataclass instance is returned unchanged.
+    """
+    if dataclasses.is_dataclass(record) and not isinstance(record, type):
+        return {field.name: getattr(record, field.name) for field in dataclasses.fields(record)}
+    return record
+
+
+def explode_records(data: t.Any, items_key: str = None) -> t.Iterator[dict]:
+    """
+    Flatten a crawl result into one dictionary per record.
+
+    Each record keeps its own fields and gains a "context" field with the
+    scalar fields of the envelope it came from (e.g. the crawled actor and
+    the crawl time), so records stay meaningful on their own. Lists are
+    yielded element by element and anything else is yielded as-is. Compact
+    parser records are converted to dictionaries.
+
+    :param data: A crawl result, a list of records or a single record.
+    :param items_key: Key holding the records; detected when omitted.
+    :return: Iterator of record dictionaries.
+    """
+    if isinstance(data, list):
+        yield from map(as_dict, data)
+        return
+    if not isinstance(data, dict):
+        yield data
+        return
+    items_key = items_key or find_items_key(data)
+    if items_key is None:
+        yield data
+        return
+    context = {
+        key: value for key, value in data.items()
+        if key != items_key and not isinstance(value, (list, dict))
+    }
+    for item in data.get(items_key) or []:
+        yield {**as_dict(item), "context": context}
+
+
+# Fields that identify a record, per items key. The first set of fields that
+# is present on a record is used, so raw and parsed records are both covered.
+RECORD_KEY_FIELDS = {
+    "followers": [("context.actor", "did")],
+    "follows": [("context.actor", "did")],
+    "profiles": [("did",)],
+    "posts": [("post_uri",), ("uri",)],
+    "metrics": [("did",)],
+    "mutuals": [("did", "mutual_did")],
+}
+
+
+def get_field(record: dict, path: str) -> t.Any:
+    """
+    Look up a dotted field path (e.g. "context.actor") in a record.
+
+    :param record: Record dictionary.
+    :param path: Dot-separated field path.
+    :return: The value, or None if any part of the path is missing.
+    """
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def key_fields(record: dict, items_key: str) -> t.Union[t.Tuple[str, ...], None]:
+    """
+    Find the fields identifying an exploded record.
+
+    :param record: Record produced by `explode_records`.
+    :param items_key: Items key the record was exploded from.
+    :return: Tuple of field paths, or None if the record has no known key.
+    """
+    for fields in RECORD_KEY_FIELDS.get(items_key, []):
+        if all(get_field(record, field) not in (None, "") for field in fields):
+            return fields
+    return None
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import re
+import typing as t
+from pathlib import Path
+
+
+class LocalStateStore:
+    """
+    Small on-disk store for crawl state such as cursors and checkpoints.
+
+    Every entry is a JSON document in `directory`, written atomically so a
+    crash never leaves a half-written state behind. An entry can also own an
+    append-only JSON Lines file of records (e.g. the pages of an unfinished
+    crawl) that is removed together with the entry.
+    """
+    def __init__(self, directory: str = ".bskydata_state"):
+        """
+        :param directory: Directory holding the state files (created if missing).
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str, suffix: str) -> Path:
+        # Keep names readable but file-system safe; the hash keeps them unique.
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)[:100]
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:10]
+        return self.directory / f"{safe_name}-{digest}{suffix}"
+
+    def load(self, name: str) -> t.Union[dict, None]:
+        """
+        Load the state saved under `name`.
+
+        :param name: Entry name.
+        :return: The saved state, or None if there is none.
+        """
+        path = self._path(name, ".json")
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, name: str, state: dict):
+        """
+        Atomically replace the state saved under `name`.
+
+        :param name: Entry name.
+        :param state: JSON-serializable state.
+        """
+        path = self._path(name, ".json")
+        temp_path = path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def append_records(self, name: str, records: t.Iterable[t.Any]):
+        """
+        Append records to the JSON Lines file owned by `name`.
+
+        :param name: Entry name.
+        :param records: JSON-serializable records.
+        """
+        with open(self._path(name, ".records.jsonl"), "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_records(self, name: str) -> t.Iterator[t.Any]:
+        """
+        Read back the records appended under `name`.
+
+        :param name: Entry name.
+        :return: Iterator of records, in the order they were appended.
+        """
+        path = self._path(name, ".records.jsonl")
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def truncate_records(self, name: str, count: int):
+        """
+        Atomically keep only the first `count` records appended under `name`.
+
+        Records are appended before the state that counts them is saved, so
+        after a crash the file can hold records the state does not know about.
+
+        :param name: Entry name.
+        :param count: Number of records to keep.
+        """
+        path = self._path(name, ".records.jsonl")
+        if not path.exists():
+            return
+        temp_path = path.with_suffix(".jsonl.tmp")
+        kept = 0
+        with open(path, "rb") as source, open(temp_path, "wb") as f:
+            for line in source:
+                if kept >= count:
+                    break
+                if line.strip():
+                    f.write(line)
+                    kept += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def clear(self, name: str):
+        """
+        Remove the state and records saved under `name`.
+
+        :param name: Entry name.
+        """
+        for suffix in (".json", ".records.jsonl"):
+            self._path(name, suffix).unlink(missing_ok=True)
@@ -1,5 +1,34 @@
-from bskydata.storage.writers.local.local import LocalJsonFileWriter
-from bskydata.storage.writers.cloud.aws import S3JsonDataWriter
-from bskydata.storage.writers.cloud.gcp import GCPJsonDataWriter
-from bskydata.storage.writers.cloud.azure import AzureJsonDataWriter
-from bskydata.storage.writers.database.mongodb import MongoDBDataWriter
+from bskydata.registry import Registry, WRITERS_GROUP
+
+# Writers are imported on first access (PEP 562), so using one backend never
+# imports the SDKs of the others. Third-party writers registered under the
+# "bskydata.writers" entry point group can be imported from here as well.
+registry = Registry(WRITERS_GROUP, {
+    "LocalJsonFileWriter": ("bskydata.storage.writers.local.local:LocalJsonFileWriter", None),
+    "LocalParquetFileWriter": ("bskydata.storage.writers.local.parquet:LocalParquetFileWriter", "parquet"),
+    "S3JsonDataWriter": ("bskydata.storage.writers.cloud.aws:S3JsonDataWriter", "aws"),
+    "S3ParquetDataWriter": ("bskydata.storage.writers.cloud.aws:S3ParquetDataWriter", "aws"),
+    "GCPJsonDataWriter": ("bskydata.storage.writers.cloud.gcp:GCPJsonDataWriter", "google"),
+    "GCPParquetDataWriter": ("bskydata.storage.writers.cloud.gcp:GCPParquetDataWriter", "google"),
+    "AzureJsonDataWriter": ("bskydata.storage.writers.cloud.azure:AzureJsonDataWriter", "azure"),
+    "AzureParquetDataWriter": ("bskydata.storage.writers.cloud.azure:AzureParquetDataWriter", "azure"),
+    "MongoDBDataWriter": ("bskydata.storage.writers.database.mongodb:MongoDBDataWriter", "mongodb"),
+    "Neo4jDataWriter": ("bskydata.storage.writers.database.neo4j:Neo4jDataWriter", "neo4j"),
+    "DeduplicatingWriter": ("bskydata.storage.writers.dedup:DeduplicatingWriter", None),
+})
+
+# Only writers without optional dependencies: a star import must neither
+# fail without the extras nor import every SDK that is installed.
+__all__ = [name for name, (_, extra) in registry.builtins.items() if extra is None]
+
+
+def __getattr__(name: str):
+    if name.startswith("__") or name not in registry:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = registry.get(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(registry.names()))
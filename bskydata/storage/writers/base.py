@@ -13,3 +13,29 @@ class DataWriter(ABC):
         :param kwargs: Additional parameters for customization.
         """
         pass
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a crawl that arrives one page at a time.
+
+        Every page is a dictionary of the same shape, with its records under
+        `items_key`. This default merges the pages and calls `write` once;
+        writers that can persist pages as they arrive override it so a crawl
+        never has to be held in memory.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Optional dynamic destination (e.g., file name, database table).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional parameters for customization.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to merge pages.")
+        merged = None
+        for page in pages:
+            if merged is None:
+                merged = dict(page)
+                merged[items_key] = list(page.get(items_key, []))
+            else:
+                merged[items_key].extend(page.get(items_key, []))
+        if merged is not None:
+            self.write(merged, destination=destination, **kwargs)
@@ -1,12 +1,22 @@
+import itertools
 import typing as t
 import boto3
-from bskydata.storage.writers.cloud.base import CloudDataWriter
+from bskydata.storage.writers.cloud.base import CloudDataWriter, DEFAULT_PART_SIZE, iter_parts
 from bskydata.storage.handlers.json import JsonFileHandler
+from bskydata.storage.handlers.parquet import ParquetFileHandler
+from bskydata.storage.records import find_items_key
 
-class S3DataWriter(CloudDataWriter):
-    def __init__(self, aws_access_key: str, aws_secret_key: str, bucket_name: str):
 
+# S3 rejects multipart uploads with a part (other than the last) below 5 MiB.
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3DataWriter(CloudDataWriter):
+    def __init__(self, aws_access_key: str, aws_secret_key: str, bucket_name: str, part_size: int = DEFAULT_PART_SIZE):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes (5 MiB) for S3 multipart uploads.")
         self.bucket_name = bucket_name
+        self.part_size = part_size
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=aws_access_key,
@@ -22,9 +32,37 @@ class S3DataWriter(CloudDataWriter):
         with open(file_path, "rb") as data:
             self.s3_client.put_object(Bucket=self.bucket_name, Key=destination, Body=data)
 
+    def upload_stream(self, chunks: t.Iterable[t.Union[str, bytes]], destination: str, **kwargs):
+        """Upload a stream to an S3 bucket, using a multipart upload when it spans several parts."""
+        content_type = kwargs.get("content_type", "application/json")
+        parts = iter_parts(chunks, self.part_size)
+        first_part = next(parts, b"")
+        second_part = next(parts, None)
+        if second_part is None:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=destination,
+                                      Body=first_part, ContentType=content_type)
+            return
+
+        upload = self.s3_client.create_multipart_upload(Bucket=self.bucket_name, Key=destination,
+                                                        ContentType=content_type)
+        upload_id = upload["UploadId"]
+        try:
+            uploaded_parts = []
+            for part_number, body in enumerate(itertools.chain([first_part, second_part], parts), start=1):
+                response = self.s3_client.upload_part(Bucket=self.bucket_name, Key=destination,
+                                                      PartNumber=part_number, UploadId=upload_id, Body=body)
+                uploaded_parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+            self.s3_client.complete_multipart_upload(Bucket=self.bucket_name, Key=destination,
+                                                     UploadId=upload_id,
+                                                     MultipartUpload={"Parts": uploaded_parts})
+        except Exception:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=destination, UploadId=upload_id)
+            raise
+
 class S3JsonDataWriter(S3DataWriter):
-    def __init__(self, aws_access_key: str, aws_secret_key: str, bucket_name: str, indent: int = 4, sort_keys: bool = True):
-        super().__init__(aws_access_key, aws_secret_key, bucket_name)
+    def __init__(self, aws_access_key: str, aws_secret_key: str, bucket_name: str, indent: int = 4, sort_keys: bool = True,
+                 part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(aws_access_key, aws_secret_key, bucket_name, part_size=part_size)
         self.json_handler = JsonFileHandler(indent=indent, sort_keys=sort_keys)
 
     def write(self, data: t.Any, destination: str = None, **kwargs):
@@ -35,5 +73,49 @@ class S3JsonDataWriter(S3DataWriter):
         :param destination: Cloud storage path (e.g., S3 key).
         :param kwargs: Additional options for upload.
         """
-        temp_file_path = self.json_handler.write_to_temp_file(data)
-        self.upload(temp_file_path, destination, **kwargs)
+        self.upload_stream(self.json_handler.iter_encode(data), destination, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to an S3 bucket as a JSON file, one page at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., S3 key).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        self.upload_stream(self.json_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
+
+
+class S3ParquetDataWriter(S3DataWriter):
+    def __init__(self, aws_access_key: str, aws_secret_key: str, bucket_name: str, compression: str = "zstd",
+                 row_group_size: int = 100_000, part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(aws_access_key, aws_secret_key, bucket_name, part_size=part_size)
+        self.parquet_handler = ParquetFileHandler(compression=compression, row_group_size=row_group_size)
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write parsed followers, follows, profiles or posts to an S3 bucket as a Parquet file.
+
+        :param data: The (parsed) crawl result.
+        :param destination: Cloud storage path (e.g., S3 key).
+        :param kwargs: 'items_key' names the list of records when it cannot be detected.
+        """
+        items_key = kwargs.pop("items_key", None) or find_items_key(data)
+        self.write_pages([data], destination, items_key=items_key, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to an S3 bucket as a Parquet file, one row group at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., S3 key).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        kwargs.setdefault("content_type", "application/vnd.apache.parquet")
+        self.upload_stream(self.parquet_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
@@ -1,14 +1,20 @@
+import base64
+import contextlib
+import itertools
 import typing as t
-import json
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from azure.storage.blob import BlobServiceClient, BlobBlock, ContentSettings
 from bskydata.storage.handlers.json import JsonFileHandler
-from bskydata.storage.writers.cloud.base import CloudDataWriter
+from bskydata.storage.handlers.parquet import ParquetFileHandler
+from bskydata.storage.records import find_items_key
+from bskydata.storage.writers.cloud.base import CloudDataWriter, DEFAULT_PART_SIZE, iter_parts
 
 
 class AzureDataWriter(CloudDataWriter):
-    def __init__(self, connection_string: str, container_name: str):
+    def __init__(self, connection_string: str, container_name: str, part_size: int = DEFAULT_PART_SIZE):
 
         self.container_name = container_name
+        self.part_size = part_size
         self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
 
     def authenticate(self, **kwargs):
@@ -21,9 +27,51 @@ class AzureDataWriter(CloudDataWriter):
         with open(file_path, "rb") as data:
             blob_client.upload_blob(data, overwrite=True)
 
+    def upload_stream(self, chunks: t.Iterable[t.Union[str, bytes]], destination: str, **kwargs):
+        """Upload a stream to an Azure Blob Storage container, staging blocks when it spans several parts."""
+        content_settings = ContentSettings(content_type=kwargs.get("content_type", "application/json"))
+        blob_client = self.blob_service_client.get_blob_client(container=self.container_name, blob=destination)
+        parts = iter_parts(chunks, self.part_size)
+        first_part = next(parts, b"")
+        second_part = next(parts, None)
+        if second_part is None:
+            blob_client.upload_blob(first_part, overwrite=True, content_settings=content_settings)
+            return
+
+        try:
+            block_list = []
+            for block_number, body in enumerate(itertools.chain([first_part, second_part], parts)):
+                # Block ids must be base64 strings of equal length within a blob.
+                block_id = base64.b64encode(f"{block_number:08d}".encode()).decode()
+                blob_client.stage_block(block_id=block_id, data=body)
+                block_list.append(BlobBlock(block_id=block_id))
+            blob_client.commit_block_list(block_list, content_settings=content_settings)
+        except Exception:
+            self._discard_blocks(blob_client)
+            raise
+
+    @staticmethod
+    def _discard_blocks(blob_client):
+        """
+        Drop the staged blocks of a failed block upload.
+
+        Azure has no call to abort a block upload; committing a block list
+        discards the blocks left out of it. When no blob existed before, an
+        empty one is committed and deleted. An existing blob is left as it
+        was, and its staged blocks expire after a week. Errors while cleaning
+        up are ignored so the upload's own error is raised.
+        """
+        with contextlib.suppress(AzureError):
+            try:
+                blob_client.get_blob_properties()
+            except ResourceNotFoundError:
+                blob_client.commit_block_list([])
+                blob_client.delete_blob()
+
 class AzureJsonDataWriter(AzureDataWriter):
-    def __init__(self, connection_string: str, container_name: str, indent: int = 4, sort_keys: bool = True):
-        super().__init__(connection_string, container_name)
+    def __init__(self, connection_string: str, container_name: str, indent: int = 4, sort_keys: bool = True,
+                 part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(connection_string, container_name, part_size=part_size)
         self.json_handler = JsonFileHandler(indent=indent, sort_keys=sort_keys)
 
     def write(self, data: t.Any, destination: str = None, **kwargs):
@@ -34,5 +82,49 @@ class AzureJsonDataWriter(AzureDataWriter):
         :param destination: Cloud storage path (e.g., blob name).
         :param kwargs: Additional options for upload.
         """
-        temp_file_path = self.json_handler.write_to_temp_file(data)
-        self.upload(temp_file_path, destination, **kwargs)
+        self.upload_stream(self.json_handler.iter_encode(data), destination, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to Azure Blob Storage as a JSON file, one page at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        self.upload_stream(self.json_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
+
+
+class AzureParquetDataWriter(AzureDataWriter):
+    def __init__(self, connection_string: str, container_name: str, compression: str = "zstd",
+                 row_group_size: int = 100_000, part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(connection_string, container_name, part_size=part_size)
+        self.parquet_handler = ParquetFileHandler(compression=compression, row_group_size=row_group_size)
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write parsed followers, follows, profiles or posts to Azure Blob Storage as a Parquet file.
+
+        :param data: The (parsed) crawl result.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param kwargs: 'items_key' names the list of records when it cannot be detected.
+        """
+        items_key = kwargs.pop("items_key", None) or find_items_key(data)
+        self.write_pages([data], destination, items_key=items_key, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to Azure Blob Storage as a Parquet file, one row group at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        kwargs.setdefault("content_type", "application/vnd.apache.parquet")
+        self.upload_stream(self.parquet_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
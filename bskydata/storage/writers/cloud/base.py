@@ -1,9 +1,14 @@
+import os
+import tempfile
 import typing as t
-import json
 from abc import abstractmethod
 from bskydata.storage.writers.base import DataWriter
 
 
+# Size of each part of a multipart / resumable / block upload.
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
 class CloudDataWriter(DataWriter):
     @abstractmethod
     def authenticate(self, **kwargs):
@@ -24,3 +29,44 @@ class CloudDataWriter(DataWriter):
         :param kwargs: Additional parameters for customization.
         """
         pass
+
+    def upload_stream(self, chunks: t.Iterable[t.Union[str, bytes]], destination: str, **kwargs):
+        """
+        Upload a stream of chunks to the cloud.
+
+        The built-in writers override this to stream without staging on disk:
+        payloads that fit in one part are sent in a single request, larger
+        ones use the service's multipart, resumable or block upload so that
+        at most one part is held in memory. This default spools the stream to
+        a temporary file, hands it to `upload` and removes it again.
+
+        :param chunks: Iterable of text or bytes chunks making up the object.
+        :param destination: The cloud storage path (e.g., blob name, S3 key).
+        :param kwargs: Additional parameters for customization.
+        """
+        fd, temp_path = tempfile.mkstemp(prefix="bskydata-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for part in iter_parts(chunks):
+                    f.write(part)
+            self.upload(temp_path, destination, **kwargs)
+        finally:
+            os.unlink(temp_path)
+
+
+def iter_parts(chunks: t.Iterable[t.Union[str, bytes]], part_size: int = DEFAULT_PART_SIZE) -> t.Iterator[bytes]:
+    """
+    Re-chunk a stream into parts of `part_size` bytes (the last may be smaller).
+
+    :param chunks: Iterable of text (UTF-8 encoded here) or bytes chunks.
+    :param part_size: Size of every part but the last.
+    :return: Iterator of byte parts.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
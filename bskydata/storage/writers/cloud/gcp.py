@@ -1,13 +1,17 @@
 import typing as t
 from google.cloud import storage
-from bskydata.storage.writers.cloud.base import CloudDataWriter
+from bskydata.storage.writers.cloud.base import CloudDataWriter, DEFAULT_PART_SIZE, iter_parts
 from bskydata.storage.handlers.json import JsonFileHandler
+from bskydata.storage.handlers.parquet import ParquetFileHandler
+from bskydata.storage.records import find_items_key
 
 
 class GCPDataWriter(CloudDataWriter):
-    def __init__(self, credentials_json: str, bucket_name: str):
+    def __init__(self, credentials_json: str, bucket_name: str, part_size: int = DEFAULT_PART_SIZE):
 
         self.bucket_name = bucket_name
+        # Resumable upload chunks must be a multiple of 256 KiB.
+        self.part_size = max(part_size // (256 * 1024), 1) * 256 * 1024
         self.storage_client = storage.Client.from_service_account_json(credentials_json)
 
     def authenticate(self, **kwargs):
@@ -20,9 +24,28 @@ class GCPDataWriter(CloudDataWriter):
         blob = bucket.blob(destination)
         blob.upload_from_filename(file_path)
 
+    def upload_stream(self, chunks: t.Iterable[t.Union[str, bytes]], destination: str, **kwargs):
+        """Upload a stream to a Google Cloud Storage bucket, using a resumable upload when it spans several parts."""
+        content_type = kwargs.get("content_type", "application/json")
+        bucket = self.storage_client.bucket(self.bucket_name)
+        blob = bucket.blob(destination)
+        parts = iter_parts(chunks, self.part_size)
+        first_part = next(parts, b"")
+        second_part = next(parts, None)
+        if second_part is None:
+            blob.upload_from_string(first_part, content_type=content_type)
+            return
+
+        with blob.open("wb", chunk_size=self.part_size, content_type=content_type) as f:
+            f.write(first_part)
+            f.write(second_part)
+            for part in parts:
+                f.write(part)
+
 class GCPJsonDataWriter(GCPDataWriter):
-    def __init__(self, credentials_json: str, bucket_name: str, indent: int = 4, sort_keys: bool = True):
-        super().__init__(credentials_json, bucket_name)
+    def __init__(self, credentials_json: str, bucket_name: str, indent: int = 4, sort_keys: bool = True,
+                 part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(credentials_json, bucket_name, part_size=part_size)
         self.json_handler = JsonFileHandler(indent=indent, sort_keys=sort_keys)
 
     def write(self, data: t.Any, destination: str = None, **kwargs):
@@ -33,5 +56,49 @@ class GCPJsonDataWriter(GCPDataWriter):
         :param destination: Cloud storage path (e.g., blob name).
         :param kwargs: Additional options for upload.
         """
-        temp_file_path = self.json_handler.write_to_temp_file(data)
-        self.upload(temp_file_path, destination, **kwargs)
+        self.upload_stream(self.json_handler.iter_encode(data), destination, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to Google Cloud Storage as a JSON file, one page at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        self.upload_stream(self.json_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
+
+
+class GCPParquetDataWriter(GCPDataWriter):
+    def __init__(self, credentials_json: str, bucket_name: str, compression: str = "zstd",
+                 row_group_size: int = 100_000, part_size: int = DEFAULT_PART_SIZE):
+        super().__init__(credentials_json, bucket_name, part_size=part_size)
+        self.parquet_handler = ParquetFileHandler(compression=compression, row_group_size=row_group_size)
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write parsed followers, follows, profiles or posts to Google Cloud Storage as a Parquet file.
+
+        :param data: The (parsed) crawl result.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param kwargs: 'items_key' names the list of records when it cannot be detected.
+        """
+        items_key = kwargs.pop("items_key", None) or find_items_key(data)
+        self.write_pages([data], destination, items_key=items_key, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to Google Cloud Storage as a Parquet file, one row group at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Cloud storage path (e.g., blob name).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for upload.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        kwargs.setdefault("content_type", "application/vnd.apache.parquet")
+        self.upload_stream(self.parquet_handler.iter_encode_pages(pages, items_key), destination, **kwargs)
@@ -1,17 +1,45 @@
+import itertools
 import typing as t
+from bskydata.storage.records import as_dict, explode_records, find_items_key, get_field, key_fields
 from bskydata.storage.writers.base import DataWriter
-from pymongo import MongoClient
+from bson.codec_options import TypeRegistry
+from pymongo import MongoClient, UpdateOne
 
 
 class MongoDBDataWriter(DataWriter):
-    def __init__(self, connection_uri: str, database_name: str, collection: str):
+    def __init__(self,
+                 connection_uri: str,
+                 database_name: str,
+                 collection: str,
+                 mode: str = "document",
+                 batch_size: int = 1000,
+                 create_indexes: bool = False):
         """
         :param connection_uri: MongoDB connection URI.
         :param database_name: Name of the MongoDB database to write to.
+        :param collection: Default collection name.
+        :param mode: "document" inserts the data as-is; "records" explodes crawl results
+                     into one document per follower / follow / profile / post and upserts
+                     them on their key (DID, crawled actor + DID, or post URI).
+        :param batch_size: Number of upserts per bulk_write in "records" mode.
+        :param create_indexes: In "records" mode, create unique indexes on the record keys.
         """
-        self.client = MongoClient(connection_uri)
+        if mode not in ("document", "records"):
+            raise ValueError("mode must be 'document' or 'records'.")
+        # Compact parser records are stored as plain documents.
+        self.client = MongoClient(connection_uri, type_registry=TypeRegistry(fallback_encoder=as_dict))
         self.database = self.client[database_name]
         self.destination = collection
+        self.mode = mode
+        self.batch_size = batch_size
+        self.create_indexes = create_indexes
+        self._indexed = set()
+
+    def _collection(self, destination: str = None):
+        collection_name = destination or self.destination
+        if not collection_name:
+            raise ValueError("No destination (collection name) specified for MongoDBDataWriter.")
+        return self.database[collection_name]
 
     def write(self, data: t.Any, destination: str = None, **kwargs):
         """
@@ -19,18 +47,62 @@ class MongoDBDataWriter(DataWriter):
         
         :param data: The data to write (dictionary or list of dictionaries).
         :param destination: MongoDB collection name.
-        :param kwargs: Additional options for the insert operation.
+        :param kwargs: Additional options for the insert operation; in "records" mode,
+                       'items_key' names the list of records when it cannot be detected.
         """
-        if self.destination is not None:
-            self.destination = destination
+        collection = self._collection(destination)
 
-        if not destination:
-            raise ValueError("No destination (collection name) specified for MongoDBDataWriter.")
-
-        collection = self.database[self.destination]
+        if self.mode == "records":
+            items_key = kwargs.get("items_key") or (find_items_key(data) if isinstance(data, dict) else None)
+            self._upsert_records(collection, explode_records(data, items_key), items_key)
+            return
 
         # Handle insertion of single or multiple documents
         if isinstance(data, list):
             collection.insert_many(data, **kwargs)
         else:
             collection.insert_one(data, **kwargs)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl; in "records" mode each page is upserted as it arrives.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: MongoDB collection name.
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options for the insert operation.
+        """
+        if self.mode != "records":
+            super().write_pages(pages, destination=destination, items_key=items_key, **kwargs)
+            return
+        collection = self._collection(destination)
+        records = itertools.chain.from_iterable(explode_records(page, items_key) for page in pages)
+        self._upsert_records(collection, records, items_key)
+
+    def _upsert_records(self, collection, records: t.Iterable[dict], items_key: str) -> int:
+        """Upsert records in unordered bulk writes of `batch_size`."""
+        written = 0
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, self.batch_size))
+            if not batch:
+                return written
+            operations = []
+            for record in batch:
+                fields = key_fields(record, items_key)
+                if fields is None:
+                    raise ValueError(f"Cannot determine the key of a '{items_key}' record for upserting.")
+                self._ensure_index(collection, fields)
+                operations.append(UpdateOne(
+                    {field: get_field(record, field) for field in fields},
+                    {"$set": record},
+                    upsert=True
+                ))
+            collection.bulk_write(operations, ordered=False)
+            written += len(batch)
+
+    def _ensure_index(self, collection, fields: t.Tuple[str, ...]):
+        if not self.create_indexes or (collection.name, fields) in self._indexed:
+            return
+        collection.create_index([(field, 1) for field in fields], unique=True)
+        self._indexed.add((collection.name, fields))
@@ -1,32 +1,157 @@
+import itertools
 import re
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from bskydata.storage.records import as_dict
 from bskydata.storage.writers.base import DataWriter
 from neo4j import GraphDatabase
 
 
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class Neo4jSchemaError(Exception):
+    """Raised when required constraints are missing from the database."""
+    pass
+
+
 class Neo4jDataWriter(DataWriter):
     def __init__(self, 
                  connection_uri: str, 
                  username: str, 
                  password: str,
+                 database: str = None,
+                 batch_size: int = 1000,
+                 max_workers: int = 1,
+                 max_transaction_retry_time: float = 30.0,
                  ):
         """
         :param connection_uri: Neo4j connection URI.
         :param username: Neo4j username.
         :param password: Neo4j password
+        :param database: Database to write to (the server default if omitted).
+        :param batch_size: Default number of records per UNWIND batch in `write_records`.
+        :param max_workers: Default number of batches written in parallel, each on its own session.
+        :param max_transaction_retry_time: Seconds a managed transaction is retried on transient errors.
         """
         self.driver = GraphDatabase.driver(
             connection_uri, 
-            auth=(username, password)
+            auth=(username, password),
+            max_transaction_retry_time=max_transaction_retry_time
             )
-        self.session = self.driver.session()
+        self.database = database
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._session = None
+
+    @property
+    def session(self):
+        """Long-lived session for ad-hoc queries; writes use short managed transactions."""
+        if self._session is None:
+            self._session = self.driver.session(database=self.database)
+        return self._session
 
     def write(self, data: dict, query: str, **kwargs):
         """
-        Write data to a Neo4j database.
-        This is a placeholder method and should be implemented by subclasses.
+        Run a query in a managed write transaction.
+
+        The transaction is retried on transient errors (deadlocks, leader
+        changes) for up to `max_transaction_retry_time` seconds.
+
+        :param data: Query parameters.
+        :param query: Cypher query to run.
         """
-        # Use the data dictionary to populate a query string
-        self.session.run(query, data)
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(_run_query, query, data)
+
+    def write_records(self,
+                      records: t.Iterable[dict],
+                      query: str,
+                      parameter: str = "records",
+                      batch_size: int = None,
+                      max_workers: int = None,
+                      **parameters) -> int:
+        """
+        Write a stream of records with an UNWIND query, one batch per transaction.
+
+        Each batch is passed to `query` as the list parameter `parameter`
+        (e.g. `UNWIND $records AS record ...`) and runs as its own managed
+        write transaction, so memory on both sides is bounded by the batch
+        size. With `max_workers` > 1, batches run in parallel on separate
+        sessions from the driver's connection pool.
+
+        :param records: Iterable of record dictionaries (or compact parser records).
+        :param query: Cypher query unwinding `$<parameter>`.
+        :param parameter: Name of the list parameter holding a batch.
+        :param batch_size: Records per batch (defaults to the writer's batch_size).
+        :param max_workers: Parallel batches (defaults to the writer's max_workers).
+        :param parameters: Extra query parameters shared by every batch.
+        :return: Number of records written.
+        """
+        batch_size = batch_size or self.batch_size
+        max_workers = max_workers or self.max_workers
+        batches = _iter_batches(map(as_dict, records), batch_size)
+        written = 0
+
+        if max_workers <= 1:
+            for batch in batches:
+                self.write({**parameters, parameter: batch}, query)
+                written += len(batch)
+            return written
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for batch in batches:
+                # Keep a bounded number of batches in flight so the stream is
+                # never read far ahead of the database.
+                if len(pending) >= max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        written += pending.pop(future)
+                future = executor.submit(self.write, {**parameters, parameter: batch}, query)
+                pending[future] = len(batch)
+            for future in list(pending):
+                future.result()
+                written += pending.pop(future)
+        return written
+
+    def ensure_schema(self, unique_keys: t.Iterable[t.Tuple[str, str]], timeout: int = 300):
+        """
+        Create uniqueness constraints (and their backing indexes) and verify them.
+
+        Without them every MERGE on a key is a label scan; with them it is an
+        index lookup whose cost stays flat as the graph grows. Existing
+        constraints are left untouched.
+
+        :param unique_keys: (label, property) pairs, e.g. [("Author", "did")].
+        :param timeout: Seconds to wait for the backing indexes to come online.
+        """
+        unique_keys = list(unique_keys)
+        for label, prop in unique_keys:
+            for identifier in (label, prop):
+                if not _IDENTIFIER.match(identifier):
+                    raise ValueError(f"Invalid Neo4j identifier: {identifier!r}")
+
+        with self.driver.session(database=self.database) as session:
+            for label, prop in unique_keys:
+                session.run(
+                    f"CREATE CONSTRAINT {label.lower()}_{prop}_unique IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+                ).consume()
+            session.run("CALL db.awaitIndexes($timeout)", timeout=timeout).consume()
+
+            existing = {
+                (record["labelsOrTypes"][0], record["properties"][0])
+                for record in session.run(
+                    "SHOW CONSTRAINTS YIELD type, labelsOrTypes, properties "
+                    "WHERE type IN ['UNIQUENESS', 'NODE_PROPERTY_UNIQUENESS', 'NODE_KEY'] AND size(properties) = 1 "
+                    "RETURN labelsOrTypes, properties"
+                )
+            }
+        missing = [key for key in unique_keys if key not in existing]
+        if missing:
+            raise Neo4jSchemaError(f"Missing uniqueness constraints: {missing}")
 
     @staticmethod
     def _sanitize_value(value):
@@ -51,4 +176,22 @@ class Neo4jDataWriter(DataWriter):
         """
         Close the Neo4j driver session.
         """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         self.driver.close()
+
+
+def _run_query(tx, query: str, parameters: dict):
+    tx.run(query, parameters).consume()
+
+
+def _iter_batches(records: t.Iterable[dict], batch_size: int) -> t.Iterator[t.List[dict]]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,53 @@
+import typing as t
+from bskydata.storage.dedup import DedupIndex
+from bskydata.storage.records import find_items_key
+from bskydata.storage.writers.base import DataWriter
+
+
+class DeduplicatingWriter(DataWriter):
+    """
+    Writer wrapper that only passes on posts and follow edges not stored before.
+
+    Records are checked against a DedupIndex, and their keys are added to it
+    once the wrapped writer has returned. A failed write therefore never
+    marks records as stored.
+    """
+    def __init__(self, writer: DataWriter, index: DedupIndex):
+        """
+        :param writer: The writer new records are passed on to.
+        :param index: The index of records stored before.
+        """
+        self.writer = writer
+        self.index = index
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write the new records of a crawl result.
+
+        :param data: The crawl result (scraped or parsed).
+        :param destination: Destination passed to the wrapped writer.
+        :param kwargs: Passed to the wrapped writer; 'items_key' names the list
+                       of records when it cannot be detected.
+        """
+        items_key = kwargs.get("items_key") or (find_items_key(data) if isinstance(data, dict) else None)
+        if items_key is None:
+            self.writer.write(data, destination=destination, **kwargs)
+            return
+        pending = set()
+        data = self.index.filter_page(data, items_key, pending)
+        self.writer.write(data, destination=destination, **kwargs)
+        self.index.add(pending)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write the new records of a paged crawl.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: Destination passed to the wrapped writer.
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Passed to the wrapped writer.
+        """
+        pending = set()
+        new_pages = (self.index.filter_page(page, items_key, pending) for page in pages)
+        self.writer.write_pages(new_pages, destination=destination, items_key=items_key, **kwargs)
+        self.index.add(pending)
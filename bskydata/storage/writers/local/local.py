@@ -1,6 +1,8 @@
+import itertools
 import typing as t
 from pathlib import Path
 from bskydata.storage.handlers.json import JsonFileHandler
+from bskydata.storage.records import explode_records
 from bskydata.storage.writers.base import DataWriter
 
 
@@ -8,29 +10,79 @@ class LocalJsonFileWriter(DataWriter):
     def __init__(self, 
                  default_file: str = None, 
                  indent: int = 4, 
-                 sort_keys: bool = True):
+                 sort_keys: bool = True,
+                 ndjson: bool = False,
+                 append: bool = False,
+                 flush_every: int = 100):
         """
         :param default_file: Default file name if none is provided dynamically.
         :param indent: Number of spaces to use for indentation (default is 4).
         :param sort_keys: Whether to sort keys alphabetically (default is True).
+        :param ndjson: Write newline-delimited JSON, one record per line, instead of one document.
+        :param append: In NDJSON mode, append to the file instead of overwriting it.
+        :param flush_every: In NDJSON mode, flush to disk after this many records.
         """
         self.default_file = default_file
+        self.ndjson = ndjson
+        self.append = append
+        self.flush_every = flush_every
         self.json_handler = JsonFileHandler(indent=indent, sort_keys=sort_keys)
 
-    def write(self, data: t.Any, destination: str = None, **kwargs):
-        """
-        Write data to a JSON file with pretty printing.
-        
-        :param data: The data to write.
-        :param destination: File name to write to (overrides default).
-        :param kwargs: Additional options like 'indent' for pretty printing.
-        """
+    def _resolve_file(self, destination: str = None) -> str:
         file_name = destination or self.default_file
         if not file_name:
             raise ValueError("No destination file specified for JsonFileWriter.")
         
         # Ensure the destination directory exists
         Path(file_name).parent.mkdir(parents=True, exist_ok=True)
+        return file_name
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write data to a JSON file with pretty printing, or as JSON Lines.
+        
+        :param data: The data to write.
+        :param destination: File name to write to (overrides default).
+        :param kwargs: Additional options: 'items_key' selects the records written
+                       in NDJSON mode and 'append' overrides the writer's append mode.
+        """
+        file_name = self._resolve_file(destination)
+
+        if self.ndjson:
+            self.json_handler.write_lines_to_file(
+                explode_records(data, kwargs.get("items_key")),
+                file_name,
+                append=kwargs.get("append", self.append),
+                flush_every=self.flush_every
+            )
+            return
         
         # Delegate JSON writing to JsonFileHandler
         self.json_handler.write_to_file(data, file_name)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to a JSON file, one page at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: File name to write to (overrides default).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: 'append' overrides the writer's append mode in NDJSON mode.
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        file_name = self._resolve_file(destination)
+
+        if self.ndjson:
+            records = itertools.chain.from_iterable(
+                explode_records(page, items_key) for page in pages
+            )
+            self.json_handler.write_lines_to_file(
+                records,
+                file_name,
+                append=kwargs.get("append", self.append),
+                flush_every=self.flush_every
+            )
+            return
+
+        self.json_handler.write_pages_to_file(pages, file_name, items_key)
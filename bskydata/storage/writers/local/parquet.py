@@ -0,0 +1,50 @@
+import typing as t
+from pathlib import Path
+from bskydata.storage.handlers.parquet import ParquetFileHandler
+from bskydata.storage.records import find_items_key
+from bskydata.storage.writers.base import DataWriter
+
+
+class LocalParquetFileWriter(DataWriter):
+    def __init__(self,
+                 default_file: str = None,
+                 compression: str = "zstd",
+                 row_group_size: int = 100_000):
+        """
+        :param default_file: Default file name if none is provided dynamically.
+        :param compression: Parquet compression codec (default is zstd).
+        :param row_group_size: Number of rows per row group.
+        """
+        self.default_file = default_file
+        self.parquet_handler = ParquetFileHandler(compression=compression, row_group_size=row_group_size)
+
+    def _resolve_file(self, destination: str = None) -> str:
+        file_name = destination or self.default_file
+        if not file_name:
+            raise ValueError("No destination file specified for ParquetFileWriter.")
+        Path(file_name).parent.mkdir(parents=True, exist_ok=True)
+        return file_name
+
+    def write(self, data: t.Any, destination: str = None, **kwargs):
+        """
+        Write parsed followers, follows, profiles or posts to a Parquet file.
+
+        :param data: The (parsed) crawl result.
+        :param destination: File name to write to (overrides default).
+        :param kwargs: 'items_key' names the list of records when it cannot be detected.
+        """
+        items_key = kwargs.get("items_key") or find_items_key(data)
+        self.parquet_handler.write_pages_to_file([data], self._resolve_file(destination), items_key)
+
+    def write_pages(self, pages: t.Iterable[dict], destination: str = None, items_key: str = None, **kwargs):
+        """
+        Write a paged crawl to a Parquet file, one row group at a time.
+
+        :param pages: Iterable of page dictionaries.
+        :param destination: File name to write to (overrides default).
+        :param items_key: Key holding the list of records in each page.
+        :param kwargs: Additional options (unused).
+        """
+        if not items_key:
+            raise ValueError("items_key is required to write pages.")
+        self.parquet_handler.write_pages_to_file(pages, self._resolve_file(destination), items_key)
@@ -0,0 +1,3 @@
+from bskydata.testing.jetstream import ReplayJetstreamServer, load_frames, record_frames
+from bskydata.testing.replay import ReplayBskyClient, load_records, synthetic_posts, synthetic_profiles
+from bskydata.testing.xrpc import FakeXrpcServer
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import typing as t
+from urllib.parse import parse_qs, urlsplit
+import websockets
+
+
+def load_frames(file_path: str) -> t.List[str]:
+    """
+    Load recorded Jetstream frames, one JSON frame per line.
+
+    :param file_path: File written by `record_frames`.
+    :return: The frames, in the order they were received.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+async def record_frames(url: str, file_path: str, max_frames: int = 1000) -> int:
+    """
+    Record raw frames from a Jetstream subscription for later replay.
+
+    :param url: Subscribe URL, including any wantedCollections / wantedDids parameters.
+    :param file_path: File the frames are written to, one per line.
+    :param max_frames: Number of frames to record.
+    :return: Number of frames recorded.
+    """
+    count = 0
+    async with websockets.connect(url, max_size=None) as websocket:
+        with open(file_path, "w", encoding="utf-8") as f:
+            async for frame in websocket:
+                f.write(frame.strip() + "\n")
+                count += 1
+                if count >= max_frames:
+                    break
+    return count
+
+
+class ReplayJetstreamServer:
+    """
+    Local stand-in for a Jetstream instance that replays recorded frames.
+
+        async with ReplayJetstreamServer(load_frames("frames.jsonl")) as server:
+            await JetstreamScraper(url=server.url, reconnect=False).run(max_events=100)
+
+    Every subscriber gets the frames in order. Like Jetstream, the server
+    honours the `cursor`, `wantedCollections` and `wantedDids` parameters, then
+    closes the connection. With `drop_after`, a connection is closed with an
+    error after that many frames to exercise reconnects.
+    """
+    def __init__(self,
+                 frames: t.Iterable[t.Union[str, dict]],
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 delay: float = 0.0,
+                 drop_after: int = None):
+        """
+        :param frames: Recorded frames, as JSON strings or dictionaries.
+        :param host: Interface to listen on.
+        :param port: Port to listen on (0 picks a free one).
+        :param delay: Seconds to wait between frames.
+        :param drop_after: Abort each connection after sending this many frames.
+        """
+        self.frames = [json.loads(frame) if isinstance(frame, str) else frame for frame in frames]
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.drop_after = drop_after
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/subscribe"
+
+    async def __aenter__(self) -> "ReplayJetstreamServer":
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, websocket):
+        query = parse_qs(urlsplit(websocket.path).query)
+        self.requests.append(query)
+        cursor = int(query["cursor"][0]) if "cursor" in query else None
+        collections = set(query.get("wantedCollections", []))
+        dids = set(query.get("wantedDids", []))
+        sent = 0
+        for event in self.frames:
+            if cursor is not None and event.get("time_us", 0) < cursor:
+                continue
+            collection = (event.get("commit") or {}).get("collection")
+            if collections and event.get("kind") == "commit" and collection not in collections:
+                continue
+            if dids and event.get("did") not in dids:
+                continue
+            await websocket.send(json.dumps(event))
+            sent += 1
+            if self.drop_after is not None and sent >= self.drop_after:
+                await websocket.close(code=1011, reason="Connection dropped by ReplayJetstreamServer")
+                return
+            if self.delay:
+                await asyncio.sleep(self.delay)
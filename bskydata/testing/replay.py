@@ -0,0 +1,177 @@
+import hashlib
+import json
+import threading
+import typing as t
+from types import SimpleNamespace
+from atproto import models
+from bskydata.storage.records import find_items_key
+
+
+def synthetic_profiles(n: int, detailed: bool = False) -> list:
+    """
+    Build `n` realistic-looking profile views.
+
+    :param n: Number of profiles.
+    :param detailed: Build ProfileViewDetailed (as returned by getProfiles) instead of ProfileView.
+    :return: The atproto models.
+    """
+    profile_type = models.AppBskyActorDefs.ProfileViewDetailed if detailed else models.AppBskyActorDefs.ProfileView
+    counts = {"followers_count": 120, "follows_count": 80, "posts_count": 300} if detailed else {}
+    return [
+        profile_type(
+            did=f"did:plc:{i:024d}",
+            handle=f"user{i}.bsky.social",
+            display_name=f"User {i}",
+            description="Bluesky user " * 5,
+            avatar=f"https://cdn.bsky.app/img/avatar/plain/did:plc:{i}/abc@jpeg",
+            indexed_at="2024-11-20T12:00:00.000Z",
+            created_at="2024-11-20T12:00:00.000Z",
+            viewer=models.AppBskyActorDefs.ViewerState(muted=False, blocked_by=False),
+            labels=[],
+            **counts,
+        )
+        for i in range(n)
+    ]
+
+
+def synthetic_posts(n: int) -> list:
+    """
+    Build `n` realistic-looking post views, as returned by searchPosts.
+
+    :param n: Number of posts.
+    :return: The atproto models.
+    """
+    return [
+        models.AppBskyFeedDefs.PostView(
+            uri=f"at://did:plc:{i % 1000}/app.bsky.feed.post/{i}",
+            cid=f"bafyrei{i:040d}",
+            author=models.AppBskyActorDefs.ProfileViewBasic(did=f"did:plc:{i % 1000}", handle=f"user{i % 1000}.bsky.social"),
+            indexed_at="2024-11-20T12:00:00.000Z",
+            record={
+                "$type": "app.bsky.feed.post",
+                "text": f"Post number {i} about #python",
+                "createdAt": "2024-11-20T12:00:00.000Z",
+                "langs": ["en"],
+                "facets": [{
+                    "index": {"byteStart": 20, "byteEnd": 27},
+                    "features": [{"$type": "app.bsky.richtext.facet#tag", "tag": "python"}],
+                }],
+            },
+            like_count=i % 50,
+            reply_count=i % 7,
+            repost_count=i % 11,
+            labels=[],
+        )
+        for i in range(n)
+    ]
+
+
+def load_records(file_path: str, items_key: str = None) -> t.List[dict]:
+    """
+    Load the raw records of a crawl saved by LocalJsonFileWriter, for replay.
+
+    The file holds either one unparsed crawl result (e.g. FollowersScraper
+    output without a parser) or NDJSON records, one per line.
+
+    :param file_path: The saved crawl.
+    :param items_key: Key holding the records; detected when omitted.
+    :return: The record dictionaries.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [
+            {key: value for key, value in json.loads(line).items() if key != "context"}
+            for line in text.splitlines() if line.strip()
+        ]
+    if isinstance(data, list):
+        return data
+    return data[items_key or find_items_key(data)]
+
+
+def _as_models(records: t.Iterable[t.Any], model_type: type) -> list:
+    return [record if isinstance(record, model_type) else model_type.model_validate(record) for record in records]
+
+
+class ReplayBskyClient:
+    """
+    Offline stand-in for BskyApiClient that serves fixed records page by page.
+
+        client = ReplayBskyClient(followers=synthetic_profiles(10_000))
+        FollowersScraper(client).fetch("anyone.bsky.social", limit=10_000)
+
+    getFollowers, getFollows and searchPosts return the configured records
+    for every actor or search term, `page_size` at a time with offset
+    cursors. getProfiles returns the profiles of the requested actors, cycling
+    through the configured ones. Records can be atproto models or recorded
+    dictionaries (see `load_records`). Responses are assembled without
+    validation, so replaying costs next to nothing next to the code under test.
+    """
+    def __init__(self,
+                 followers: t.Iterable[t.Any] = (),
+                 follows: t.Iterable[t.Any] = (),
+                 posts: t.Iterable[t.Any] = (),
+                 profiles: t.Iterable[t.Any] = (),
+                 page_size: int = 100):
+        """
+        :param followers: Records served by getFollowers.
+        :param follows: Records served by getFollows.
+        :param posts: Records served by searchPosts.
+        :param profiles: Records served by getProfiles.
+        :param page_size: Maximum number of records per page (the request's limit still applies).
+        """
+        self.followers = _as_models(followers, models.AppBskyActorDefs.ProfileView)
+        self.follows = _as_models(follows, models.AppBskyActorDefs.ProfileView)
+        self.posts = _as_models(posts, models.AppBskyFeedDefs.PostView)
+        self.profiles = _as_models(profiles, models.AppBskyActorDefs.ProfileViewDetailed)
+        self.page_size = page_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.client = SimpleNamespace(
+            app=SimpleNamespace(bsky=SimpleNamespace(
+                graph=SimpleNamespace(get_followers=self._get_followers, get_follows=self._get_follows),
+                feed=SimpleNamespace(search_posts=self._search_posts),
+            )),
+            get_profiles=self._get_profiles,
+        )
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _page(self, records: list, params: t.Any) -> t.Tuple[list, t.Union[str, None]]:
+        self._count()
+        params = params if isinstance(params, dict) else params.model_dump()
+        start = int(params.get("cursor") or 0)
+        stop = start + min(self.page_size, params.get("limit") or self.page_size)
+        return records[start:stop], str(stop) if stop < len(records) else None
+
+    def _subject(self, actor: str) -> models.AppBskyActorDefs.ProfileView:
+        # Like the AppView, name the crawled account by DID even when it was asked for by handle.
+        if actor.startswith("did:"):
+            return models.AppBskyActorDefs.ProfileView.model_construct(did=actor, handle=f"{actor.split(':')[-1]}.test")
+        did = "did:plc:" + hashlib.sha1(actor.lower().encode("utf-8")).hexdigest()[:24]
+        return models.AppBskyActorDefs.ProfileView.model_construct(did=did, handle=actor.lower())
+
+    def _get_followers(self, params: t.Any) -> models.AppBskyGraphGetFollowers.Response:
+        page, cursor = self._page(self.followers, params)
+        return models.AppBskyGraphGetFollowers.Response.model_construct(
+            subject=self._subject(params.actor), followers=page, cursor=cursor
+        )
+
+    def _get_follows(self, params: t.Any) -> models.AppBskyGraphGetFollows.Response:
+        page, cursor = self._page(self.follows, params)
+        return models.AppBskyGraphGetFollows.Response.model_construct(
+            subject=self._subject(params.actor), follows=page, cursor=cursor
+        )
+
+    def _search_posts(self, params: t.Any = None) -> models.AppBskyFeedSearchPosts.Response:
+        page, cursor = self._page(self.posts, params)
+        return models.AppBskyFeedSearchPosts.Response.model_construct(posts=page, cursor=cursor, hits_total=None)
+
+    def _get_profiles(self, actors: t.List[str]) -> models.AppBskyActorGetProfiles.Response:
+        self._count()
+        profiles = [self.profiles[i % len(self.profiles)] for i in range(len(actors))] if self.profiles else []
+        return models.AppBskyActorGetProfiles.Response.model_construct(profiles=profiles)
@@ -0,0 +1,324 @@
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import typing as t
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+_CREATED_AT = "2024-11-20T12:00:00.000Z"
+_ERROR_NAMES = {
+    400: "InvalidRequest",
+    401: "AuthenticationRequired",
+    429: "RateLimitExceeded",
+    500: "InternalServerError",
+    502: "UpstreamFailure",
+    503: "NotEnoughResources",
+}
+
+
+def _jwt(did: str, scope: str, lifetime: float) -> str:
+    """Unsigned JWT with the claims atproto reads from session tokens."""
+    def encode(value: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).rstrip(b"=").decode("ascii")
+    now = int(time.time())
+    claims = {"scope": scope, "sub": did, "iat": now, "exp": now + int(lifetime), "jti": f"{time.monotonic_ns()}"}
+    return f"{encode({'typ': 'JWT', 'alg': 'none'})}.{encode(claims)}.c2lnbmF0dXJl"
+
+
+def _did(name: str) -> str:
+    return "did:plc:" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:24]
+
+
+def _profile(name: str, detailed: bool = False) -> dict:
+    # Handles are case-insensitive; the AppView returns them in lower case.
+    name = name if name.startswith("did:") else name.lower()
+    handle = name if "." in name and not name.startswith("did:") else f"{name.replace(':', '-')}.test"
+    profile = {
+        "did": name if name.startswith("did:") else _did(name),
+        "handle": handle,
+        "displayName": f"User {handle.split('.')[0]}",
+        "description": "Synthetic account served by FakeXrpcServer",
+        "avatar": f"https://cdn.bsky.app/img/avatar/plain/{_did(name)}/abc@jpeg",
+        "indexedAt": _CREATED_AT,
+        "createdAt": _CREATED_AT,
+        "labels": [],
+    }
+    if detailed:
+        profile.update(followersCount=120, followsCount=80, postsCount=300)
+    return profile
+
+
+class FakeXrpcServer:
+    """
+    Local stand-in for a Bluesky PDS/AppView serving synthetic data over XRPC.
+
+        with FakeXrpcServer(latency=0.01, rate_limit=3000) as server:
+            client = BskyApiClient("alice.test", "password", base_url=server.url)
+            FollowersScraper(client).fetch("bob.test", limit=500)
+
+    It serves createSession, refreshSession, getSession, getProfile(s),
+    getFollowers, getFollows and searchPosts. Every actor has `pages` pages
+    of followers and follows, and every search term `pages` pages of posts.
+    Records are derived from the actor or term, so repeated crawls see the
+    same data. Any username and password are accepted unless `accounts` is
+    given.
+
+    Responses carry `ratelimit-*` headers for a fixed window of `rate_limit`
+    requests per `rate_limit_window` seconds. Requests beyond the limit get a
+    429 with `Retry-After`. Each request waits `latency` (plus up to `jitter`)
+    seconds. `error_rate` fails that share of requests at random with one of
+    `error_statuses`, and `inject` scripts the next failures exactly. The
+    server runs on a pool of threads, one per connection, and keeps
+    connections alive.
+    """
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 pages: int = 5,
+                 rate_limit: int = None,
+                 rate_limit_window: float = 300.0,
+                 error_rate: float = 0.0,
+                 error_statuses: t.Sequence[int] = (500, 502, 503),
+                 accounts: t.Dict[str, str] = None,
+                 access_token_lifetime: float = 7200.0,
+                 seed: int = 0):
+        """
+        :param host: Interface to listen on.
+        :param port: Port to listen on (0 picks a free one).
+        :param latency: Seconds every request takes.
+        :param jitter: Up to this many seconds are added to the latency at random.
+        :param pages: Number of pages of every cursor chain.
+        :param rate_limit: Requests allowed per window (None for no limit).
+        :param rate_limit_window: Length of the rate limit window, in seconds.
+        :param error_rate: Share of requests failed at random (0 to 1).
+        :param error_statuses: HTTP statuses random failures are drawn from.
+        :param accounts: {username: password} accepted by createSession (any when omitted).
+        :param access_token_lifetime: Seconds until issued access tokens expire.
+        :param seed: Seed of the random latency jitter and failures.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = pages
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.accounts = accounts
+        self.access_token_lifetime = access_token_lifetime
+        self.requests = Counter()
+        self.statuses = Counter()
+        self._random = random.Random(seed)
+        self._injected = deque()
+        self._window_start = time.time()
+        self._window_used = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to BskyApiClient(base_url=...)."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeXrpcServer":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-xrpc", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "FakeXrpcServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def inject(self, status: int, count: int = 1, method: str = None, retry_after: float = None):
+        """
+        Fail the next `count` requests (to `method`, if given) with `status`.
+
+        :param status: HTTP status to answer with, e.g. 429 or 503.
+        :param count: Number of requests to fail.
+        :param method: XRPC method the failures apply to, e.g. "app.bsky.graph.getFollowers".
+        :param retry_after: Retry-After header sent with the failures, in seconds.
+        """
+        with self._lock:
+            for _ in range(count):
+                self._injected.append((status, method, retry_after))
+
+    def stats(self) -> dict:
+        """
+        :return: Requests per XRPC method and responses per HTTP status.
+        """
+        with self._lock:
+            return {"requests": dict(self.requests), "statuses": dict(self.statuses)}
+
+    def _admit(self, method: str) -> t.Tuple[t.Union[int, None], dict]:
+        """Count a request against the rate limit and decide whether it fails."""
+        with self._lock:
+            self.requests[method] += 1
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start, self._window_used = now, 0
+            self._window_used += 1
+            headers = {}
+            reset = self._window_start + self.rate_limit_window
+            if self.rate_limit is not None:
+                headers = {
+                    "ratelimit-limit": str(self.rate_limit),
+                    "ratelimit-remaining": str(max(self.rate_limit - self._window_used, 0)),
+                    "ratelimit-reset": str(int(reset)),
+                    "ratelimit-policy": f"{self.rate_limit};w={int(self.rate_limit_window)}",
+                }
+            for position, (status, target, retry_after) in enumerate(self._injected):
+                if target is None or target == method:
+                    del self._injected[position]
+                    if retry_after is not None:
+                        headers["retry-after"] = str(retry_after)
+                    return status, headers
+            if self.rate_limit is not None and self._window_used > self.rate_limit:
+                headers["retry-after"] = str(max(int(reset - now), 1))
+                return 429, headers
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self._random.choice(self.error_statuses), headers
+            return None, headers
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+
+    def _page(self, params: dict) -> t.Tuple[t.List[int], t.Union[str, None]]:
+        """Positions of the records on the requested page, and the next cursor."""
+        limit = min(int(params.get("limit", ["50"])[0]), 100)
+        page = int(params.get("cursor", ["0"])[0] or 0)
+        start = page * limit
+        cursor = str(page + 1) if page + 1 < self.pages else None
+        return list(range(start, start + limit)), cursor
+
+    def _session(self, handle: str) -> dict:
+        handle = handle.lower()
+        did = _did(handle)
+        return {
+            "did": did,
+            "handle": handle,
+            "accessJwt": _jwt(did, "com.atproto.access", self.access_token_lifetime),
+            "refreshJwt": _jwt(did, "com.atproto.refresh", 90 * 24 * 3600),
+            "active": True,
+        }
+
+    def _respond(self, method: str, params: dict, body: dict, authorization: str) -> t.Tuple[int, dict]:
+        """Answer an XRPC call; returns the status and JSON body."""
+        if method == "com.atproto.server.createSession":
+            identifier, password = body.get("identifier", ""), body.get("password", "")
+            if self.accounts is not None and self.accounts.get(identifier) != password:
+                return 401, {"error": "AuthenticationRequired", "message": "Invalid identifier or password"}
+            return 200, self._session(identifier)
+        if not authorization.startswith("Bearer "):
+            return 401, {"error": "AuthenticationRequired", "message": "Authentication Required"}
+        subject = json.loads(base64.urlsafe_b64decode(authorization[7:].split(".")[1] + "==")).get("sub", "")
+        if method == "com.atproto.server.refreshSession":
+            session = self._session(f"{subject.split(':')[-1]}.test")
+            session["did"] = subject
+            return 200, session
+        if method == "com.atproto.server.getSession":
+            return 200, {"did": subject, "handle": f"{subject.split(':')[-1]}.test", "active": True}
+        if method == "app.bsky.actor.getProfile":
+            return 200, _profile(params.get("actor", [""])[0], detailed=True)
+        if method == "app.bsky.actor.getProfiles":
+            return 200, {"profiles": [_profile(actor, detailed=True) for actor in params.get("actors", [])[:25]]}
+        if method in ("app.bsky.graph.getFollowers", "app.bsky.graph.getFollows"):
+            actor = params.get("actor", [""])[0]
+            items_key = "followers" if method.endswith("Followers") else "follows"
+            positions, cursor = self._page(params)
+            response = {
+                "subject": _profile(actor),
+                items_key: [_profile(f"{items_key}-{actor}-{i}") for i in positions],
+            }
+            if cursor:
+                response["cursor"] = cursor
+            return 200, response
+        if method == "app.bsky.feed.searchPosts":
+            term = params.get("q", [""])[0]
+            positions, cursor = self._page(params)
+            response = {"posts": [self._post(term, i) for i in positions]}
+            if cursor:
+                response["cursor"] = cursor
+            return 200, response
+        return 501, {"error": "MethodNotImplemented", "message": f"Method not implemented: {method}"}
+
+    @staticmethod
+    def _post(term: str, i: int) -> dict:
+        author = _profile(f"author-{i % 97}")
+        return {
+            "uri": f"at://{author['did']}/app.bsky.feed.post/{hashlib.sha1(f'{term}{i}'.encode()).hexdigest()[:13]}",
+            "cid": f"bafyrei{hashlib.sha1(f'{term}{i}'.encode()).hexdigest()}",
+            "author": {"did": author["did"], "handle": author["handle"], "displayName": author["displayName"]},
+            "record": {"$type": "app.bsky.feed.post", "text": f"Post {i} about {term}", "createdAt": _CREATED_AT},
+            "indexedAt": _CREATED_AT,
+            "likeCount": i % 50,
+            "replyCount": i % 7,
+            "repostCount": i % 11,
+            "labels": [],
+        }
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                split = urlsplit(self.path)
+                method = split.path.rsplit("/", 1)[-1]
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                status, headers = server._admit(method)
+                delay = server._delay()
+                if delay:
+                    time.sleep(delay)
+                if status is not None:
+                    body = {"error": _ERROR_NAMES.get(status, "InternalServerError"), "message": f"Injected {status}"}
+                else:
+                    try:
+                        status, body = server._respond(method, parse_qs(split.query),
+                                                       json.loads(raw_body) if raw_body else {},
+                                                       self.headers.get("Authorization", ""))
+                    except (ValueError, IndexError) as e:
+                        status, body = 400, {"error": "InvalidRequest", "message": str(e)}
+                with server._lock:
+                    server.statuses[status] += 1
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,36 @@
+import argparse
+import json
+from bskydata.analytics import write_metrics, write_mutuals
+from bskydata.graph import AdjacencyIndex, iter_edges
+from bskydata.storage.writers import LocalJsonFileWriter
+
+# Example usage:
+# python examples/analyze_follow_graph_local.py --edges follow_graph.ndjson
+# Reads the follows written by examples/crawl_follow_graph_local.py, keeps the
+# graph index in follow_graph_index/ and writes PageRank, degree centrality and
+# communities to follow_graph_metrics.ndjson and mutual follows to follow_graph_mutuals.ndjson.
+
+
+def read_records(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(edges: str):
+    index = AdjacencyIndex.from_edges(iter_edges(read_records(edges), items_key="follows"))
+    index.save("follow_graph_index")
+    print(f"Indexed {len(index)} accounts and {index.num_edges} follows")
+    writer = LocalJsonFileWriter(ndjson=True)
+    stats = write_metrics(index, writer, destination="follow_graph_metrics.ndjson")
+    print(f"Found {stats['communities']} communities")
+    pairs = write_mutuals(index, writer, destination="follow_graph_mutuals.ndjson")
+    print(f"Found {pairs} mutual follows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute graph metrics over crawled follows.")
+    parser.add_argument("--edges", default="follow_graph.ndjson", help="NDJSON file of crawled follows.")
+    args = parser.parse_args()
+    main(args.edges)
@@ -0,0 +1,41 @@
+import argparse
+import os
+from dotenv import load_dotenv
+load_dotenv()
+from bskydata.api import BskyApiClient
+from bskydata.crawlers import Frontier, GraphCrawler
+from bskydata.storage.writers import LocalJsonFileWriter
+from bskydata.parsers import BasicFollowsParser
+
+# Example usage:
+# python examples/crawl_follow_graph_local.py --seeds stoltzmaniac.bsky.social --max-depth 2 --max-nodes 500
+# Username and Password are stored in a .env file and automatically loaded
+# Edges are appended to follow_graph.ndjson; the frontier lives in follow_graph.sqlite,
+# so stopping and re-running continues the crawl instead of starting over.
+
+
+def main(seeds: list, max_depth: int, max_nodes: int, max_edges: int):
+    print(f"Crawl the follow graph around: {seeds}")
+    client = BskyApiClient(
+        username=os.getenv("BSKY_USERNAME"),
+        password=os.getenv("BSKY_PASSWORD")
+    )
+    crawler = GraphCrawler(client,
+                           Frontier("follow_graph.sqlite"),
+                           writer=LocalJsonFileWriter(ndjson=True, append=True),
+                           parser=BasicFollowsParser(),
+                           max_depth=max_depth,
+                           max_nodes=max_nodes,
+                           max_edges_per_node=max_edges)
+    stats = crawler.run(seeds, destination="follow_graph.ndjson")
+    print(f"Crawled {stats['nodes']} accounts and stored {stats['edges']} edges: {stats['frontier']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl the follow graph around seed accounts.")
+    parser.add_argument("--seeds", nargs="+", default=[], help="Handles or DIDs to start from.")
+    parser.add_argument("--max-depth", type=int, default=2, help="Number of hops from the seeds.")
+    parser.add_argument("--max-nodes", type=int, default=None, help="Maximum number of accounts to crawl.")
+    parser.add_argument("--max-edges", type=int, default=1000, help="Maximum number of follows fetched per account.")
+    args = parser.parse_args()
+    main(args.seeds, args.max_depth, args.max_nodes, args.max_edges)
@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import os
+from dotenv import load_dotenv
+load_dotenv()
+from bskydata.api import AsyncBskyApiClient
+from bskydata.scrapers import AsyncFollowersScraper
+from bskydata.storage.writers import LocalJsonFileWriter
+from bskydata.parsers import BasicFollowersParser
+
+# Example usage:
+# python examples/store_many_followers_async_local.py --actors "stoltzmaniac.bsky.social" "bsky.app" --limit=200 --concurrency=5
+# Username and Password are stored in a .env file and automatically loaded
+# Each actor is written to followers_<actor>.json
+
+
+async def main(actors: list, limit: int, concurrency: int):
+    print(f"Store followers for the following profiles: {actors}")
+    client = AsyncBskyApiClient()
+    await client.authenticate(os.getenv("BSKY_USERNAME"), os.getenv("BSKY_PASSWORD"))
+
+    json_writer = LocalJsonFileWriter()
+    basic_parser = BasicFollowersParser()
+    scraper = AsyncFollowersScraper(client,
+                                    writer=json_writer,
+                                    parser=basic_parser)
+
+    results = await scraper.fetch_many(actors,
+                                       destination="followers_{}.json",
+                                       limit=limit,
+                                       concurrency=concurrency)
+    for result in results:
+        print(f"Scraped {len(result['followers'])} followers for {result['actor']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search for followers of many actors concurrently.")
+    parser.add_argument("--actors", nargs="+", required=True, help="Actors to process, by handle or did.")
+    parser.add_argument("--limit", type=int, default=200, help="The maximum number of followers to fetch per actor.")
+    parser.add_argument("--concurrency", type=int, default=5, help="Number of actors crawled at once.")
+    args = parser.parse_args()
+    asyncio.run(main(args.actors, args.limit, args.concurrency))
@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+from bskydata.scrapers import JetstreamScraper
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers import LocalJsonFileWriter
+from bskydata.parsers import BasicSearchTermsParser
+
+# Example usage:
+# python examples/stream_jetstream_posts_local.py --keywords python rust --max-events=500
+# No login is needed; posts are appended to jetstream_posts.ndjson as they arrive.
+# Stopping and re-running continues from the saved cursor.
+
+
+async def main(keywords: list, max_events: int):
+    print(f"Stream new posts containing: {keywords}")
+    scraper = JetstreamScraper(writer=LocalJsonFileWriter(ndjson=True, append=True),
+                               parser=BasicSearchTermsParser(),
+                               state_store=LocalStateStore(),
+                               keywords=keywords)
+    count = await scraper.run(destination="jetstream_posts.ndjson", max_events=max_events)
+    print(f"Stored {count} posts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream new posts matching keywords from Jetstream.")
+    parser.add_argument("--keywords", nargs="+", required=True, help="Keywords a post must contain.")
+    parser.add_argument("--max-events", type=int, default=500, help="The number of posts to store before stopping.")
+    args = parser.parse_args()
+    asyncio.run(main(args.keywords, args.max_events))
@@ -0,0 +1,118 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bskydata.graph import AdjacencyIndex, iter_edges
+
+
+EDGES = [
+    ("did:plc:a", "did:plc:b"),
+    ("did:plc:a", "did:plc:c"),
+    ("did:plc:b", "did:plc:a"),
+    ("did:plc:c", "did:plc:b"),
+    ("did:plc:d", "did:plc:b"),
+    ("did:plc:d", "did:plc:c"),
+    ("did:plc:a", "did:plc:b"),  # duplicate
+]
+
+
+@pytest.fixture
+def index():
+    return AdjacencyIndex.from_edges(EDGES)
+
+
+def test_from_edges_counts_duplicate_edges_once(index):
+    assert len(index) == 4
+    assert index.num_edges == 6
+    assert list(index.dids) == [b"did:plc:a", b"did:plc:b", b"did:plc:c", b"did:plc:d"]
+
+
+def test_from_edges_with_no_edges():
+    index = AdjacencyIndex.from_edges([])
+    assert len(index) == 0
+    assert index.num_edges == 0
+    assert "did:plc:a" not in index
+    assert not index.has_edge("did:plc:a", "did:plc:b")
+
+
+def test_ids_and_dids_round_trip(index):
+    assert [index.did(index.id(did)) for did in ("did:plc:a", "did:plc:d")] == ["did:plc:a", "did:plc:d"]
+    with pytest.raises(KeyError):
+        index.id("did:plc:missing")
+
+
+def test_neighbors_in_both_directions(index):
+    assert index.neighbors("did:plc:a") == ["did:plc:b", "did:plc:c"]
+    assert index.neighbors("did:plc:b", "followers") == ["did:plc:a", "did:plc:c", "did:plc:d"]
+    assert index.neighbors("did:plc:d", "followers") == []
+    with pytest.raises(ValueError):
+        index.neighbors("did:plc:a", "likes")
+
+
+def test_degrees(index):
+    assert index.degree("did:plc:a") == 2
+    assert index.degree("did:plc:b", "followers") == 3
+    assert index.degrees("follows").tolist() == [2, 1, 1, 2]
+    assert index.degrees("followers").tolist() == [1, 3, 2, 0]
+
+
+def test_has_edge_intersection_and_mutuals(index):
+    assert index.has_edge("did:plc:a", "did:plc:b")
+    assert not index.has_edge("did:plc:b", "did:plc:c")
+    assert not index.has_edge("did:plc:a", "did:plc:missing")
+    assert index.intersection("did:plc:a", "did:plc:d") == ["did:plc:b", "did:plc:c"]
+    assert index.intersection("did:plc:b", "did:plc:c", "followers") == ["did:plc:a", "did:plc:d"]
+    assert index.mutuals("did:plc:a") == ["did:plc:b"]
+    assert index.mutuals("did:plc:d") == []
+
+
+def test_save_and_memory_mapped_load(index, tmp_path):
+    index.save(tmp_path / "index")
+    loaded = AdjacencyIndex.load(tmp_path / "index", mmap=True)
+    indptr, indices = loaded.csr("follows")
+    assert isinstance(indices, np.memmap)
+    assert len(loaded) == len(index) and loaded.num_edges == index.num_edges
+    for direction in ("follows", "followers"):
+        for expected, actual in zip(index.csr(direction), loaded.csr(direction)):
+            assert np.array_equal(expected, actual)
+    assert loaded.neighbors("did:plc:b", "followers") == ["did:plc:a", "did:plc:c", "did:plc:d"]
+    assert loaded.mutuals("did:plc:b") == ["did:plc:a"]
+
+
+def test_load_into_memory(index, tmp_path):
+    index.save(tmp_path / "index")
+    loaded = AdjacencyIndex.load(tmp_path / "index", mmap=False)
+    assert not isinstance(loaded.csr("follows")[1], np.memmap)
+    assert loaded.neighbors("did:plc:a") == ["did:plc:b", "did:plc:c"]
+
+
+def test_iter_edges_from_follows_and_followers_pages():
+    follows = {"actor": "did:plc:a", "created_at": "now", "follows": [{"did": "did:plc:b"}, {"did": "did:plc:c"}]}
+    followers = {"actor": "did:plc:a", "created_at": "now", "followers": [{"did": "did:plc:d"}]}
+    assert list(iter_edges([follows, followers])) == [
+        ("did:plc:a", "did:plc:b"), ("did:plc:a", "did:plc:c"), ("did:plc:d", "did:plc:a")
+    ]
+    index = AdjacencyIndex.from_pages([follows, followers])
+    assert index.neighbors("did:plc:a", "followers") == ["did:plc:d"]
+
+
+def test_iter_edges_from_exploded_ndjson_records():
+    records = [
+        {"did": "did:plc:b", "handle": "b.test", "context": {"actor": "did:plc:a", "created_at": "now"}},
+        {"did": "did:plc:c", "handle": "c.test", "context": {"actor": "did:plc:a", "created_at": "now"}},
+    ]
+    assert list(iter_edges(records, items_key="followers")) == [
+        ("did:plc:b", "did:plc:a"), ("did:plc:c", "did:plc:a")
+    ]
+    assert list(iter_edges(records, items_key="follows")) == [
+        ("did:plc:a", "did:plc:b"), ("did:plc:a", "did:plc:c")
+    ]
+
+
+def test_iter_edges_skips_pages_without_actor_or_graph_records():
+    pages = [
+        {"follows": [{"did": "did:plc:b"}]},
+        {"search_term": "python", "posts": [{"uri": "at://x"}]},
+        {"actor": "did:plc:a", "follows": [{"handle": "no-did.test"}]},
+    ]
+    assert list(iter_edges(pages)) == []
@@ -0,0 +1,119 @@
+import itertools
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from bskydata.analytics import label_propagation, mutual_follows, pagerank, write_metrics, write_mutuals
+from bskydata.graph import AdjacencyIndex
+from bskydata.storage.writers import LocalJsonFileWriter
+
+
+def _random_edges(n: int = 40, p: float = 0.1, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    edges = [(f"did:plc:{i:02d}", f"did:plc:{j:02d}")
+             for i in range(n) for j in range(n) if i != j and rng.random() < p]
+    # A few accounts that follow nobody, so dangling rank is exercised.
+    return edges + [(f"did:plc:{i:02d}", f"did:plc:{n + i:02d}") for i in range(3)]
+
+
+def _cliques(size: int = 8) -> list:
+    """Two complete follow graphs joined by a single follow."""
+    left = [f"did:plc:l{i}" for i in range(size)]
+    right = [f"did:plc:r{i}" for i in range(size)]
+    edges = [(a, b) for group in (left, right) for a, b in itertools.permutations(group, 2)]
+    return edges + [(left[0], right[0])]
+
+
+@pytest.fixture
+def index():
+    return AdjacencyIndex.from_edges(_random_edges())
+
+
+def _dense_pagerank(index: AdjacencyIndex, alpha: float = 0.85, iterations: int = 500) -> "np.ndarray":
+    n = len(index)
+    matrix = np.zeros((n, n))
+    indptr, indices = index.csr("follows")
+    for i in range(n):
+        neighbors = indices[indptr[i]:indptr[i + 1]]
+        if len(neighbors):
+            matrix[i, neighbors] = 1.0 / len(neighbors)
+        else:
+            matrix[i, :] = 1.0 / n
+    google = alpha * matrix + (1.0 - alpha) / n
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        ranks = ranks @ google
+    return ranks / ranks.sum()
+
+
+def test_pagerank_matches_dense_power_iteration(index):
+    ranks = pagerank(index, tol=1e-15, max_iter=500)
+    assert ranks.sum() == pytest.approx(1.0)
+    assert np.abs(ranks - _dense_pagerank(index)).max() < 1e-11
+
+
+def test_pagerank_default_tolerance_is_close(index):
+    assert np.abs(pagerank(index) - _dense_pagerank(index)).max() < 1e-5
+
+
+def test_pagerank_of_an_empty_graph():
+    assert len(pagerank(AdjacencyIndex.from_edges([]))) == 0
+
+
+def test_mutual_follows_match_brute_force(index):
+    edges = set(_random_edges())
+    expected = {tuple(sorted(pair)) for pair in edges if pair[::-1] in edges}
+    a, b = mutual_follows(index)
+    assert (a < b).all()
+    assert {(index.did(i), index.did(j)) for i, j in zip(a.tolist(), b.tolist())} == expected
+    assert len(a) == len(expected)
+
+
+def test_label_propagation_recovers_planted_cliques():
+    index = AdjacencyIndex.from_edges(_cliques())
+    labels = label_propagation(index)
+    left = {labels[index.id(f"did:plc:l{i}")] for i in range(8)}
+    right = {labels[index.id(f"did:plc:r{i}")] for i in range(8)}
+    assert len(left) == len(right) == 1
+    assert left != right
+    assert sorted(set(labels.tolist())) == [0, 1]
+
+
+def test_label_propagation_is_reproducible(index):
+    assert np.array_equal(label_propagation(index, seed=3), label_propagation(index, seed=3))
+
+
+def test_write_metrics_through_json_writer(tmp_path):
+    index = AdjacencyIndex.from_edges(_cliques())
+    destination = tmp_path / "metrics.json"
+    assert write_metrics(index, LocalJsonFileWriter(), str(destination)) == {"accounts": 16, "communities": 2}
+    records = json.loads(destination.read_text())["metrics"]
+    assert len(records) == 16
+    by_did = {record["did"]: record for record in records}
+    assert by_did["did:plc:l0"]["out_degree"] == 8
+    assert by_did["did:plc:r0"]["in_degree"] == 8
+    assert sum(record["pagerank"] for record in records) == pytest.approx(1.0)
+    assert {record["community"] for record in records} == {0, 1}
+
+
+def test_write_metrics_and_mutuals_through_parquet_writer(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from bskydata.storage.writers import LocalParquetFileWriter
+
+    index = AdjacencyIndex.from_edges(_cliques(size=4))
+    writer = LocalParquetFileWriter()
+    write_metrics(index, writer, str(tmp_path / "metrics.parquet"), communities=False)
+    table = pq.read_table(tmp_path / "metrics.parquet")
+    assert table.num_rows == 8
+    # The metrics schema is fixed, so communities that were not computed are null.
+    assert table.column("community").null_count == 8
+    ranks = dict(zip(table.column("did").to_pylist(), table.column("pagerank").to_pylist()))
+    expected = pagerank(index)
+    assert all(ranks[index.did(i)] == pytest.approx(expected[i]) for i in range(len(index)))
+
+    assert write_mutuals(index, writer, str(tmp_path / "mutuals.parquet")) == 12
+    mutuals = pq.read_table(tmp_path / "mutuals.parquet")
+    assert mutuals.num_rows == 12
+    assert set(mutuals.column_names) >= {"did", "mutual_did"}
@@ -0,0 +1,50 @@
+import logging
+import threading
+import time
+import pytest
+
+pytest.importorskip("neo4j")
+
+from bskydata.builders.network.search_and_follower_neo4j import BuildNetworkSearchAndFollowsNeo4j
+
+
+class StubBuilder(BuildNetworkSearchAndFollowsNeo4j):
+    """The builder without its Bluesky and Neo4j connections; follows come from a stub crawl."""
+    def __init__(self, failing=(), delay: float = 0.0, max_workers: int = 2):
+        self.max_workers = max_workers
+        self.follows_limit = 10
+        self.failing = set(failing)
+        self.delay = delay
+        self.crawled = []
+        self._lock = threading.Lock()
+
+    def _scrape_follow_edges(self, actor_profile, limit=2000):
+        with self._lock:
+            self.crawled.append(actor_profile["did"])
+        time.sleep(self.delay)
+        if actor_profile["did"] in self.failing:
+            raise ConnectionError("connection reset")
+        return [{"actor_did": actor_profile["did"], "did": f"{actor_profile['did']}-follow-{i}"} for i in range(3)]
+
+
+def _profiles(n: int) -> list:
+    return [{"did": f"did:plc:{i}", "handle": f"user{i}.test"} for i in range(n)]
+
+
+def test_failed_accounts_are_logged_and_skipped(caplog):
+    builder = StubBuilder(failing={"did:plc:1", "did:plc:3"})
+    with caplog.at_level(logging.ERROR, logger="bskydata.builders.network.search_and_follower_neo4j"):
+        edges = list(builder._iter_follow_edges(_profiles(5)))
+    assert sorted({edge["actor_did"] for edge in edges}) == ["did:plc:0", "did:plc:2", "did:plc:4"]
+    assert len(edges) == 9
+    assert sorted(record.args[0] for record in caplog.records) == ["did:plc:1", "did:plc:3"]
+
+
+def test_stopping_early_cancels_pending_crawls():
+    builder = StubBuilder(delay=0.01, max_workers=1)
+    edges = builder._iter_follow_edges(_profiles(20))
+    next(edges)
+    edges.close()
+    crawled = len(builder.crawled)
+    time.sleep(0.05)
+    assert len(builder.crawled) == crawled < 20
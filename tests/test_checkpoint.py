@@ -0,0 +1,134 @@
+import pytest
+from bskydata.scrapers.followers import FollowersScraper
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+from bskydata.testing.replay import ReplayBskyClient, synthetic_profiles
+
+
+class FlakyFollowersScraper(FollowersScraper):
+    """Fails the request for page number `fail_on` (counted from 1)."""
+    def __init__(self, *args, fail_on: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def _fetch_page(self, actor, cursor=None):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError("connection reset")
+        return super()._fetch_page(actor, cursor)
+
+
+class FlakyWriter(DataWriter):
+    """Fails the first `failures` writes."""
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.written = []
+
+    def write(self, data, destination=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise IOError("disk full")
+        self.written.append(data)
+
+
+PROFILES = synthetic_profiles(350)
+DIDS = [profile.did for profile in PROFILES]
+
+
+@pytest.fixture
+def client():
+    return ReplayBskyClient(followers=PROFILES, page_size=100)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalStateStore(tmp_path / "state")
+
+
+def _dids(records) -> list:
+    return [record["did"] for record in records]
+
+
+def test_truncate_records_keeps_the_first_records(store):
+    store.append_records("crawl", [{"n": i} for i in range(5)])
+    store.truncate_records("crawl", 3)
+    assert list(store.iter_records("crawl")) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    store.truncate_records("crawl", 10)
+    assert len(list(store.iter_records("crawl"))) == 3
+    store.truncate_records("crawl", 0)
+    assert list(store.iter_records("crawl")) == []
+    store.truncate_records("missing", 0)
+
+
+def test_resume_drops_records_appended_after_the_last_checkpoint(client, store, monkeypatch):
+    # Crash after the second page's records were appended but before its state was saved.
+    save = store.save
+    saves = []
+    def crashing_save(name, state):
+        if saves:
+            raise KeyboardInterrupt
+        saves.append(name)
+        save(name, state)
+    monkeypatch.setattr(store, "save", crashing_save)
+    with pytest.raises(KeyboardInterrupt):
+        FollowersScraper(client, state_store=store).fetch("alice.test", resume=True)
+    monkeypatch.setattr(store, "save", save)
+    name = saves[0]
+    assert store.load(name)["records"] == 100
+    assert len(list(store.iter_records(name))) == 200
+
+    # Fail again on the last page, so the checkpoint is still there to inspect.
+    scraper = FlakyFollowersScraper(client, state_store=store, fail_on=3)
+    with pytest.raises(ConnectionError):
+        scraper.fetch("alice.test", resume=True)
+    records = _dids(store.iter_records(name))
+    assert records == DIDS[:300]
+    assert store.load(name)["records"] == 300
+
+    result = FollowersScraper(client, state_store=store).fetch("alice.test", resume=True)
+    assert _dids(result["followers"]) == DIDS
+    assert store.load(name) is None
+    assert list(store.iter_records(name)) == []
+
+
+def test_resume_without_a_saved_state_ignores_stale_records(client, store):
+    scraper = FlakyFollowersScraper(client, state_store=store, fail_on=2)
+    name = scraper._checkpoint_name("alice.test")
+    store.append_records(name, [profile.model_dump() for profile in PROFILES[200:300]])
+    with pytest.raises(ConnectionError):
+        scraper.fetch("alice.test", resume=True)
+    assert _dids(store.iter_records(name)) == DIDS[:100]
+
+
+def test_failed_write_keeps_the_checkpoint_for_resume(client, store):
+    writer = FlakyWriter()
+    scraper = FollowersScraper(client, writer=writer, state_store=store)
+    name = scraper._checkpoint_name("alice.test")
+    with pytest.raises(IOError):
+        scraper.fetch("alice.test", resume=True)
+    assert store.load(name)["done"] is True
+    assert _dids(store.iter_records(name)) == DIDS
+
+    requests = client.requests
+    result = scraper.fetch("alice.test", resume=True)
+    assert client.requests == requests
+    assert _dids(result["followers"]) == DIDS
+    assert _dids(writer.written[0]["followers"]) == DIDS
+    assert store.load(name) is None
+    assert list(store.iter_records(name)) == []
+
+
+def test_finished_crawl_stopped_by_limit_is_not_continued_on_resume(client, store):
+    scraper = FollowersScraper(client, writer=FlakyWriter(), state_store=store)
+    with pytest.raises(IOError):
+        scraper.fetch("alice.test", limit=150, resume=True)
+    requests = client.requests
+    assert _dids(scraper.fetch("alice.test", limit=150, resume=True)["followers"]) == DIDS[:200]
+    assert client.requests == requests
+
+
+def test_iter_pages_drops_the_checkpoint_once_consumed(client, store):
+    scraper = FollowersScraper(client, state_store=store)
+    assert sum(len(page["followers"]) for page in scraper.iter_pages("alice.test", resume=True)) == 350
+    assert store.load(scraper._checkpoint_name("alice.test")) is None
@@ -0,0 +1,99 @@
+import json
+import os
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from bskydata.storage.writers.cloud.aws import MIN_PART_SIZE, S3JsonDataWriter
+from bskydata.storage.writers.cloud.base import CloudDataWriter, iter_parts
+
+
+BUCKET = "bskydata-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _writer(**kwargs):
+    return S3JsonDataWriter("access", "secret", BUCKET, **kwargs)
+
+
+def _read(s3, key: str) -> bytes:
+    return s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+
+def test_iter_parts_rechunks_text_and_bytes():
+    assert list(iter_parts(["ab", b"cde", "f"], part_size=2)) == [b"ab", b"cd", b"ef"]
+    assert list(iter_parts([], part_size=2)) == []
+
+
+def test_small_payload_is_a_single_put(s3):
+    _writer().upload_stream(['{"a": ', b"1}"], "small.json")
+    assert _read(s3, "small.json") == b'{"a": 1}'
+
+
+def test_json_writer_round_trip(s3):
+    data = {"actor": "alice.test", "followers": [{"did": f"did:plc:{i}"} for i in range(100)]}
+    _writer().write(data, "followers.json")
+    assert json.loads(_read(s3, "followers.json")) == data
+
+
+def test_multipart_upload_round_trip(s3):
+    chunks = [os.urandom(1024 * 1024) for _ in range(12)]
+    _writer(part_size=MIN_PART_SIZE).upload_stream(iter(chunks), "large.bin")
+    head = s3.head_object(Bucket=BUCKET, Key="large.bin")
+    assert _read(s3, "large.bin") == b"".join(chunks)
+    # 12 MiB in 5 MiB parts: S3 reports multipart ETags as "<md5>-<number of parts>".
+    assert head["ETag"].strip('"').endswith("-3")
+
+
+def test_failed_multipart_upload_is_aborted(s3, monkeypatch):
+    writer = _writer(part_size=MIN_PART_SIZE)
+    upload_part = writer.s3_client.upload_part
+    calls = {"parts": 0}
+
+    def flaky_upload_part(**kwargs):
+        calls["parts"] += 1
+        if calls["parts"] == 2:
+            raise IOError("connection reset")
+        return upload_part(**kwargs)
+
+    monkeypatch.setattr(writer.s3_client, "upload_part", flaky_upload_part)
+    with pytest.raises(IOError):
+        writer.upload_stream(iter([b"x" * MIN_PART_SIZE] * 3), "broken.bin")
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert s3.list_objects_v2(Bucket=BUCKET).get("KeyCount") == 0
+
+
+def test_part_size_below_s3_minimum_is_rejected(s3):
+    with pytest.raises(ValueError):
+        _writer(part_size=MIN_PART_SIZE - 1)
+
+
+def test_default_upload_stream_spools_to_upload():
+    class FileCloudWriter(CloudDataWriter):
+        def __init__(self):
+            self.uploaded = {}
+
+        def authenticate(self, **kwargs):
+            pass
+
+        def upload(self, file_path, destination, **kwargs):
+            with open(file_path, "rb") as f:
+                self.uploaded[destination] = (file_path, f.read())
+
+        def write(self, data, destination=None, **kwargs):
+            self.upload_stream([json.dumps(data)], destination)
+
+    writer = FileCloudWriter()
+    writer.write({"a": 1}, "out.json")
+    temp_path, content = writer.uploaded["out.json"]
+    assert json.loads(content) == {"a": 1}
+    assert not os.path.exists(temp_path)
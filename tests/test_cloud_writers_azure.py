@@ -0,0 +1,105 @@
+import json
+import os
+import pytest
+
+pytest.importorskip("azure.storage.blob")
+
+from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError
+from bskydata.storage.writers.cloud import azure
+from bskydata.storage.writers.cloud.azure import AzureJsonDataWriter
+
+
+KIB = 1024
+
+
+class FakeBlobClient:
+    """Keeps committed and staged (uncommitted) blocks the way a block blob does."""
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+        self.staged = {}
+        self.fail_on_block = None
+
+    def upload_blob(self, data, overwrite=False, content_settings=None):
+        self.container.blobs[self.name] = (bytes(data), content_settings.content_type)
+
+    def stage_block(self, block_id, data):
+        if len(self.staged) == self.fail_on_block:
+            raise ServiceRequestError("connection reset")
+        self.staged[block_id] = bytes(data)
+
+    def commit_block_list(self, block_list, content_settings=None):
+        data = b"".join(self.staged[block.id] for block in block_list)
+        # Committing discards every staged block left out of the list.
+        self.staged = {}
+        self.container.blobs[self.name] = (data, content_settings.content_type if content_settings else None)
+
+    def get_blob_properties(self):
+        if self.name not in self.container.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return {"size": len(self.container.blobs[self.name][0])}
+
+    def delete_blob(self):
+        self.container.blobs.pop(self.name)
+
+
+class FakeContainer:
+    def __init__(self):
+        self.blobs = {}
+        self.clients = {}
+
+
+class FakeBlobServiceClient:
+    def __init__(self):
+        self.containers = {}
+
+    def get_blob_client(self, container, blob):
+        container = self.containers.setdefault(container, FakeContainer())
+        return container.clients.setdefault(blob, FakeBlobClient(container, blob))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = FakeBlobServiceClient()
+    monkeypatch.setattr(azure.BlobServiceClient, "from_connection_string", staticmethod(lambda value: service))
+    return service
+
+
+def _writer(**kwargs):
+    return AzureJsonDataWriter("UseDevelopmentStorage=true", "container", **kwargs)
+
+
+def test_small_payload_is_a_single_upload(service):
+    AzureJsonDataWriter("UseDevelopmentStorage=true", "container").write({"a": 1}, "small.json")
+    data, content_type = service.containers["container"].blobs["small.json"]
+    assert json.loads(data) == {"a": 1}
+    assert content_type == "application/json"
+
+
+def test_large_payload_is_staged_in_blocks(service):
+    chunks = [os.urandom(100 * KIB) for _ in range(8)]
+    _writer(part_size=256 * KIB).upload_stream(iter(chunks), "large.bin", content_type="application/octet-stream")
+    container = service.containers["container"]
+    assert container.blobs["large.bin"] == (b"".join(chunks), "application/octet-stream")
+    assert container.clients["large.bin"].staged == {}
+
+
+def test_failed_block_upload_leaves_no_blob_or_staged_blocks(service):
+    client = service.get_blob_client("container", "large.bin")
+    client.fail_on_block = 2
+    with pytest.raises(ServiceRequestError):
+        _writer(part_size=256 * KIB).upload_stream(iter([os.urandom(256 * KIB)] * 4), "large.bin")
+    assert service.containers["container"].blobs == {}
+    assert client.staged == {}
+
+
+def test_failed_block_upload_keeps_the_existing_blob(service):
+    service.containers.setdefault("container", FakeContainer()).blobs["large.bin"] = (b"previous crawl", "application/json")
+
+    def chunks():
+        yield os.urandom(600 * KIB)
+        raise ConnectionError("crawl failed")
+
+    with pytest.raises(ConnectionError):
+        _writer(part_size=256 * KIB).upload_stream(chunks(), "large.bin")
+    assert service.containers["container"].blobs["large.bin"] == (b"previous crawl", "application/json")
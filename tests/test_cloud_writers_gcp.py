@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import pytest
+
+storage = pytest.importorskip("google.cloud.storage")
+
+from bskydata.storage.writers.cloud.gcp import GCPJsonDataWriter
+
+
+KIB = 1024
+
+
+class FakeBlobWriter(io.BytesIO):
+    """Stands in for the resumable BlobWriter returned by Blob.open("wb")."""
+    def __init__(self, blob, chunk_size, content_type):
+        super().__init__()
+        self.blob = blob
+        self.chunk_size = chunk_size
+        self.content_type = content_type
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Like BlobWriter: finish the upload on success, cancel it on an error.
+        if exc_type is None:
+            self.blob.bucket.objects[self.blob.name] = (self.getvalue(), self.content_type)
+        self.blob.bucket.uploads.append(("resumable", self.chunk_size, exc_type is None))
+        self.close()
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.objects[self.name] = (bytes(data), content_type)
+        self.bucket.uploads.append(("single", None, True))
+
+    def open(self, mode, chunk_size=None, content_type=None):
+        assert mode == "wb"
+        return FakeBlobWriter(self, chunk_size, content_type)
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.uploads = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+class FakeStorageClient:
+    def __init__(self):
+        self.buckets = {}
+
+    def bucket(self, name):
+        return self.buckets.setdefault(name, FakeBucket())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeStorageClient()
+    monkeypatch.setattr(storage.Client, "from_service_account_json", staticmethod(lambda path: client))
+    return client
+
+
+def test_part_size_is_rounded_to_256_kib(client):
+    assert GCPJsonDataWriter("key.json", "bucket", part_size=600 * KIB).part_size == 512 * KIB
+    assert GCPJsonDataWriter("key.json", "bucket", part_size=1).part_size == 256 * KIB
+
+
+def test_small_payload_is_a_single_upload(client):
+    GCPJsonDataWriter("key.json", "bucket").write({"a": 1}, "small.json")
+    bucket = client.bucket("bucket")
+    data, content_type = bucket.objects["small.json"]
+    assert json.loads(data) == {"a": 1}
+    assert content_type == "application/json"
+    assert bucket.uploads == [("single", None, True)]
+
+
+def test_large_payload_goes_through_a_resumable_upload(client):
+    chunks = [os.urandom(100 * KIB) for _ in range(8)]
+    writer = GCPJsonDataWriter("key.json", "bucket", part_size=256 * KIB)
+    writer.upload_stream(iter(chunks), "large.bin", content_type="application/octet-stream")
+    bucket = client.bucket("bucket")
+    assert bucket.objects["large.bin"] == (b"".join(chunks), "application/octet-stream")
+    assert bucket.uploads == [("resumable", 256 * KIB, True)]
+
+
+def test_json_writer_pages_round_trip(client):
+    pages = [{"actor": "alice.test", "followers": [{"did": f"did:plc:{p}-{i}", "bio": "x" * 200} for i in range(500)]}
+             for p in range(4)]
+    GCPJsonDataWriter("key.json", "bucket", part_size=256 * KIB).write_pages(
+        pages, "followers.json", items_key="followers"
+    )
+    data, _ = client.bucket("bucket").objects["followers.json"]
+    assert len(data) > 256 * KIB
+    assert json.loads(data)["followers"] == [item for page in pages for item in page["followers"]]
+
+
+def test_failed_stream_cancels_the_resumable_upload(client):
+    def chunks():
+        yield os.urandom(300 * KIB)
+        yield os.urandom(300 * KIB)
+        raise ConnectionError("crawl failed")
+
+    with pytest.raises(ConnectionError):
+        GCPJsonDataWriter("key.json", "bucket", part_size=256 * KIB).upload_stream(chunks(), "large.bin")
+    bucket = client.bucket("bucket")
+    assert bucket.objects == {}
+    assert bucket.uploads == [("resumable", 256 * KIB, False)]
@@ -0,0 +1,220 @@
+import json
+import pytest
+from bskydata.api.client import BskyApiClient
+from bskydata.api.rate_limit import RateLimiter
+from bskydata.crawlers import Frontier, GraphCrawler
+from bskydata.storage.writers import LocalJsonFileWriter
+from bskydata.storage.writers.base import DataWriter
+from bskydata.testing.xrpc import FakeXrpcServer
+
+
+class PageWriter(DataWriter):
+    def __init__(self):
+        self.pages = []
+
+    def write(self, data, destination=None, **kwargs):
+        self.pages.append(data)
+
+    def write_pages(self, pages, destination=None, items_key=None, **kwargs):
+        self.pages.extend(pages)
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = Frontier(tmp_path / "frontier.sqlite")
+    yield frontier
+    frontier.close()
+
+
+def test_add_reports_new_accounts_and_counts_membership(frontier):
+    assert frontier.add(["a", "b", "a"], depth=0) == 2
+    assert frontier.add(["b", "c"], depth=1) == 1
+    assert "c" in frontier and "z" not in frontier
+    assert len(frontier) == 3
+
+
+def test_bfs_claims_shallowest_first_then_in_discovery_order(frontier):
+    frontier.add(["a", "b"], depth=1)
+    frontier.add(["c", "d"], depth=2)
+    frontier.add(["e"], depth=0)
+    # Rediscovering a queued account closer to the seeds moves it up.
+    frontier.add(["d"], depth=1)
+    assert [did for did, _ in frontier.claim(limit=10)] == ["e", "a", "b", "d", "c"]
+
+
+def test_priority_claims_most_discovered_first(tmp_path):
+    frontier = Frontier(tmp_path / "frontier.sqlite", strategy="priority")
+    frontier.add(["a", "b", "c"], depth=1)
+    frontier.add(["c"], depth=1)
+    frontier.add(["b"], depth=2)
+    frontier.add(["b"], depth=2)
+    assert frontier.claim(limit=3) == [("b", 1), ("c", 1), ("a", 1)]
+    frontier.close()
+
+
+def test_unknown_strategy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Frontier(tmp_path / "frontier.sqlite", strategy="dfs")
+
+
+def test_claim_respects_max_depth(frontier):
+    frontier.add(["s"], depth=0)
+    frontier.add([f"a{i}" for i in range(5)], depth=1)
+    frontier.add([f"b{i}" for i in range(5)], depth=2)
+    assert [did for did, _ in frontier.claim(limit=100, max_depth=2)] == ["s", "a0", "a1", "a2", "a3", "a4"]
+
+
+def test_claim_respects_per_depth_caps_across_calls(frontier):
+    frontier.add(["s"], depth=0)
+    frontier.add([f"a{i}" for i in range(5)], depth=1)
+    frontier.add([f"b{i}" for i in range(5)], depth=2)
+    assert len(frontier.claim(limit=100, max_per_depth=2)) == 5
+    assert frontier.claim(limit=100, max_per_depth=2) == []
+
+    for did, _ in frontier.claim(limit=100, max_per_depth={1: 3}):
+        frontier.complete(did)
+    # Depth 1 had 2 of its 3 slots taken; depth 2 is uncapped in the dictionary.
+    assert frontier.stats()["crawled"] == 4
+
+
+def test_claim_respects_max_nodes_including_finished_accounts(frontier):
+    frontier.add([f"a{i}" for i in range(10)], depth=0)
+    first = frontier.claim(limit=3, max_nodes=5)
+    frontier.complete(first[0][0])
+    frontier.fail(first[1][0])
+    assert len(frontier.claim(limit=10, max_nodes=5)) == 2
+    assert frontier.claim(limit=10, max_nodes=5) == []
+
+
+def test_failed_and_completed_accounts_are_not_handed_out_again(frontier):
+    frontier.add(["a", "b"], depth=0)
+    for did, _ in frontier.claim(limit=2):
+        frontier.fail(did) if did == "a" else frontier.complete(did)
+    frontier.add(["a", "b"], depth=0)
+    assert frontier.claim(limit=10) == []
+    assert frontier.stats() == {"queued": 0, "in_progress": 0, "crawled": 1, "failed": 1}
+
+
+def test_in_progress_accounts_are_queued_again_on_reopen(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    frontier = Frontier(path)
+    frontier.add(["a", "b", "c"], depth=0)
+    claimed = frontier.claim(limit=2)
+    frontier.complete(claimed[0][0])
+    assert frontier.stats()["in_progress"] == 1
+    frontier.close()
+
+    reopened = Frontier(path)
+    assert reopened.stats() == {"queued": 2, "in_progress": 0, "crawled": 1, "failed": 0}
+    assert [did for did, _ in reopened.claim(limit=10)] == [claimed[1][0], "c"]
+    reopened.close()
+
+
+@pytest.fixture
+def server():
+    with FakeXrpcServer(pages=1) as server:
+        yield server
+
+
+def _client(server) -> BskyApiClient:
+    return BskyApiClient("crawler.test", "password", base_url=server.url,
+                         rate_limiter=RateLimiter(rate=1000, capacity=100, max_rate=1000))
+
+
+def test_crawler_follows_the_graph_to_max_depth(server, frontier):
+    writer = PageWriter()
+    crawler = GraphCrawler(_client(server), frontier, writer=writer, max_depth=2, max_per_depth={1: 5})
+    result = crawler.run(["Seed.Test"])
+    assert result["nodes"] == 6
+    assert result["edges"] == 600
+    assert result["failed"] == 0
+    # The seed's 100 follows plus 100 follows of each of the 5 crawled ones.
+    assert result["frontier"] == {"queued": 95 + 500, "in_progress": 0, "crawled": 6, "failed": 0}
+    actors = [page["actor"] for page in writer.pages]
+    assert len(set(actors)) == 6
+    assert actors[0].startswith("did:plc:")
+
+
+def test_crawler_resumes_without_crawling_accounts_twice(server, tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    writer = PageWriter()
+    first = Frontier(path)
+    assert GraphCrawler(_client(server), first, writer=writer, max_nodes=3).run(["seed.test"])["nodes"] == 3
+    first.close()
+
+    second = Frontier(path)
+    result = GraphCrawler(_client(server), second, writer=writer, max_nodes=8).run()
+    second.close()
+    assert result["nodes"] == 5
+    actors = [page["actor"] for page in writer.pages]
+    assert len(actors) == len(set(actors)) == 8
+
+
+def test_crawler_caps_edges_per_account(frontier):
+    with FakeXrpcServer(pages=10) as server:
+        crawler = GraphCrawler(_client(server), frontier, max_depth=1, max_edges_per_node=150)
+        result = crawler.run(["seed.test"])
+    assert result["nodes"] == 1
+    # The limit is approximate: crawling stops after the page that passes it.
+    assert 150 <= result["edges"] <= 150 + crawler.scraper.page_size
+
+
+def test_crawler_marks_accounts_failed_after_max_attempts(server, frontier):
+    server.inject(500, count=3, method="app.bsky.graph.getFollowers")
+    crawler = GraphCrawler(_client(server), frontier, direction="followers", max_depth=1, max_attempts=3)
+    result = crawler.run(["seed.test"])
+    assert result["retried"] == 2
+    assert result["failed"] == 1
+    assert result["frontier"]["failed"] == 1
+
+
+def test_crawler_retries_transient_failures(server, frontier):
+    server.inject(503, count=2, method="app.bsky.graph.getFollowers")
+    writer = PageWriter()
+    crawler = GraphCrawler(_client(server), frontier, writer=writer, direction="followers", max_depth=1)
+    result = crawler.run(["seed.test"])
+    assert result["retried"] == 2
+    assert result["failed"] == 0
+    assert result["nodes"] == 1 and result["edges"] == 100
+    assert result["frontier"]["crawled"] == 1
+
+
+def test_retry_requeues_until_max_attempts(frontier):
+    frontier.add(["a"], depth=0)
+    for _ in range(2):
+        assert frontier.claim() == [("a", 0)]
+        assert frontier.retry("a", max_attempts=3)
+    assert frontier.claim() == [("a", 0)]
+    assert not frontier.retry("a", max_attempts=3)
+    assert frontier.claim() == []
+    assert frontier.stats()["failed"] == 1
+
+
+def test_every_account_is_written_with_its_own_actor(server, frontier, tmp_path):
+    crawler = GraphCrawler(_client(server), frontier, writer=LocalJsonFileWriter(), max_depth=1)
+    result = crawler.run(["did:plc:one", "did:plc:two"], destination=str(tmp_path / "follows_{}.json"))
+    assert result["nodes"] == 2
+    for did in ("did:plc:one", "did:plc:two"):
+        written = json.loads((tmp_path / f"follows_{did}.json").read_text())
+        assert written["actor"] == did
+        assert len(written["follows"]) == 100
+        assert all(f"-{did.replace(':', '-')}-" in follow["handle"] for follow in written["follows"])
+
+
+def test_appending_writer_keeps_the_actor_of_every_edge(server, frontier, tmp_path):
+    destination = tmp_path / "follows.ndjson"
+    writer = LocalJsonFileWriter(ndjson=True, append=True)
+    GraphCrawler(_client(server), frontier, writer=writer, max_depth=1).run(
+        ["did:plc:one", "did:plc:two"], destination=str(destination)
+    )
+    records = [json.loads(line) for line in destination.read_text().splitlines()]
+    assert len(records) == 200
+    assert all(f"-{record['context']['actor'].replace(':', '-')}-" in record["handle"] for record in records)
+    assert {record["context"]["actor"] for record in records} == {"did:plc:one", "did:plc:two"}
+
+
+def test_seed_handles_resolve_regardless_of_case(server, frontier):
+    crawler = GraphCrawler(_client(server), frontier, max_depth=0)
+    assert crawler.add_seeds(["did:plc:known", "Mixed.Case.Test"]) == 2
+    assert "did:plc:known" in frontier
+    assert crawler.add_seeds(["mixed.case.test"]) == 0
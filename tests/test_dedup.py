@@ -0,0 +1,116 @@
+import pytest
+from bskydata.parsers.profiles.basic import BasicFollowersParser
+from bskydata.scrapers.followers import FollowersScraper
+from bskydata.storage.dedup import DedupIndex, record_key
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+from bskydata.storage.writers.dedup import DeduplicatingWriter
+from bskydata.testing.replay import ReplayBskyClient, synthetic_profiles
+
+
+class RecordingWriter(DataWriter):
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.written = []
+
+    def write(self, data, destination=None, **kwargs):
+        if self.fail:
+            raise IOError("disk full")
+        self.written.append(data)
+
+
+@pytest.fixture
+def client():
+    return ReplayBskyClient(followers=synthetic_profiles(250), page_size=100)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(tmp_path / "dedup.sqlite")
+    yield index
+    index.close()
+
+
+def test_fetch_skips_records_stored_by_earlier_crawls(client, index):
+    first = FollowersScraper(client, writer=RecordingWriter(), dedup_index=index).fetch("alice.test")
+    second = FollowersScraper(client, writer=RecordingWriter(), dedup_index=index).fetch("alice.test")
+    assert len(first["followers"]) == 250
+    assert second["followers"] == []
+    assert len(index) == 250
+
+
+def test_failed_write_does_not_mark_records_as_stored(client, index):
+    with pytest.raises(IOError):
+        FollowersScraper(client, writer=RecordingWriter(fail=True), dedup_index=index).fetch("alice.test")
+    assert len(index) == 0
+
+    writer = RecordingWriter()
+    result = FollowersScraper(client, writer=writer, dedup_index=index).fetch("alice.test")
+    assert len(result["followers"]) == 250
+    assert len(writer.written[0]["followers"]) == 250
+    assert len(index) == 250
+
+
+def test_failed_stream_does_not_mark_records_as_stored(client, index):
+    with pytest.raises(IOError):
+        FollowersScraper(client, writer=RecordingWriter(fail=True), dedup_index=index).stream("alice.test")
+    assert len(index) == 0
+    assert FollowersScraper(client, writer=RecordingWriter(), dedup_index=index).stream("alice.test") == 250
+
+
+def test_duplicates_within_a_crawl_are_dropped(index):
+    profiles = synthetic_profiles(50)
+    client = ReplayBskyClient(followers=profiles + profiles, page_size=40)
+    result = FollowersScraper(client, dedup_index=index).fetch("alice.test")
+    assert len(result["followers"]) == 50
+
+
+def test_iter_pages_marks_records_once_consumed(client, index):
+    pages = FollowersScraper(client, dedup_index=index).iter_pages("alice.test")
+    next(pages)
+    assert len(index) == 0
+    next(pages)
+    assert len(index) == 100
+
+
+def _subject_did(client, actor: str) -> str:
+    return client._subject(actor).did
+
+
+def test_edges_are_keyed_on_the_actor_did():
+    item = {"did": "did:plc:follower"}
+    assert record_key(item, "followers", {"actor": "alice.test", "actor_did": "did:plc:alice"}) == \
+        ("edge", "did:plc:follower did:plc:alice")
+    assert record_key(item, "follows", {"actor": "did:plc:alice"}) == ("edge", "did:plc:alice did:plc:follower")
+    # A handle alone may name another account by the next crawl.
+    assert record_key(item, "followers", {"actor": "alice.test"}) is None
+
+
+def test_crawls_by_handle_and_by_did_share_edges(client, index):
+    first = FollowersScraper(client, writer=RecordingWriter(), dedup_index=index).fetch("Alice.test")
+    did = _subject_did(client, "alice.test")
+    assert first["actor_did"] == did
+    assert FollowersScraper(client, dedup_index=index).fetch(did)["followers"] == []
+    assert FollowersScraper(client, dedup_index=index).fetch("alice.test")["followers"] == []
+    assert len(index) == 250
+
+
+def test_resumed_records_are_keyed_on_the_actor_did(client, index, tmp_path):
+    store = LocalStateStore(tmp_path / "state")
+    with pytest.raises(IOError):
+        FollowersScraper(client, writer=RecordingWriter(fail=True), state_store=store,
+                         dedup_index=index).fetch("alice.test", resume=True)
+    FollowersScraper(client, writer=RecordingWriter(), state_store=store,
+                     dedup_index=index).fetch("alice.test", resume=True)
+    assert len(index) == 250
+    assert FollowersScraper(client, dedup_index=index).fetch(_subject_did(client, "alice.test"))["followers"] == []
+
+
+def test_deduplicating_writer_keys_parsed_pages_on_the_actor_did(client, index):
+    parser = BasicFollowersParser()
+    writer = RecordingWriter()
+    FollowersScraper(client, writer=DeduplicatingWriter(writer, index), parser=parser).fetch("alice.test")
+    FollowersScraper(client, writer=DeduplicatingWriter(writer, index), parser=parser).fetch(
+        _subject_did(client, "alice.test")
+    )
+    assert [len(result["followers"]) for result in writer.written] == [250, 0]
@@ -0,0 +1,74 @@
+import json
+import re
+import subprocess
+import sys
+import pytest
+
+
+# Cold-import budget of the lightweight entry points, in milliseconds.
+BUDGET_MS = 150.0
+RUNS = 3
+STATEMENTS = [
+    "import bskydata.storage.writers",
+    "import bskydata.parsers",
+    "from bskydata.storage.writers import LocalJsonFileWriter",
+    "from bskydata.parsers import BasicFollowersParser",
+    "from bskydata.storage.writers import *",
+    "from bskydata.parsers import *",
+]
+# Optional SDKs that must only be imported when their writer is used.
+HEAVY_MODULES = ["boto3", "botocore", "google", "azure", "pymongo", "neo4j", "pyarrow"]
+
+_IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def _bskydata_microseconds(importtime: str) -> int:
+    """
+    Cumulative import time of bskydata, from `-X importtime` output.
+
+    Only top-level (unindented) entries count: their cumulative time already
+    includes everything they import, nested bskydata modules among them, and
+    top-level entries never overlap.
+    """
+    total = 0
+    for match in map(_IMPORT_TIME.match, importtime.splitlines()):
+        if match and not match.group(2) and match.group(3).split(".")[0] == "bskydata":
+            total += int(match.group(1))
+    return total
+
+
+def _import(statement: str) -> dict:
+    """Run `statement` in a fresh interpreter under -X importtime."""
+    probe = f"{statement}\nimport json, sys\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                             check=True, capture_output=True, text=True)
+    return {
+        "ms": _bskydata_microseconds(process.stderr) / 1000,
+        "heavy": json.loads(process.stdout.strip().splitlines()[-1]),
+    }
+
+
+def test_only_top_level_entries_are_counted():
+    importtime = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     bskydata",
+        "import time:       200 |        300 |   bskydata.storage",
+        "import time:       300 |        600 | bskydata.storage.writers",
+        "import time:        50 |       2000 |   json",
+        "import time:        70 |       4070 | bskydata.storage.handlers.json",
+        "import time:       900 |        900 | bskydatax",
+    ])
+    assert _bskydata_microseconds(importtime) == 4670
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_cold_import_stays_within_budget(statement):
+    results = [_import(statement) for _ in range(RUNS)]
+    best_ms = min(result["ms"] for result in results)
+    assert best_ms > 0, "no bskydata imports were timed"
+    assert best_ms <= BUDGET_MS, f"{statement} took {best_ms:.1f} ms (budget {BUDGET_MS} ms)"
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_cold_import_does_not_load_optional_sdks(statement):
+    assert _import(statement)["heavy"] == []
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from bskydata.scrapers.jetstream import JetstreamScraper, POST_COLLECTION
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers import LocalJsonFileWriter
+from bskydata.storage.writers.base import DataWriter
+from bskydata.testing.jetstream import ReplayJetstreamServer
+
+
+BASE_TIME_US = 1_732_000_000_000_000
+
+
+def _frame(i: int, text: str = "hello", did: str = None, collection: str = POST_COLLECTION,
+           operation: str = "create") -> dict:
+    return {
+        "did": did or f"did:plc:{i % 3}",
+        "time_us": BASE_TIME_US + i * 1_000_000,
+        "kind": "commit",
+        "commit": {
+            "rev": f"rev{i}",
+            "operation": operation,
+            "collection": collection,
+            "rkey": f"rkey{i}",
+            "cid": f"bafyrei{i}",
+            "record": {"$type": collection, "text": f"{text} {i}", "createdAt": "2024-11-20T12:00:00.000Z"},
+        },
+    }
+
+
+def _collect(scraper: JetstreamScraper, frames: list, max_events: int = None, **server_options):
+    async def main():
+        async with ReplayJetstreamServer(frames, **server_options) as server:
+            scraper.url = server.url
+            pages = [page async for page in scraper.iter_pages(max_events=max_events)]
+            return pages, server.requests
+    return asyncio.run(main())
+
+
+def _rkeys(pages: list) -> list:
+    return [post["uri"].rsplit("/", 1)[1] for page in pages for post in page["posts"]]
+
+
+def test_filters_by_keyword_operation_collection_and_did():
+    frames = [
+        _frame(0, "I love Python"),
+        _frame(1, "rust is fine"),
+        _frame(2, "python again", operation="delete"),
+        _frame(3, "python like", collection="app.bsky.feed.like"),
+        {"did": "did:plc:0", "time_us": BASE_TIME_US + 4_000_000, "kind": "identity", "identity": {}},
+        _frame(5, "PYTHON shouting", did="did:plc:other"),
+        _frame(6, "python", did="did:plc:kept"),
+    ]
+    pages, _ = _collect(JetstreamScraper(keywords=["python"], reconnect=False), frames)
+    assert _rkeys(pages) == ["rkey0", "rkey5", "rkey6"]
+
+    pages, requests = _collect(JetstreamScraper(dids=["did:plc:kept"], reconnect=False), frames)
+    assert _rkeys(pages) == ["rkey6"]
+    assert requests[0]["wantedDids"] == ["did:plc:kept"]
+
+
+def test_posts_are_shaped_like_post_views():
+    pages, _ = _collect(JetstreamScraper(reconnect=False), [_frame(0, "hi")])
+    post = pages[0]["posts"][0]
+    assert post["uri"] == f"at://did:plc:0/{POST_COLLECTION}/rkey0"
+    assert post["record"]["text"] == "hi 0"
+    assert post["indexed_at"].endswith("Z")
+
+
+def test_pages_are_flushed_at_batch_size():
+    pages, _ = _collect(JetstreamScraper(batch_size=10, reconnect=False), [_frame(i) for i in range(25)])
+    assert [len(page["posts"]) for page in pages] == [10, 10, 5]
+
+
+def test_partial_pages_are_flushed_after_flush_interval():
+    scraper = JetstreamScraper(batch_size=100, flush_interval=0.05, reconnect=False)
+    pages, _ = _collect(scraper, [_frame(i) for i in range(4)], delay=0.2)
+    assert len(pages) >= 3
+    assert _rkeys(pages) == [f"rkey{i}" for i in range(4)]
+
+
+def test_cursor_is_saved_and_resumed_with_rewind(tmp_path):
+    store = LocalStateStore(tmp_path / "state")
+    frames = [_frame(i) for i in range(20)]
+    scraper = JetstreamScraper(state_store=store, batch_size=5, rewind=2.0, reconnect=False)
+    pages, _ = _collect(scraper, frames, max_events=10)
+    assert _rkeys(pages) == [f"rkey{i}" for i in range(10)]
+    assert store.load("jetstream-cursor") == {"cursor": frames[9]["time_us"]}
+
+    resumed = JetstreamScraper(state_store=store, batch_size=5, rewind=2.0, reconnect=False)
+    pages, requests = _collect(resumed, frames)
+    assert requests[0]["cursor"] == [str(frames[7]["time_us"])]
+    assert _rkeys(pages) == [f"rkey{i}" for i in range(7, 20)]
+    assert store.load("jetstream-cursor") == {"cursor": frames[19]["time_us"]}
+
+
+def test_resume_false_ignores_the_saved_cursor(tmp_path):
+    store = LocalStateStore(tmp_path / "state")
+    store.save("jetstream-cursor", {"cursor": BASE_TIME_US + 5_000_000})
+    scraper = JetstreamScraper(state_store=store, reconnect=False)
+
+    async def main():
+        async with ReplayJetstreamServer([_frame(i) for i in range(3)]) as server:
+            scraper.url = server.url
+            return [page async for page in scraper.iter_pages(resume=False)], server.requests
+
+    pages, requests = asyncio.run(main())
+    assert "cursor" not in requests[0]
+    assert _rkeys(pages) == ["rkey0", "rkey1", "rkey2"]
+
+
+def test_reconnects_after_dropped_connection():
+    frames = [_frame(i) for i in range(10)]
+    scraper = JetstreamScraper(batch_size=100, flush_interval=0.05, rewind=0.0)
+    pages, requests = _collect(scraper, frames, max_events=12, drop_after=4)
+    # Every reconnect resumes from the last event received, which is delivered again.
+    assert len(requests) == 3
+    assert [request.get("cursor") for request in requests] == [
+        None, [str(frames[3]["time_us"])], [str(frames[6]["time_us"])]
+    ]
+    assert set(_rkeys(pages)) == {f"rkey{i}" for i in range(10)}
+
+
+def test_dropped_connection_ends_the_stream_without_reconnect():
+    scraper = JetstreamScraper(batch_size=100, reconnect=False)
+    pages, requests = _collect(scraper, [_frame(i) for i in range(10)], drop_after=4)
+    assert _rkeys(pages) == [f"rkey{i}" for i in range(4)]
+    assert len(requests) == 1
+
+
+def test_failure_to_connect_is_raised_without_reconnect():
+    scraper = JetstreamScraper(url="ws://127.0.0.1:9/subscribe", reconnect=False)
+
+    async def main():
+        return [page async for page in scraper.iter_pages()]
+
+    with pytest.raises(OSError):
+        asyncio.run(main())
+
+
+def _run(scraper: JetstreamScraper, frames: list, destination: str = None, **options) -> int:
+    async def main():
+        async with ReplayJetstreamServer(frames) as server:
+            scraper.url = server.url
+            return await scraper.run(destination=destination, **options)
+    return asyncio.run(main())
+
+
+def test_run_keeps_every_batch_in_a_file_writer(tmp_path):
+    store = LocalStateStore(tmp_path / "state")
+    frames = [_frame(i) for i in range(25)]
+    scraper = JetstreamScraper(writer=LocalJsonFileWriter(), state_store=store, batch_size=10, reconnect=False)
+    destination = tmp_path / "posts.json"
+    assert _run(scraper, frames, str(destination)) == 25
+    written = json.loads(destination.read_text())
+    assert [post["uri"].rsplit("/", 1)[1] for post in written["posts"]] == [f"rkey{i}" for i in range(25)]
+    assert store.load("jetstream-cursor") == {"cursor": frames[24]["time_us"]}
+
+
+def test_run_appends_every_batch_to_an_ndjson_file(tmp_path):
+    frames = [_frame(i) for i in range(25)]
+    scraper = JetstreamScraper(writer=LocalJsonFileWriter(ndjson=True), batch_size=10, reconnect=False)
+    destination = tmp_path / "posts.ndjson"
+    assert _run(scraper, frames, str(destination), max_events=20) == 20
+    assert len(destination.read_text().splitlines()) == 20
+
+
+def test_failed_write_does_not_save_the_cursor_of_unwritten_batches(tmp_path):
+    class FailingWriter(DataWriter):
+        def write(self, data, destination=None, **kwargs):
+            pass
+
+        def write_pages(self, pages, destination=None, items_key=None, **kwargs):
+            for i, _ in enumerate(pages):
+                if i == 1:
+                    raise IOError("disk full")
+
+    store = LocalStateStore(tmp_path / "state")
+    frames = [_frame(i) for i in range(25)]
+    scraper = JetstreamScraper(writer=FailingWriter(), state_store=store, batch_size=10, reconnect=False)
+    with pytest.raises(IOError):
+        _run(scraper, frames)
+    # The first batch was taken before the second one failed.
+    assert store.load("jetstream-cursor") == {"cursor": frames[9]["time_us"]}
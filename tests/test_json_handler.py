@@ -0,0 +1,15 @@
+import json
+import os
+import pytest
+from bskydata.storage.handlers.json import JsonFileHandler
+
+
+def test_write_to_temp_file_is_deprecated_but_still_writes():
+    with pytest.deprecated_call():
+        path = JsonFileHandler().write_to_temp_file({"followers": [{"did": "did:plc:one"}]})
+    try:
+        assert path.endswith(".json")
+        with open(path) as f:
+            assert json.load(f) == {"followers": [{"did": "did:plc:one"}]}
+    finally:
+        os.remove(path)
@@ -0,0 +1,101 @@
+import json
+import pytest
+from bskydata.storage.handlers.json import JsonFileHandler
+from bskydata.storage.writers.local.local import LocalJsonFileWriter
+
+
+def _page(number: int, size: int = 3) -> dict:
+    return {
+        "actor": "alice.test",
+        "cursor": str(number),
+        "followers": [{"did": f"did:plc:{number}-{i}", "handle": f"user{number}-{i}.test"} for i in range(size)],
+    }
+
+
+def _lines(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_json_round_trip(tmp_path):
+    data = {"actor": "alice.test", "followers": [{"did": "did:plc:one", "displayName": "Ålice ✨"}]}
+    LocalJsonFileWriter().write(data, str(tmp_path / "out" / "followers.json"))
+    with open(tmp_path / "out" / "followers.json", encoding="utf-8") as f:
+        assert json.load(f) == data
+
+
+def test_missing_destination_raises():
+    with pytest.raises(ValueError):
+        LocalJsonFileWriter().write({"a": 1})
+
+
+def test_ndjson_writes_one_record_per_line(tmp_path):
+    path = tmp_path / "followers.ndjson"
+    LocalJsonFileWriter(default_file=str(path), ndjson=True).write(_page(0))
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3
+    assert [json.loads(line) for line in lines] == [
+        {**item, "context": {"actor": "alice.test", "cursor": "0"}} for item in _page(0)["followers"]
+    ]
+    assert list(JsonFileHandler.iter_lines_from_file(str(path))) == _lines(path)
+
+
+def test_ndjson_append_across_writes(tmp_path):
+    path = str(tmp_path / "followers.ndjson")
+    writer = LocalJsonFileWriter(default_file=path, ndjson=True, append=True)
+    writer.write(_page(0))
+    writer.write(_page(1))
+    assert [line["did"] for line in _lines(path)] == [f"did:plc:{p}-{i}" for p in range(2) for i in range(3)]
+
+    # Without append, a write replaces the file, and the per-call option wins over the writer's.
+    writer.write(_page(2), append=False)
+    assert [line["did"] for line in _lines(path)] == [f"did:plc:2-{i}" for i in range(3)]
+    LocalJsonFileWriter(default_file=path, ndjson=True).write(_page(3))
+    assert len(_lines(path)) == 3
+
+
+def test_ndjson_flushes_every_n_records(tmp_path):
+    path = tmp_path / "followers.ndjson"
+    on_disk = []
+
+    def pages():
+        for number in range(7):
+            # Lines the writer has flushed by the time it asks for the next page.
+            on_disk.append(path.read_text(encoding="utf-8").count("\n") if path.exists() else 0)
+            yield _page(number, size=1)
+
+    LocalJsonFileWriter(ndjson=True, flush_every=3).write_pages(pages(), str(path), items_key="followers")
+    assert on_disk == [0, 0, 0, 3, 3, 3, 6]
+    assert len(_lines(path)) == 7
+
+
+def test_ndjson_write_pages_matches_write(tmp_path):
+    pages = [_page(0), _page(1)]
+    writer = LocalJsonFileWriter(ndjson=True)
+    writer.write_pages(pages, str(tmp_path / "pages.ndjson"), items_key="followers")
+    for page in pages:
+        writer.write(page, str(tmp_path / "write.ndjson"), append=True)
+    assert _lines(tmp_path / "pages.ndjson") == _lines(tmp_path / "write.ndjson")
+
+
+@pytest.mark.parametrize("indent, sort_keys", [(4, True), (2, False), (None, True)])
+def test_write_pages_produces_the_same_file_as_write(tmp_path, indent, sort_keys):
+    pages = [_page(0), _page(1, size=0), _page(2)]
+    merged = {**pages[0], "followers": [item for page in pages for item in page["followers"]]}
+    writer = LocalJsonFileWriter(indent=indent, sort_keys=sort_keys)
+    writer.write_pages(iter(pages), str(tmp_path / "pages.json"), items_key="followers")
+    writer.write(merged, str(tmp_path / "write.json"))
+    assert (tmp_path / "pages.json").read_text() == (tmp_path / "write.json").read_text()
+
+
+def test_write_pages_of_an_empty_crawl(tmp_path):
+    writer = LocalJsonFileWriter()
+    writer.write_pages([_page(0, size=0)], str(tmp_path / "pages.json"), items_key="followers")
+    writer.write(_page(0, size=0), str(tmp_path / "write.json"))
+    assert (tmp_path / "pages.json").read_text() == (tmp_path / "write.json").read_text()
+
+
+def test_write_pages_requires_items_key(tmp_path):
+    with pytest.raises(ValueError):
+        LocalJsonFileWriter().write_pages([_page(0)], str(tmp_path / "pages.json"))
@@ -0,0 +1,161 @@
+import copy
+import pytest
+
+pytest.importorskip("pymongo")
+
+import bson
+from bson.codec_options import CodecOptions
+from pymongo import UpdateOne
+from bskydata.parsers.profiles.basic import BasicFollowersParser
+from bskydata.storage.records import get_field
+from bskydata.storage.writers.database import mongodb
+from bskydata.storage.writers.database.mongodb import MongoDBDataWriter
+
+
+class FakeCollection:
+    """Applies upserts the way MongoDB does for equality filters, and encodes documents with BSON."""
+    def __init__(self, name, codec_options):
+        self.name = name
+        self.codec_options = codec_options
+        self.documents = []
+        self.bulk_writes = []
+        self.indexes = []
+
+    def _encode(self, document):
+        bson.encode(document, codec_options=self.codec_options)
+
+    def _find(self, query):
+        for document in self.documents:
+            if all(get_field(document, path) == value for path, value in query.items()):
+                return document
+        return None
+
+    def insert_one(self, document, **kwargs):
+        self._encode(document)
+        self.documents.append(document)
+
+    def insert_many(self, documents, **kwargs):
+        for document in documents:
+            self.insert_one(document)
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append((operations, ordered))
+        for operation in operations:
+            assert isinstance(operation, UpdateOne) and operation._upsert
+            update = operation._doc["$set"]
+            self._encode(update)
+            document = self._find(operation._filter)
+            if document is None:
+                self.documents.append(copy.deepcopy(update))
+            else:
+                document.update(copy.deepcopy(update))
+
+    def create_index(self, keys, unique=False):
+        self.indexes.append((tuple(keys), unique))
+
+
+class FakeMongoClient:
+    def __init__(self, uri, type_registry=None):
+        self.codec_options = CodecOptions(type_registry=type_registry)
+        self.databases = {}
+
+    def __getitem__(self, name):
+        return self.databases.setdefault(name, FakeDatabase(self.codec_options))
+
+
+class FakeDatabase(dict):
+    def __init__(self, codec_options):
+        super().__init__()
+        self.codec_options = codec_options
+
+    def __missing__(self, name):
+        self[name] = FakeCollection(name, self.codec_options)
+        return self[name]
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    monkeypatch.setattr(mongodb, "MongoClient", FakeMongoClient)
+
+
+def _writer(**kwargs):
+    return MongoDBDataWriter("mongodb://localhost", "bsky", "followers", **kwargs)
+
+
+def _followers(actor: str, start: int, stop: int) -> dict:
+    return {
+        "actor": actor,
+        "created_at": "2024-11-20 12:00:00",
+        "followers": [{"did": f"did:plc:{i}", "handle": f"user{i}.test"} for i in range(start, stop)],
+    }
+
+
+def _operations(collection) -> list:
+    return [operation for operations, _ in collection.bulk_writes for operation in operations]
+
+
+def test_records_are_upserted_on_their_key():
+    writer = _writer(mode="records", batch_size=2)
+    writer.write(_followers("alice.test", 0, 3))
+    collection = writer.database["followers"]
+    operations = _operations(collection)
+    assert [operation._filter for operation in operations] == [
+        {"context.actor": "alice.test", "did": f"did:plc:{i}"} for i in range(3)
+    ]
+    assert all(operation._upsert for operation in operations)
+    assert [len(operations) for operations, _ in collection.bulk_writes] == [2, 1]
+    assert {ordered for _, ordered in collection.bulk_writes} == {False}
+    assert collection.documents[0] == {
+        "did": "did:plc:0", "handle": "user0.test",
+        "context": {"actor": "alice.test", "created_at": "2024-11-20 12:00:00"},
+    }
+
+
+def test_rerun_writes_no_duplicates():
+    writer = _writer(mode="records")
+    writer.write(_followers("alice.test", 0, 3))
+    rerun = _followers("alice.test", 1, 5)
+    rerun["followers"][0]["handle"] = "renamed.test"
+    writer.write(rerun)
+    writer.write(_followers("bob.test", 0, 2))
+    documents = writer.database["followers"].documents
+    assert sorted((d["context"]["actor"], d["did"]) for d in documents) == sorted(
+        [("alice.test", f"did:plc:{i}") for i in range(5)] + [("bob.test", f"did:plc:{i}") for i in range(2)]
+    )
+    assert [d["handle"] for d in documents if d["did"] == "did:plc:1" and d["context"]["actor"] == "alice.test"] \
+        == ["renamed.test"]
+
+
+def test_write_pages_upserts_every_page():
+    writer = _writer(mode="records", batch_size=3)
+    pages = [_followers("alice.test", 0, 2), _followers("alice.test", 2, 4), _followers("alice.test", 0, 4)]
+    writer.write_pages(iter(pages), items_key="followers")
+    assert len(writer.database["followers"].documents) == 4
+
+
+def test_profiles_and_posts_use_their_own_keys():
+    writer = _writer(mode="records")
+    writer.write({"profiles": [{"did": "did:plc:1", "handle": "a.test"}]}, destination="profiles")
+    writer.write({"posts": [{"post_uri": "at://did:plc:1/app.bsky.feed.post/1"}]}, destination="posts")
+    assert _operations(writer.database["profiles"])[0]._filter == {"did": "did:plc:1"}
+    assert _operations(writer.database["posts"])[0]._filter == {"post_uri": "at://did:plc:1/app.bsky.feed.post/1"}
+
+
+def test_record_without_a_key_is_rejected():
+    with pytest.raises(ValueError):
+        _writer(mode="records").write({"profiles": [{"handle": "a.test"}]})
+
+
+def test_unique_indexes_are_created_once():
+    writer = _writer(mode="records", create_indexes=True, batch_size=1)
+    writer.write(_followers("alice.test", 0, 3))
+    writer.write(_followers("alice.test", 3, 5))
+    assert writer.database["followers"].indexes == [((("context.actor", 1), ("did", 1)), True)]
+
+
+def test_document_mode_stores_compact_records():
+    writer = _writer()
+    writer.write(BasicFollowersParser(compact=True).parse(_followers("alice.test", 0, 2)))
+    writer.write([{"a": 1}, {"a": 2}], destination="other")
+    assert writer.database["followers"].documents[0]["followers"][0].did == "did:plc:0"
+    assert len(writer.database["other"].documents) == 2
@@ -0,0 +1,182 @@
+import re
+import threading
+import pytest
+
+pytest.importorskip("neo4j")
+
+from neo4j.exceptions import TransientError
+from bskydata.storage.writers.database import neo4j as neo4j_writer
+from bskydata.storage.writers.database.neo4j import Neo4jDataWriter, Neo4jSchemaError
+
+
+QUERY = "UNWIND $records AS record MERGE (a:Author {did: record.did})"
+CONSTRAINT = re.compile(r"CREATE CONSTRAINT (\w+) IF NOT EXISTS FOR \(n:(\w+)\) REQUIRE n\.(\w+) IS UNIQUE")
+
+
+class FakeResult(list):
+    def consume(self):
+        return None
+
+
+class FakeTransaction:
+    def __init__(self, driver):
+        self.driver = driver
+        self.runs = []
+
+    def run(self, query, parameters=None):
+        with self.driver.lock:
+            if self.driver.transient_failures:
+                self.driver.transient_failures -= 1
+                raise TransientError("deadlock detected")
+        self.runs.append((query, parameters))
+        return FakeResult()
+
+
+class FakeSession:
+    """Managed transactions are retried on transient errors and only committed on success."""
+    def __init__(self, driver, database):
+        self.driver = driver
+        self.database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def execute_write(self, work, *args):
+        while True:
+            tx = FakeTransaction(self.driver)
+            try:
+                result = work(tx, *args)
+            except TransientError:
+                self.driver.retries += 1
+                continue
+            with self.driver.lock:
+                self.driver.committed.extend(tx.runs)
+            return result
+
+    def run(self, query, parameters=None, **kwargs):
+        self.driver.statements.append(query)
+        match = CONSTRAINT.match(query)
+        if match:
+            name, label, prop = match.groups()
+            if label not in self.driver.refused_labels:
+                self.driver.constraints.setdefault(name, (label, prop))
+            return FakeResult()
+        if query.startswith("SHOW CONSTRAINTS"):
+            return FakeResult(
+                {"labelsOrTypes": [label], "properties": [prop]} for label, prop in self.driver.constraints.values()
+            )
+        return FakeResult()
+
+
+class FakeDriver:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.committed = []
+        self.statements = []
+        self.constraints = {}
+        self.refused_labels = set()
+        self.transient_failures = 0
+        self.retries = 0
+        self.closed = False
+
+    def session(self, database=None):
+        return FakeSession(self, database)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_writer.GraphDatabase, "driver", staticmethod(lambda *args, **kwargs: driver))
+    return driver
+
+
+def _writer(**kwargs):
+    return Neo4jDataWriter("bolt://localhost:7687", "neo4j", "password", **kwargs)
+
+
+def _records(n: int) -> list:
+    return [{"did": f"did:plc:{i}"} for i in range(n)]
+
+
+@pytest.mark.parametrize("n, sizes", [(0, []), (3, [3]), (4, [4]), (9, [4, 4, 1])])
+def test_records_are_written_in_batches(driver, n, sizes):
+    assert _writer(batch_size=4).write_records(iter(_records(n)), QUERY) == n
+    assert [len(parameters["records"]) for _, parameters in driver.committed] == sizes
+    assert [record for _, parameters in driver.committed for record in parameters["records"]] == _records(n)
+
+
+def test_batch_size_and_parameter_name_per_call(driver):
+    query = "UNWIND $edges AS edge MERGE (a:Author {did: edge.did}) SET a.source = $source"
+    written = _writer(batch_size=1000).write_records(_records(5), query, parameter="edges", batch_size=2,
+                                                    source="search")
+    assert written == 5
+    assert [query for query, _ in driver.committed] == [query] * 3
+    assert [sorted(parameters) for _, parameters in driver.committed] == [["edges", "source"]] * 3
+    assert [len(parameters["edges"]) for _, parameters in driver.committed] == [2, 2, 1]
+    assert {parameters["source"] for _, parameters in driver.committed} == {"search"}
+
+
+def test_transient_errors_are_retried_through_managed_transactions(driver):
+    driver.transient_failures = 2
+    assert _writer(batch_size=4).write_records(_records(10), QUERY) == 10
+    assert driver.retries == 2
+    # A retried batch is committed once.
+    assert [record for _, parameters in driver.committed for record in parameters["records"]] == _records(10)
+
+
+def test_parallel_batches_write_every_record_once(driver):
+    driver.transient_failures = 3
+    assert _writer(batch_size=7, max_workers=4).write_records(_records(200), QUERY) == 200
+    written = [record["did"] for _, parameters in driver.committed for record in parameters["records"]]
+    assert sorted(written) == sorted(record["did"] for record in _records(200))
+    assert max(len(parameters["records"]) for _, parameters in driver.committed) == 7
+
+
+def test_failed_batch_propagates_from_parallel_writes(driver, monkeypatch):
+    def write(self, data, query, **kwargs):
+        if data["records"][0]["did"] == "did:plc:20":
+            raise ValueError("bad record")
+    monkeypatch.setattr(Neo4jDataWriter, "write", write)
+    with pytest.raises(ValueError):
+        _writer(batch_size=10, max_workers=3).write_records(_records(100), QUERY)
+
+
+def test_invalid_batch_size_is_rejected(driver):
+    with pytest.raises(ValueError):
+        _writer().write_records(_records(3), QUERY, batch_size=-1)
+
+
+def test_ensure_schema_is_idempotent(driver):
+    keys = [("Author", "did"), ("Post", "uri"), ("Tag", "name")]
+    writer = _writer()
+    writer.ensure_schema(keys)
+    writer.ensure_schema(keys)
+    assert driver.constraints == {
+        "author_did_unique": ("Author", "did"),
+        "post_uri_unique": ("Post", "uri"),
+        "tag_name_unique": ("Tag", "name"),
+    }
+    creates = [statement for statement in driver.statements if statement.startswith("CREATE CONSTRAINT")]
+    assert len(creates) == 6
+    assert all("IF NOT EXISTS" in statement for statement in creates)
+
+
+def test_ensure_schema_reports_missing_constraints(driver):
+    driver.refused_labels = {"Tag"}
+    with pytest.raises(Neo4jSchemaError, match="Tag"):
+        _writer().ensure_schema([("Author", "did"), ("Tag", "name")])
+
+
+def test_ensure_schema_rejects_invalid_identifiers(driver):
+    with pytest.raises(ValueError):
+        _writer().ensure_schema([("Author) DETACH DELETE n //", "did")])
+    assert driver.statements == []
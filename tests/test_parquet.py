@@ -0,0 +1,104 @@
+import io
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from bskydata.parsers.records import PostRecord
+from bskydata.storage.handlers.parquet import _COLUMNS, ParquetFileHandler
+from bskydata.storage.writers.local.parquet import LocalParquetFileWriter
+from bskydata.testing.replay import synthetic_posts
+
+
+def _value(column: str, type_name: str, i: int):
+    return {
+        "string": f"{column}-{i}",
+        "int64": i,
+        "double": i / 4,
+        "list<string>": [f"{column}-{i}", f"{column}-{i + 1}"],
+    }[type_name]
+
+
+def _crawl(items_key: str, n: int):
+    """A crawl with every column filled on the first record, some missing on the second and None on the third."""
+    envelope, records, expected = {}, [{}, {}, {}], [{}, {}, {}]
+    for column, type_name, sources, _ in _COLUMNS[items_key]:
+        source = sources[0]
+        if source.startswith("context."):
+            envelope[source[len("context."):]] = _value(column, type_name, n)
+            for row in expected:
+                row[column] = _value(column, type_name, n)
+            continue
+        value = _value(column, type_name, n)
+        records[0][source] = [{"val": label} for label in value] if column == "labels" else value
+        expected[0][column] = value
+        if column in ("did", "post_uri"):
+            records[1][source] = records[2][source] = value
+            expected[1][column] = expected[2][column] = value
+        else:
+            records[2][source] = None
+            expected[1][column] = expected[2][column] = None
+    return {**envelope, items_key: records}, expected
+
+
+@pytest.mark.parametrize("items_key", sorted(_COLUMNS))
+def test_round_trip_of_every_record_type(tmp_path, items_key):
+    crawl, expected = _crawl(items_key, 3)
+    path = str(tmp_path / f"{items_key}.parquet")
+    LocalParquetFileWriter().write(crawl, path, items_key=items_key)
+    table = pq.read_table(path)
+    assert table.schema == ParquetFileHandler.schema(items_key)
+    assert table.to_pylist() == expected
+
+
+def test_raw_records_are_read_through_their_fallback_fields(tmp_path):
+    posts = [post.model_dump() for post in synthetic_posts(3)]
+    path = str(tmp_path / "posts.parquet")
+    LocalParquetFileWriter().write({"search_term": "python", "posts": posts}, path)
+    rows = pq.read_table(path).to_pylist()
+    assert [row["post_uri"] for row in rows] == [post["uri"] for post in posts]
+    assert [row["author_did"] for row in rows] == [post["author"]["did"] for post in posts]
+    assert [row["post_text"] for row in rows] == [post["record"]["text"] for post in posts]
+    assert {row["search_term"] for row in rows} == {"python"}
+
+
+def test_compact_records_are_written_like_dictionaries(tmp_path):
+    record = PostRecord(post_uri="at://did:plc:1/app.bsky.feed.post/1", author_did="did:plc:1", tags=["python"])
+    LocalParquetFileWriter().write({"posts": [record]}, str(tmp_path / "compact.parquet"))
+    LocalParquetFileWriter().write({"posts": [{"post_uri": record.post_uri, "author_did": "did:plc:1",
+                                               "tags": ["python"]}]}, str(tmp_path / "dict.parquet"))
+    assert pq.read_table(tmp_path / "compact.parquet").equals(pq.read_table(tmp_path / "dict.parquet"))
+
+
+def test_write_pages_writes_a_row_group_per_row_group_size(tmp_path):
+    pages = [{"actor": "alice.test", "followers": [{"did": f"did:plc:{p}-{i}"} for i in range(7)]} for p in range(5)]
+    path = str(tmp_path / "followers.parquet")
+    LocalParquetFileWriter(row_group_size=10).write_pages(iter(pages), path, items_key="followers")
+    metadata = pq.ParquetFile(path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [10, 10, 10, 5]
+    assert pq.read_table(path).column("did").to_pylist() == [
+        record["did"] for page in pages for record in page["followers"]
+    ]
+
+
+def test_iter_encode_pages_streams_row_groups():
+    pages = [{"actor": "alice.test", "followers": [{"did": f"did:plc:{p}-{i}"} for i in range(10)]} for p in range(4)]
+    handler = ParquetFileHandler(row_group_size=10)
+    consumed = []
+
+    def tracked():
+        for page in pages:
+            consumed.append(page)
+            yield page
+
+    chunks = handler.iter_encode_pages(tracked(), "followers")
+    first = next(chunks)
+    # Bytes are handed out after the first row group, before the crawl is read to the end.
+    assert len(consumed) < len(pages)
+    data = first + b"".join(chunks)
+    assert pq.ParquetFile(io.BytesIO(data)).metadata.num_row_groups == 4
+    assert pq.read_table(io.BytesIO(data)).num_rows == 40
+
+
+def test_unknown_items_key_is_rejected():
+    with pytest.raises(ValueError):
+        ParquetFileHandler.schema("likes")
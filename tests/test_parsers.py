@@ -0,0 +1,74 @@
+import pytest
+from atproto import models
+from bskydata.parsers.profiles.basic import BasicFollowersParser, BasicFollowsParser, BasicProfilesParser
+from bskydata.parsers.records import ActorRecord, PostRecord, ProfileRecord
+from bskydata.parsers.search_terms.basic import BasicSearchTermsParser
+from bskydata.storage.records import as_dict
+from bskydata.testing.replay import synthetic_posts, synthetic_profiles
+
+
+CRAWLS = [
+    (BasicFollowersParser, "followers", lambda: synthetic_profiles(20), {"actor": "alice.test"}),
+    (BasicFollowsParser, "follows", lambda: synthetic_profiles(20), {"actor": "alice.test"}),
+    (BasicProfilesParser, "profiles", lambda: synthetic_profiles(20, detailed=True), {"actors": ["alice.test"]}),
+    (BasicSearchTermsParser, "posts", lambda: synthetic_posts(20), {"search_term": "python"}),
+]
+RECORD_TYPES = {"followers": ActorRecord, "follows": ActorRecord, "profiles": ProfileRecord, "posts": PostRecord}
+
+
+def _crawl(items_key, items, envelope) -> dict:
+    return {**envelope, "created_at": "2024-11-20 12:00:00", items_key: items}
+
+
+@pytest.mark.parametrize("parser_type, items_key, build, envelope", CRAWLS)
+def test_parsing_models_matches_parsing_dicts(parser_type, items_key, build, envelope):
+    models = build()
+    assert parser_type.accepts_models
+    from_models = parser_type().parse(_crawl(items_key, models, envelope))
+    from_dicts = parser_type().parse(_crawl(items_key, [model.model_dump() for model in models], envelope))
+    assert from_models == from_dicts
+    assert len(from_models[items_key]) == 20
+
+
+@pytest.mark.parametrize("parser_type, items_key, build, envelope", CRAWLS)
+def test_compact_records_convert_back_to_the_same_dicts(parser_type, items_key, build, envelope):
+    crawl = _crawl(items_key, build(), envelope)
+    plain = parser_type().parse(crawl)
+    compact = parser_type(compact=True).parse(crawl)
+    assert all(type(record) is RECORD_TYPES[items_key] for record in compact[items_key])
+    assert [as_dict(record) for record in compact[items_key]] == plain[items_key]
+    assert {key: value for key, value in compact.items() if key != items_key} == \
+        {key: value for key, value in plain.items() if key != items_key}
+
+
+def test_post_fields_are_read_from_models_and_dicts():
+    post = synthetic_posts(2)[1]
+    for item in (post, post.model_dump()):
+        record = BasicSearchTermsParser().parse({"posts": [item]})["posts"][0]
+        assert record["post_uri"] == post.uri
+        assert record["author_did"] == post.author.did
+        assert record["post_text"] == "Post number 1 about #python"
+        assert record["tags"] == ["python"]
+        assert record["post_created_at"] == "2024-11-20T12:00:00.000Z"
+
+
+def test_profile_counts_and_labels_are_read_from_models_and_dicts():
+    profile = synthetic_profiles(1, detailed=True)[0]
+    for item in (profile, profile.model_dump()):
+        record = BasicProfilesParser().parse({"profiles": [item]})["profiles"][0]
+        assert (record["followers_count"], record["follows_count"], record["posts_count"]) == (120, 80, 300)
+        assert record["labels"] == []
+        assert record["avatar_url"] == profile.avatar
+
+
+def test_labels_and_pinned_post_parse_the_same_from_models_and_dicts():
+    profile = synthetic_profiles(1, detailed=True)[0].model_copy(update={
+        "labels": [models.ComAtprotoLabelDefs.Label(src="did:plc:labeler", uri="at://did:plc:0", val="spam",
+                                                    cts="2024-11-20T12:00:00.000Z")],
+        "pinned_post": models.ComAtprotoRepoStrongRef.Main(uri="at://did:plc:0/app.bsky.feed.post/1", cid="bafyrei1"),
+    })
+    parser = BasicProfilesParser()
+    from_model = parser.parse({"profiles": [profile]})["profiles"][0]
+    assert from_model == parser.parse({"profiles": [profile.model_dump()]})["profiles"][0]
+    assert from_model["pinned_post_uri"] == "at://did:plc:0/app.bsky.feed.post/1"
+    assert [label["val"] for label in from_model["labels"]] == ["spam"]
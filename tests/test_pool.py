@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from atproto.exceptions import AtProtocolError
+from bskydata.api.client import AuthenticationError
+from bskydata.api.pool import BskyClientPool
+from bskydata.api.rate_limit import RateLimiter
+
+
+class StubClient:
+    """Stands in for BskyApiClient: a DID, a rate limiter and a getSession call."""
+    def __init__(self, did: str, asynchronous: bool = False):
+        self.did = did
+        self.rate_limiter = RateLimiter(rate=10, capacity=10)
+        self.authenticated = True
+        self.session_ok = True
+        get_session = self._get_session_async if asynchronous else self._get_session
+        self.client = SimpleNamespace(
+            name=did,
+            com=SimpleNamespace(atproto=SimpleNamespace(server=SimpleNamespace(get_session=get_session)))
+        )
+
+    def ensure_authenticated(self):
+        if not self.authenticated:
+            raise AuthenticationError(f"{self.did} is logged out.")
+
+    def _get_session(self):
+        if not self.session_ok:
+            raise AtProtocolError("expired session")
+        return SimpleNamespace(did=self.did)
+
+    async def _get_session_async(self):
+        return self._get_session()
+
+
+def _pool(n: int = 3, **kwargs):
+    return BskyClientPool([StubClient(f"did:plc:{i}") for i in range(n)], **kwargs)
+
+
+def test_round_robin_takes_turns():
+    pool = _pool()
+    assert [pool.client.name for _ in range(7)] == [f"did:plc:{i % 3}" for i in range(7)]
+
+
+def test_least_loaded_picks_the_account_that_can_send_soonest():
+    pool = _pool(strategy="least_loaded")
+    first, second, third = pool.clients
+    # first has used up its burst, second is blocked after a 429, third has one request behind it.
+    for _ in range(12):
+        first.rate_limiter._reserve()
+    second.rate_limiter.update({"retry-after": "30"}, status_code=429)
+    third.rate_limiter._reserve()
+    assert pool.select() is third
+
+
+def test_least_loaded_breaks_ties_on_request_count():
+    pool = _pool(strategy="least_loaded")
+    pool.clients[0].rate_limiter._reserve()
+    pool.clients[2].rate_limiter._reserve()
+    assert pool.select() is pool.clients[1]
+
+
+def test_logged_out_accounts_are_skipped():
+    pool = _pool()
+    pool.clients[1].authenticated = False
+    assert [pool.client.name for _ in range(4)] == ["did:plc:0", "did:plc:2", "did:plc:0", "did:plc:2"]
+    for member in pool.clients:
+        member.authenticated = False
+    with pytest.raises(AuthenticationError):
+        pool.select()
+    with pytest.raises(AuthenticationError):
+        pool.ensure_authenticated()
+
+
+def test_check_health_leaves_out_failing_accounts_until_they_recover():
+    pool = _pool()
+    pool.clients[0].session_ok = False
+    assert pool.check_health() == [False, True, True]
+    assert {pool.client.name for _ in range(6)} == {"did:plc:1", "did:plc:2"}
+    pool.clients[0].session_ok = True
+    assert pool.check_health() == [True, True, True]
+    assert {pool.client.name for _ in range(6)} == {"did:plc:0", "did:plc:1", "did:plc:2"}
+
+
+def test_check_health_async():
+    pool = BskyClientPool([StubClient(f"did:plc:{i}", asynchronous=True) for i in range(2)])
+    pool.clients[1].session_ok = False
+    assert asyncio.run(pool.check_health_async()) == [True, False]
+    assert {pool.client.name for _ in range(4)} == {"did:plc:0"}
+
+
+def test_stats_report_each_account():
+    pool = _pool(2)
+    pool.clients[0].rate_limiter._reserve()
+    pool.clients[1].rate_limiter.update({"ratelimit-limit": "3000", "ratelimit-remaining": "2999"})
+    pool.clients[1].rate_limiter.update({"retry-after": "1"}, status_code=429)
+    pool.clients[1].session_ok = False
+    pool.check_health()
+    stats = pool.stats()
+    assert [s["did"] for s in stats] == ["did:plc:0", "did:plc:1"]
+    assert [s["healthy"] for s in stats] == [True, False]
+    assert [s["requests"] for s in stats] == [1, 0]
+    assert [s["throttled"] for s in stats] == [0, 1]
+    assert (stats[1]["limit"], stats[1]["remaining"]) == (3000, 2999)
+    assert stats[1]["rate"] == 5
+
+
+def test_invalid_pools_are_rejected():
+    with pytest.raises(ValueError):
+        BskyClientPool([])
+    with pytest.raises(ValueError):
+        _pool(strategy="random")
@@ -0,0 +1,72 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from atproto import models
+from bskydata.parsers.profiles.basic import BasicProfilesParser
+from bskydata.scrapers.profiles import ProfilesScraper
+
+
+class StubProfilesClient:
+    """getProfiles stub: one profile per actor, with later batches answering first."""
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.batches = []
+        self.threads = set()
+        self._lock = threading.Lock()
+        self.client = SimpleNamespace(get_profiles=self._get_profiles)
+
+    def _get_profiles(self, actors):
+        with self._lock:
+            self.batches.append(list(actors))
+            self.threads.add(threading.get_ident())
+        if self.fail_on in actors:
+            raise ConnectionError("connection reset")
+        # Answer the first batches last so completion order differs from batch order.
+        time.sleep(0.02 / (1 + int(actors[0].split("-")[1]) // ProfilesScraper.batch_size))
+        return models.AppBskyActorGetProfiles.Response(profiles=[
+            models.AppBskyActorDefs.ProfileViewDetailed(did=f"did:plc:{actor}", handle=f"{actor}.test")
+            for actor in actors
+        ])
+
+
+def _actors(n: int) -> list:
+    return [f"user-{i}" for i in range(n)]
+
+
+@pytest.mark.parametrize("n, sizes", [
+    (1, [1]), (25, [25]), (26, [25, 1]), (50, [25, 25]), (51, [25, 25, 1]), (0, []),
+])
+def test_actors_are_split_into_batches_of_25(n, sizes):
+    client = StubProfilesClient()
+    result = ProfilesScraper(client).fetch(_actors(n))
+    assert sorted(len(batch) for batch in client.batches) == sorted(sizes)
+    assert sorted(actor for batch in client.batches for actor in batch) == sorted(_actors(n))
+    assert result["actors"] == _actors(n)
+
+
+def test_profiles_keep_the_order_of_the_actors():
+    client = StubProfilesClient()
+    result = ProfilesScraper(client, max_workers=4).fetch(_actors(130))
+    assert [profile["handle"] for profile in result["profiles"]] == [f"{actor}.test" for actor in _actors(130)]
+    assert len(client.threads) > 1
+
+
+def test_sequential_fetch_matches_concurrent_fetch():
+    concurrent = ProfilesScraper(StubProfilesClient(), max_workers=4).fetch(_actors(60))
+    sequential = ProfilesScraper(StubProfilesClient(), max_workers=1).fetch(_actors(60))
+    assert concurrent["profiles"] == sequential["profiles"]
+
+
+def test_parser_gets_the_profiles_in_order():
+    result = ProfilesScraper(StubProfilesClient(), parser=BasicProfilesParser()).fetch(_actors(60))
+    assert [profile["handle"] for profile in result["profiles"]] == [f"{actor}.test" for actor in _actors(60)]
+
+
+def test_error_in_one_batch_propagates():
+    client = StubProfilesClient(fail_on="user-40")
+    writes = []
+    writer = SimpleNamespace(write=lambda data, destination=None: writes.append(data))
+    with pytest.raises(ConnectionError):
+        ProfilesScraper(client, writer=writer, max_workers=4).fetch(_actors(80))
+    assert writes == []
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from atproto_client.exceptions import RequestException
+from atproto_client.request import AsyncRequest, Request, Response
+from bskydata.api import rate_limit
+from bskydata.api.rate_limit import AsyncRateLimitedRequest, RateLimitedRequest, RateLimiter
+
+
+class FakeClock:
+    """Replaces the time module of bskydata.api.rate_limit; sleeping moves the clock."""
+    def __init__(self):
+        self.now = 1000.0
+        self.epoch = 1_700_000_000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.epoch + self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def _reset_in(clock, seconds) -> str:
+    return str(clock.time() + seconds)
+
+
+def test_burst_up_to_capacity_then_refill_at_rate(clock):
+    limiter = RateLimiter(rate=2, capacity=5)
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.sleeps == []
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+    assert limiter.delay() == pytest.approx(0.5)
+    # Idle time refills the bucket, but never beyond its capacity.
+    clock.now += 60
+    assert limiter.delay() == 0
+    for _ in range(5):
+        limiter.acquire()
+    assert len(clock.sleeps) == 1
+    assert limiter.requests == 11
+
+
+def test_rate_follows_the_remaining_quota(clock):
+    limiter = RateLimiter(rate=10, capacity=1)
+    limiter.update({"ratelimit-limit": "3000", "ratelimit-remaining": "100",
+                    "ratelimit-reset": _reset_in(clock, 200)})
+    assert (limiter.limit, limiter.remaining) == (3000, 100)
+    assert limiter.rate == pytest.approx(0.5)
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(2.0)]
+
+
+def test_exhausted_quota_blocks_until_the_window_resets(clock):
+    limiter = RateLimiter(rate=10, capacity=10)
+    limiter.update({"ratelimit-remaining": "0", "ratelimit-reset": _reset_in(clock, 30)})
+    assert limiter.delay() == pytest.approx(30)
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(30)]
+
+
+def test_rate_stays_within_its_bounds(clock):
+    limiter = RateLimiter(rate=10, min_rate=1, max_rate=20)
+    limiter.update({"ratelimit-remaining": "1", "ratelimit-reset": _reset_in(clock, 100)})
+    assert limiter.rate == 1
+    limiter.update({"ratelimit-remaining": "10000", "ratelimit-reset": _reset_in(clock, 10)})
+    assert limiter.rate == 20
+
+
+def test_429_waits_for_retry_after_and_halves_the_rate(clock):
+    limiter = RateLimiter(rate=10, capacity=10)
+    limiter.update({"retry-after": "7"}, status_code=429)
+    assert limiter.throttled == 1
+    assert limiter.rate == 5
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(7)]
+
+
+def test_429_without_retry_after_waits_for_the_window(clock):
+    limiter = RateLimiter(rate=10)
+    limiter.update({"ratelimit-remaining": "0", "ratelimit-reset": _reset_in(clock, 12)}, status_code=429)
+    assert limiter.delay() == pytest.approx(12)
+
+
+def test_rate_recovers_towards_max_rate_after_a_429(clock):
+    limiter = RateLimiter(rate=40, max_rate=50)
+    for _ in range(3):
+        limiter.update({"retry-after": "1"}, status_code=429)
+    assert limiter.rate == 5
+    clock.now += 1
+    limiter.update({"ratelimit-remaining": "1500", "ratelimit-reset": _reset_in(clock, 60)})
+    assert limiter.rate == 25
+    limiter.update({"ratelimit-remaining": "2900", "ratelimit-reset": _reset_in(clock, 30)})
+    assert limiter.rate == 50
+
+
+def _throttled():
+    response = Response(success=False, status_code=429, content=None,
+                        headers={"retry-after": "2", "ratelimit-remaining": "0"})
+    return RequestException(response)
+
+
+def test_request_retries_429_up_to_max_retries(clock, monkeypatch):
+    calls = []
+    def send(self, method, url, **kwargs):
+        calls.append(url)
+        raise _throttled()
+    monkeypatch.setattr(Request, "_send_request", send)
+    limiter = RateLimiter(rate=100)
+    request = RateLimitedRequest(limiter, max_retries=2)
+    with pytest.raises(RequestException):
+        request._send_request("GET", "https://bsky.test/xrpc/app.bsky.actor.getProfile")
+    assert len(calls) == 3
+    assert limiter.throttled == 3
+    assert clock.sleeps == [pytest.approx(2), pytest.approx(2)]
+
+
+def test_request_returns_once_the_server_recovers(clock, monkeypatch):
+    responses = iter([_throttled(), Response(success=True, status_code=200, content={}, headers={})])
+    def send(self, method, url, **kwargs):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    monkeypatch.setattr(Request, "_send_request", send)
+    response = RateLimitedRequest(RateLimiter(rate=100))._send_request("GET", "https://bsky.test/xrpc/x")
+    assert response.status_code == 200
+
+
+def test_other_errors_are_not_retried(clock, monkeypatch):
+    calls = []
+    def send(self, method, url, **kwargs):
+        calls.append(url)
+        raise RequestException(Response(success=False, status_code=500, content=None, headers={}))
+    monkeypatch.setattr(Request, "_send_request", send)
+    with pytest.raises(RequestException):
+        RateLimitedRequest(RateLimiter(rate=100))._send_request("GET", "https://bsky.test/xrpc/x")
+    assert len(calls) == 1
+
+
+def test_async_request_retries_429_up_to_max_retries(clock, monkeypatch):
+    calls = []
+    async def send(self, method, url, **kwargs):
+        calls.append(url)
+        raise _throttled()
+    async def sleep(seconds):
+        clock.sleep(seconds)
+    monkeypatch.setattr(AsyncRequest, "_send_request", send)
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", sleep)
+    request = AsyncRateLimitedRequest(RateLimiter(rate=100), max_retries=1)
+    with pytest.raises(RequestException):
+        asyncio.run(request._send_request("GET", "https://bsky.test/xrpc/x"))
+    assert len(calls) == 2
+    assert clock.sleeps == [pytest.approx(2)]
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from atproto import models
+from bskydata.scrapers.search_terms import SearchTermScraper
+from bskydata.storage.state import LocalStateStore
+from bskydata.storage.writers.base import DataWriter
+
+
+NOW = datetime(2024, 11, 20, 12, 0, tzinfo=timezone.utc)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _post(name: str, indexed_at: datetime, created_at: datetime = None) -> models.AppBskyFeedDefs.PostView:
+    return models.AppBskyFeedDefs.PostView.model_validate({
+        "uri": f"at://did:plc:author/app.bsky.feed.post/{name}",
+        "cid": f"bafyrei{name}",
+        "author": {"did": "did:plc:author", "handle": "author.test"},
+        "record": {"$type": "app.bsky.feed.post", "text": name, "createdAt": _iso(created_at or indexed_at)},
+        "indexedAt": _iso(indexed_at),
+    })
+
+
+class SearchClient:
+    """searchPosts stand-in that orders and filters by sortAt like the AppView."""
+    def __init__(self, page_size: int = 2):
+        self.posts = []
+        self.page_size = page_size
+        self.requests = []
+        self.client = SimpleNamespace(
+            app=SimpleNamespace(bsky=SimpleNamespace(feed=SimpleNamespace(search_posts=self._search_posts)))
+        )
+
+    @staticmethod
+    def _sort_at(post) -> datetime:
+        return min(datetime.fromisoformat(post.indexed_at), datetime.fromisoformat(post.record.created_at))
+
+    def _search_posts(self, params: dict):
+        self.requests.append(params)
+        posts = sorted(self.posts, key=self._sort_at, reverse=True)
+        if "since" in params:
+            since = datetime.fromisoformat(params["since"])
+            posts = [post for post in posts if self._sort_at(post) >= since]
+        start = int(params.get("cursor") or 0)
+        stop = start + self.page_size
+        return models.AppBskyFeedSearchPosts.Response.model_construct(
+            posts=posts[start:stop], cursor=str(stop) if stop < len(posts) else None
+        )
+
+
+class FlakyWriter(DataWriter):
+    """Fails the first `failures` writes."""
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.written = []
+
+    def _take(self, records: list):
+        if self.failures:
+            self.failures -= 1
+            raise IOError("disk full")
+        self.written.extend(records)
+
+    def write(self, data, destination=None, **kwargs):
+        self._take(data["posts"])
+
+    def write_pages(self, pages, destination=None, items_key=None, **kwargs):
+        self._take([post for page in pages for post in page["posts"]])
+
+
+def _names(result: dict) -> list:
+    return [post["record"]["text"] for post in result["posts"]]
+
+
+@pytest.fixture
+def client():
+    return SearchClient()
+
+
+@pytest.fixture
+def scraper(client, tmp_path):
+    return SearchTermScraper(client, state_store=LocalStateStore(tmp_path / "state"), incremental=True)
+
+
+def test_incremental_crawls_only_return_new_posts(client, scraper):
+    client.posts = [_post(f"p{i}", NOW + timedelta(minutes=i)) for i in range(5)]
+    assert _names(scraper.fetch("python")) == ["p4", "p3", "p2", "p1", "p0"]
+    assert "since" not in client.requests[0]
+
+    client.posts += [_post("p5", NOW + timedelta(minutes=5)), _post("p6", NOW + timedelta(minutes=6))]
+    assert _names(scraper.fetch("python")) == ["p6", "p5"]
+    assert client.requests[-1]["sort"] == "latest"
+    assert scraper.fetch("python")["posts"] == []
+
+
+def test_watermark_follows_sort_at_for_backdated_posts(client, scraper):
+    # Indexed now but created an hour ago: the API sorts and filters it by createdAt.
+    client.posts = [_post("backdated", NOW, created_at=NOW - timedelta(hours=1))]
+    scraper.fetch("python")
+    assert datetime.fromisoformat(scraper.load_watermark("python")["sort_at"]) == NOW - timedelta(hours=1)
+
+    # A post sorted between the backdated post's createdAt and indexedAt shows up late.
+    client.posts.append(_post("late", NOW - timedelta(minutes=30)))
+    assert _names(scraper.fetch("python")) == ["late"]
+
+
+def test_timestamps_are_compared_as_times_not_strings(client, scraper):
+    seen = _post("seen", NOW)
+    scraper.state_store.save(scraper._watermark_name("python"), {
+        "sort_at": "2024-11-20T12:00:00+00:00", "uris": [seen.uri]
+    })
+    client.posts = [seen, _post("newer", NOW + timedelta(milliseconds=1))]
+    assert _names(scraper.fetch("python")) == ["newer"]
+    assert scraper.load_watermark("python")["sort_at"] == "2024-11-20T12:00:00.001000Z"
+
+
+def test_watermarks_of_earlier_versions_are_read(client, scraper):
+    seen = _post("seen", NOW)
+    scraper.state_store.save(scraper._watermark_name("python"), {"indexed_at": _iso(NOW), "uris": [seen.uri]})
+    client.posts = [seen, _post("new", NOW + timedelta(seconds=1))]
+    assert _names(scraper.fetch("python")) == ["new"]
+
+
+def test_watermark_is_loaded_once_per_crawl(client, scraper, monkeypatch):
+    client.posts = [_post(f"p{i}", NOW + timedelta(minutes=i)) for i in range(6)]
+    scraper.fetch("python")
+    calls = []
+    load_watermark = scraper.load_watermark
+    monkeypatch.setattr(scraper, "load_watermark", lambda term: calls.append(term) or load_watermark(term))
+    client.posts += [_post(f"n{i}", NOW + timedelta(hours=1, minutes=i)) for i in range(5)]
+    assert len(_names(scraper.fetch("python"))) == 5
+    assert calls == ["python"]
+    assert len(client.requests) > 4
+
+
+def test_failed_write_does_not_move_the_watermark(client, tmp_path):
+    store = LocalStateStore(tmp_path / "state")
+    client.posts = [_post(f"p{i}", NOW + timedelta(minutes=i)) for i in range(3)]
+    SearchTermScraper(client, state_store=store, incremental=True).fetch("python")
+    watermark = SearchTermScraper(client, state_store=store, incremental=True).load_watermark("python")
+
+    client.posts += [_post(f"n{i}", NOW + timedelta(hours=1, minutes=i)) for i in range(3)]
+    writer = FlakyWriter()
+    scraper = SearchTermScraper(client, writer=writer, state_store=store, incremental=True)
+    with pytest.raises(IOError):
+        scraper.fetch("python")
+    assert scraper.load_watermark("python") == watermark
+
+    assert _names(scraper.fetch("python")) == ["n2", "n1", "n0"]
+    assert [post["record"]["text"] for post in writer.written] == ["n2", "n1", "n0"]
+    assert scraper.fetch("python")["posts"] == []
+
+
+def test_failed_stream_does_not_move_the_watermark(client, tmp_path):
+    writer = FlakyWriter()
+    scraper = SearchTermScraper(client, writer=writer, state_store=LocalStateStore(tmp_path / "state"),
+                                incremental=True)
+    client.posts = [_post(f"p{i}", NOW + timedelta(minutes=i)) for i in range(5)]
+    with pytest.raises(IOError):
+        scraper.stream("python")
+    assert scraper.load_watermark("python") is None
+    assert scraper.stream("python") == 5
+    assert [post["record"]["text"] for post in writer.written] == ["p4", "p3", "p2", "p1", "p0"]
+    assert scraper.stream("python") == 0
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from bskydata.api.client import AsyncBskyApiClient, AuthenticationError, BskyApiClient
+from bskydata.api.session import SessionCache
+from bskydata.testing.xrpc import FakeXrpcServer
+
+
+@pytest.fixture
+def server():
+    with FakeXrpcServer(accounts={"alice.test": "secret"}) as server:
+        yield server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SessionCache(tmp_path / "sessions")
+
+
+def test_login_caches_the_session(server, cache):
+    client = BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+    assert client.client.me.did == client.did
+    assert cache.load("alice.test")
+
+
+def test_cached_session_skips_create_session_and_sets_me(server, cache):
+    first = BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+    resumed = BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+    assert resumed.did == first.did
+    # send_post and friends need `me`, which only login() sets.
+    assert resumed.client.me.did == first.did
+    assert server.stats()["requests"]["com.atproto.server.createSession"] == 1
+
+
+def test_cached_session_is_refreshed_when_about_to_expire(cache):
+    with FakeXrpcServer(access_token_lifetime=60) as server:
+        BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+        resumed = BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+        requests = server.stats()["requests"]
+    assert resumed.client.me.did == resumed.did
+    assert requests["com.atproto.server.createSession"] == 1
+    assert requests["com.atproto.server.refreshSession"] >= 1
+
+
+def test_unusable_cached_session_falls_back_to_password_login(server, cache):
+    cache.save("alice.test", "not a session string")
+    client = BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+    assert client.client.me.did == client.did
+    assert server.stats()["requests"]["com.atproto.server.createSession"] == 1
+    assert cache.load("alice.test") != "not a session string"
+
+
+def test_wrong_password_raises(server):
+    with pytest.raises(AuthenticationError):
+        BskyApiClient("alice.test", "wrong", base_url=server.url)
+
+
+def test_async_client_resumes_cached_session(server, cache):
+    BskyApiClient("alice.test", "secret", session_cache=cache, base_url=server.url)
+
+    async def resume():
+        client = AsyncBskyApiClient(session_cache=cache, base_url=server.url)
+        await client.authenticate("alice.test", "secret")
+        return client
+
+    client = asyncio.run(resume())
+    assert client.client.me.did == client.did
+    assert server.stats()["requests"]["com.atproto.server.createSession"] == 1
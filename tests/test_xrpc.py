@@ -0,0 +1,103 @@
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from atproto_client.exceptions import RequestException
+from bskydata.api.client import BskyApiClient
+from bskydata.api.rate_limit import RateLimiter
+from bskydata.scrapers.followers import FollowersScraper
+from bskydata.testing.xrpc import FakeXrpcServer
+
+
+GET_FOLLOWERS = "app.bsky.graph.getFollowers"
+
+
+def _client(server, **kwargs) -> BskyApiClient:
+    limiter = RateLimiter(rate=1000, capacity=100, max_rate=1000)
+    return BskyApiClient("alice.test", "password", base_url=server.url, rate_limiter=limiter, **kwargs)
+
+
+def _get(server, method: str):
+    """Unauthenticated XRPC call; returns the status and response headers."""
+    try:
+        with urllib.request.urlopen(f"{server.url}/xrpc/{method}") as response:
+            return response.status, response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers
+
+
+@pytest.fixture
+def server():
+    with FakeXrpcServer(pages=3) as server:
+        yield server
+
+
+def test_client_logs_in_against_base_url(server):
+    client = _client(server)
+    assert client.did.startswith("did:plc:")
+    assert client._client.me.handle == "alice.test"
+    assert server.stats()["requests"]["com.atproto.server.createSession"] == 1
+
+
+def test_rate_limited_requests_are_retried_after_retry_after(server):
+    client = _client(server)
+    server.inject(429, count=2, method=GET_FOLLOWERS, retry_after=0.05)
+    result = FollowersScraper(client).fetch("bob.test")
+    assert len(result["followers"]) == 300
+    stats = server.stats()
+    assert stats["requests"][GET_FOLLOWERS] == 3 + 2
+    assert stats["statuses"][429] == 2
+    assert client.rate_limiter.throttled == 2
+
+
+def test_injected_errors_surface_once_retries_are_exhausted(server):
+    client = _client(server)
+    server.inject(429, count=4, method=GET_FOLLOWERS, retry_after=0)
+    with pytest.raises(RequestException) as error:
+        FollowersScraper(client).fetch("bob.test", limit=100)
+    assert error.value.response.status_code == 429
+    assert server.stats()["requests"][GET_FOLLOWERS] == 4
+
+    # Other failures are not retried at all.
+    server.inject(503, method=GET_FOLLOWERS)
+    with pytest.raises(RequestException) as error:
+        FollowersScraper(client).fetch("bob.test", limit=100)
+    assert error.value.response.status_code == 503
+    assert server.stats()["requests"][GET_FOLLOWERS] == 5
+
+
+def test_fixed_window_rate_limit_headers():
+    with FakeXrpcServer(rate_limit=3, rate_limit_window=60) as server:
+        responses = [_get(server, "com.atproto.server.getSession") for _ in range(4)]
+    assert [headers["ratelimit-remaining"] for _, headers in responses] == ["2", "1", "0", "0"]
+    assert {headers["ratelimit-limit"] for _, headers in responses} == {"3"}
+    assert {headers["ratelimit-policy"] for _, headers in responses} == {"3;w=60"}
+    assert len({headers["ratelimit-reset"] for _, headers in responses}) == 1
+    assert [status for status, _ in responses[:3]] == [401, 401, 401]
+    status, headers = responses[3]
+    assert status == 429
+    assert 1 <= int(headers["retry-after"]) <= 60
+
+
+def test_rate_limiter_follows_the_server_window():
+    with FakeXrpcServer(rate_limit=100, rate_limit_window=60) as server:
+        client = _client(server)
+        FollowersScraper(client).fetch("bob.test", limit=100)
+    assert client.rate_limiter.limit == 100
+    assert client.rate_limiter.remaining == 100 - sum(server.stats()["requests"].values())
+
+
+def test_concurrent_crawls_return_complete_results():
+    actors = [f"actor{i}.test" for i in range(8)]
+    with FakeXrpcServer(pages=3, latency=0.01) as server:
+        client = _client(server)
+        scraper = FollowersScraper(client)
+        with ThreadPoolExecutor(max_workers=len(actors)) as pool:
+            results = list(pool.map(lambda actor: scraper.fetch(actor, limit=1000), actors))
+        stats = server.stats()
+    for actor, result in zip(actors, results):
+        handles = [follower["handle"] for follower in result["followers"]]
+        assert len(handles) == len(set(handles)) == 300
+        assert all(handle.startswith(f"followers-{actor}-") for handle in handles)
+    assert stats["requests"][GET_FOLLOWERS] == 3 * len(actors)
+    assert set(stats["statuses"]) == {200}